@@ -0,0 +1,117 @@
+"""Benchmark TOON formatting of large row lists.
+
+Run with ``python benchmarks/bench_format.py``. Compares the generic path
+(``model_dump`` per row, then ``toon.encode``) with the columnar encoder for a
+stock-list sized payload of pydantic models and a month of 1-minute bars as
+raw JSON rows, then the full response path from body bytes with and without
+model validation.
+"""
+
+import json
+import random
+import time
+
+import toon
+from pydantic import BaseModel
+
+from fmp_mcp.async_client import json_loads
+from fmp_mcp.encoding import encode_table
+
+ROUNDS = 5
+
+
+class StockListItem(BaseModel):
+    symbol: str
+    name: str | None
+    price: float | None
+    exchange: str | None
+    exchangeShortName: str | None
+    type: str | None
+
+
+def stock_list(count: int = 30000) -> list[StockListItem]:
+    """Build a stock-list sized payload of models."""
+    rng = random.Random(0)
+    exchanges = [("NASDAQ Global Select", "NASDAQ"), ("New York Stock Exchange", "NYSE")]
+    rows = []
+    for i in range(count):
+        exchange, short = rng.choice(exchanges)
+        rows.append(StockListItem(
+            symbol=f"S{i:05d}",
+            name=f"Company {i}, Inc.",
+            price=round(rng.uniform(1, 500), 2),
+            exchange=exchange,
+            exchangeShortName=short,
+            type=rng.choice(["stock", "etf"]),
+        ))
+    return rows
+
+
+def minute_bars(count: int = 30 * 390) -> list[dict]:
+    """Build a month of 1-minute bars as raw JSON rows."""
+    rng = random.Random(1)
+    price = 180.0
+    rows = []
+    for i in range(count):
+        price += rng.uniform(-0.2, 0.2)
+        minute = 9 * 60 + 30 + i % 390
+        rows.append({
+            "date": f"2024-01-{2 + i // 390:02d} {minute // 60:02d}:{minute % 60:02d}:00",
+            "open": round(price, 2),
+            "low": round(price - 0.1, 2),
+            "high": round(price + 0.1, 2),
+            "close": round(price + 0.05, 2),
+            "volume": rng.randint(1000, 100000),
+        })
+    return rows
+
+
+def generic(rows: list) -> str:
+    """Encode rows the way format_response did before the columnar path."""
+    if hasattr(rows[0], "model_dump"):
+        rows = [row.model_dump() for row in rows]
+    return toon.encode(rows)
+
+
+def validated(body: bytes) -> str:
+    """Decode, validate into models, dump and encode, as the sync client path does."""
+    return generic([StockListItem.model_validate(row) for row in json.loads(body)])
+
+
+def raw(body: bytes) -> str:
+    """Decode and encode raw JSON rows, as the async client path does."""
+    return encode_table(json_loads(body))
+
+
+def best_of(func, rows) -> float:
+    """Return the fastest of several timed runs."""
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func(rows)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    for label, rows in (("stock list (models)", stock_list()), ("1min bars (JSON)", minute_bars())):
+        assert encode_table(rows) == generic(rows)
+        before = best_of(generic, rows)
+        after = best_of(encode_table, rows)
+        print(
+            f"{label}, {len(rows)} rows: generic {before * 1000:.1f} ms, "
+            f"columnar {after * 1000:.1f} ms ({before / after:.1f}x)"
+        )
+
+    body = json.dumps([row.model_dump() for row in stock_list()]).encode()
+    assert validated(body) == raw(body)
+    before = best_of(validated, body)
+    after = best_of(raw, body)
+    print(
+        f"stock list from {len(body) // 1024} KiB body: validated {before * 1000:.1f} ms, "
+        f"raw {after * 1000:.1f} ms ({before / after:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
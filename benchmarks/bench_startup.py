@@ -0,0 +1,63 @@
+"""Benchmark server startup and tools/list handling.
+
+Run with ``python benchmarks/bench_startup.py``. Reports the cold import time of
+the server in fresh interpreters and the per-request cost of tools/list, both
+for the prebuilt catalog and for rebuilding the tool definitions on every call.
+"""
+
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from mcp import types
+
+os.environ.setdefault("FMP_API_KEY", "benchmark")
+
+from fmp_mcp.server import app  # noqa: E402
+from fmp_mcp.tools import TOOLS  # noqa: E402
+
+STARTUP_RUNS = 10
+REQUESTS = 2000
+
+
+def bench_startup() -> float:
+    """Return the median time to start an interpreter and import the server."""
+    timings = []
+    for _ in range(STARTUP_RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import fmp_mcp.server"], check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+async def rebuilt_catalog() -> types.ServerResult:
+    """Build tools/list the old way: fresh Tool objects on each call."""
+    tools = [types.Tool(**spec.tool.model_dump()) for spec in TOOLS.values()]
+    return types.ServerResult(types.ListToolsResult(tools=tools))
+
+
+async def bench_requests(handler) -> float:
+    """Return the mean time per tools/list request, including serialization."""
+    request = types.ListToolsRequest(method="tools/list")
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        result = await handler(request)
+        result.model_dump(by_alias=True, mode="json", exclude_none=True)
+    return (time.perf_counter() - start) / REQUESTS
+
+
+async def main() -> None:
+    print(f"cold import (median of {STARTUP_RUNS}): {bench_startup() * 1000:.1f} ms")
+
+    prebuilt = await bench_requests(app.request_handlers[types.ListToolsRequest])
+    rebuilt = await bench_requests(lambda request: rebuilt_catalog())
+    print(f"tools/list, prebuilt catalog: {prebuilt * 1e6:.0f} us/request")
+    print(f"tools/list, rebuilt per call: {rebuilt * 1e6:.0f} us/request")
+    print(f"speedup: {rebuilt / prebuilt:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
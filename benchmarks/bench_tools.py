@@ -0,0 +1,203 @@
+"""Benchmark tool calls end to end against a local FMP stub.
+
+Run with ``python benchmarks/bench_tools.py``; no network access or API key is
+needed. Each scenario goes through ``call_tool`` with the async transport, the
+response cache, history store, local indexes and rate limiter turned off, so
+every call reaches the stub. Reported per scenario: p50/p99 latency of
+sequential calls, throughput with concurrent callers, peak Python memory of
+one call (tracemalloc), and response size.
+
+``--record DIR`` saves real FMP responses for the scenarios (needs
+FMP_API_KEY and network); ``--payloads DIR`` replays them instead of the
+generated payloads.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import urllib.request
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fmp_stub import StubServer  # noqa: E402
+
+FMP_URL = "https://financialmodelingprep.com/stable"
+
+SYMBOLS = [f"SYM{i}" for i in range(64)]
+
+# Name, tool, arguments, upstream paths to record, and whether the call takes a symbol
+SCENARIOS = [
+    ("quote", "get_quote", {"symbol": "AAPL"}, ["quote?symbol=AAPL"], True),
+    (
+        "stock list page", "get_stock_list", {"page_size": 5000},
+        ["stock-list"], False,
+    ),
+    (
+        "1min chart month", "get_historical_chart",
+        {"symbol": "AAPL", "interval": "1min", "from_date": "2024-01-02", "to_date": "2024-01-31"},
+        ["historical-chart/1min?symbol=AAPL&from=2024-01-02&to=2024-01-31"], True,
+    ),
+    (
+        "income 40 quarters", "get_income_statement",
+        {"symbol": "AAPL", "period": "quarter", "limit": 40},
+        ["income-statement?symbol=AAPL&period=quarter&limit=40"], True,
+    ),
+    (
+        "bulk statements 8x3", "get_financials_bulk",
+        {
+            "symbols": SYMBOLS[:8],
+            "statements": ["income", "balance_sheet", "cash_flow"],
+            "period": "quarter",
+            "limit": 20,
+        },
+        [], False,
+    ),
+]
+
+OFFLINE_ENV = {
+    "FMP_API_KEY": "benchmark",
+    "FMP_TRANSPORT": "async",
+    "FMP_CACHE_ENABLED": "0",
+    "FMP_STORE_ENABLED": "0",
+    "FMP_RATE_LIMIT_PER_MINUTE": "0",
+    "FMP_SYMBOL_INDEX_ENABLED": "0",
+    "FMP_SCREENER_ENABLED": "0",
+}
+
+
+def percentile(timings: list[float], q: float) -> float:
+    """Return the q-th percentile (0-100) by nearest rank."""
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+def vary(arguments: dict, index: int, takes_symbol: bool) -> dict:
+    """Give concurrent calls distinct symbols so they are not coalesced."""
+    if not takes_symbol:
+        return arguments
+    return {**arguments, "symbol": SYMBOLS[index % len(SYMBOLS)]}
+
+
+async def call(tool: str, arguments: dict) -> str:
+    """Make one cold tool call and return its text."""
+    from fmp_mcp import pagination
+    from fmp_mcp.server import call_tool
+
+    # Paged tools hold full results between pages; drop them so every call fetches
+    pagination._result_cache = None
+    result = await call_tool(tool, arguments)
+    return result[0].text
+
+
+async def run_scenario(
+    tool: str, arguments: dict, takes_symbol: bool, iterations: int, concurrency: int
+) -> dict:
+    """Measure one scenario."""
+    for _ in range(3):
+        text = await call(tool, arguments)
+    if text.startswith(("Error", "API Error", "Unknown tool")):
+        raise RuntimeError(f"{tool} failed: {text}")
+
+    timings = []
+    for index in range(iterations):
+        start = time.perf_counter()
+        await call(tool, vary(arguments, index, takes_symbol))
+        timings.append(time.perf_counter() - start)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(index: int) -> None:
+        async with semaphore:
+            await call(tool, vary(arguments, index, takes_symbol))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded(index) for index in range(iterations)))
+    throughput = iterations / (time.perf_counter() - start)
+
+    tracemalloc.start()
+    await call(tool, arguments)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": statistics.median(timings) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "calls_per_s": throughput,
+        "peak_mib": peak / 2**20,
+        "response_kib": len(text.encode()) / 1024,
+    }
+
+
+def record(directory: Path) -> None:
+    """Save real FMP responses for the scenarios' upstream requests."""
+    api_key = os.environ["FMP_API_KEY"]
+    directory.mkdir(parents=True, exist_ok=True)
+    for _, _, _, paths, _ in SCENARIOS:
+        for path in paths:
+            endpoint, _, query = path.partition("?")
+            query = f"{query}&apikey={api_key}" if query else f"apikey={api_key}"
+            url = f"{FMP_URL}/{endpoint}?{query}"
+            with urllib.request.urlopen(url) as response:
+                body = response.read()
+            json.loads(body)
+            target = directory / (endpoint.replace("/", "_") + ".json")
+            target.write_bytes(body)
+            print(f"recorded {target} ({len(body) // 1024} KiB)")
+
+
+async def main(args: argparse.Namespace) -> None:
+    server = StubServer(args.payloads).start()
+    os.environ.update(OFFLINE_ENV)
+    os.environ["FMP_BASE_URL"] = server.base_url
+
+    from fmp_mcp.server import close_fmp_client
+
+    source = f"recorded payloads in {args.payloads}" if args.payloads else "generated payloads"
+    print(f"{args.iterations} calls per scenario, concurrency {args.concurrency}, {source}")
+    print(f"{'scenario':<22}{'p50 ms':>9}{'p99 ms':>9}{'calls/s':>10}{'peak MiB':>10}{'KiB':>9}")
+    try:
+        for name, tool, arguments, _, takes_symbol in SCENARIOS:
+            result = await run_scenario(
+                tool, arguments, takes_symbol, args.iterations, args.concurrency
+            )
+            print(
+                f"{name:<22}{result['p50_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+                f"{result['calls_per_s']:>10.1f}{result['peak_mib']:>10.1f}"
+                f"{result['response_kib']:>9.0f}"
+            )
+    finally:
+        await close_fmp_client()
+        server.shutdown()
+    if resource is not None:
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        scale = 2**20 if sys.platform == "darwin" else 2**10
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+        print(f"peak RSS {peak_rss:.0f} MiB ({server.requests} stub requests)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline end-to-end tool benchmarks")
+    parser.add_argument("--iterations", type=int, default=50, help="Calls per measurement")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent callers")
+    parser.add_argument("--payloads", type=Path, help="Replay recorded payloads from DIR")
+    parser.add_argument("--record", type=Path, help="Record real FMP payloads into DIR and exit")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.record:
+        record(args.record)
+    else:
+        asyncio.run(main(args))
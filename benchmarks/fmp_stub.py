@@ -0,0 +1,194 @@
+"""Local stub of the FMP stable API for offline benchmarks.
+
+Serves FMP-shaped payloads from a background thread: deterministic generated
+ones by default, or bodies recorded from the real API with ``bench_tools.py
+--record`` and replayed with ``--payloads``. Recorded files are named after the
+endpoint path with slashes replaced by underscores (``historical-chart_1min.json``).
+"""
+
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+INCOME_FIELDS = (
+    "revenue", "costOfRevenue", "grossProfit", "researchAndDevelopmentExpenses",
+    "generalAndAdministrativeExpenses", "sellingAndMarketingExpenses",
+    "sellingGeneralAndAdministrativeExpenses", "otherExpenses", "operatingExpenses",
+    "costAndExpenses", "netInterestIncome", "interestIncome", "interestExpense",
+    "depreciationAndAmortization", "ebitda", "ebit", "nonOperatingIncomeExcludingInterest",
+    "operatingIncome", "totalOtherIncomeExpensesNet", "incomeBeforeTax", "incomeTaxExpense",
+    "netIncomeFromContinuingOperations", "netIncomeFromDiscontinuedOperations",
+    "otherAdjustmentsToNetIncome", "netIncome", "netIncomeDeductions", "bottomLineNetIncome",
+    "eps", "epsDiluted", "weightedAverageShsOut", "weightedAverageShsOutDil",
+)
+BALANCE_FIELDS = (
+    "cashAndCashEquivalents", "shortTermInvestments", "cashAndShortTermInvestments",
+    "netReceivables", "accountsReceivables", "otherReceivables", "inventory", "prepaids",
+    "otherCurrentAssets", "totalCurrentAssets", "propertyPlantEquipmentNet", "goodwill",
+    "intangibleAssets", "goodwillAndIntangibleAssets", "longTermInvestments",
+    "taxAssets", "otherNonCurrentAssets", "totalNonCurrentAssets", "otherAssets",
+    "totalAssets", "totalPayables", "accountPayables", "otherPayables", "accruedExpenses",
+    "shortTermDebt", "capitalLeaseObligationsCurrent", "taxPayables", "deferredRevenue",
+    "otherCurrentLiabilities", "totalCurrentLiabilities", "longTermDebt",
+    "totalLiabilities", "commonStock", "retainedEarnings", "totalStockholdersEquity",
+    "totalEquity", "totalDebt", "netDebt",
+)
+CASH_FLOW_FIELDS = (
+    "netIncome", "depreciationAndAmortization", "deferredIncomeTax", "stockBasedCompensation",
+    "changeInWorkingCapital", "accountsReceivables", "inventory", "accountsPayables",
+    "otherWorkingCapital", "otherNonCashItems", "netCashProvidedByOperatingActivities",
+    "investmentsInPropertyPlantAndEquipment", "acquisitionsNet", "purchasesOfInvestments",
+    "salesMaturitiesOfInvestments", "otherInvestingActivities",
+    "netCashProvidedByInvestingActivities", "netDebtIssuance", "commonStockRepurchased",
+    "commonDividendsPaid", "otherFinancingActivities", "netCashProvidedByFinancingActivities",
+    "netChangeInCash", "cashAtEndOfPeriod", "cashAtBeginningOfPeriod", "operatingCashFlow",
+    "capitalExpenditure", "freeCashFlow",
+)
+
+
+def stock_list(count: int = 30000) -> list[dict]:
+    """Build a stock-list payload."""
+    return [{"symbol": f"S{i:05d}", "companyName": f"Company {i}, Inc."} for i in range(count)]
+
+
+def quote(symbol: str) -> list[dict]:
+    """Build a one-row quote payload."""
+    return [{
+        "symbol": symbol, "name": f"{symbol} Inc.", "price": 187.12, "changePercentage": 0.85,
+        "change": 1.58, "volume": 41234567, "dayLow": 185.3, "dayHigh": 188.01,
+        "yearHigh": 199.62, "yearLow": 164.08, "marketCap": 2890000000000,
+        "priceAvg50": 181.2, "priceAvg200": 178.9, "exchange": "NASDAQ", "open": 186.0,
+        "previousClose": 185.54, "timestamp": 1704906000,
+    }]
+
+
+def minute_bars(days: int = 30) -> list[dict]:
+    """Build a month of 1-minute bars, newest first."""
+    rng = random.Random(1)
+    price = 180.0
+    rows = []
+    for i in range(days * 390):
+        price += rng.uniform(-0.2, 0.2)
+        minute = 9 * 60 + 30 + i % 390
+        rows.append({
+            "date": f"2024-01-{2 + i // 390:02d} {minute // 60:02d}:{minute % 60:02d}:00",
+            "open": round(price, 2),
+            "low": round(price - 0.1, 2),
+            "high": round(price + 0.1, 2),
+            "close": round(price + 0.05, 2),
+            "volume": rng.randint(1000, 100000),
+        })
+    rows.reverse()
+    return rows
+
+
+def statements(symbol: str, fields: tuple[str, ...], period: str, limit: int) -> list[dict]:
+    """Build ``limit`` statement periods, newest first."""
+    rng = random.Random(symbol + period)
+    rows = []
+    for index in range(limit):
+        year = 2024 - (index // 4 if period == "quarter" else index)
+        quarter = 4 - index % 4 if period == "quarter" else 4
+        row = {
+            "date": f"{year}-{quarter * 3:02d}-28",
+            "symbol": symbol,
+            "reportedCurrency": "USD",
+            "cik": "0000320193",
+            "filingDate": f"{year}-{quarter * 3:02d}-30",
+            "acceptedDate": f"{year}-{quarter * 3:02d}-30 18:01:00",
+            "fiscalYear": str(year),
+            "period": f"Q{quarter}" if period == "quarter" else "FY",
+        }
+        for field in fields:
+            row[field] = rng.randint(-10**9, 10**11)
+        rows.append(row)
+    return rows
+
+
+def generated_body(path: str, query: dict[str, str]) -> object:
+    """Build the payload for one request, or None for unknown endpoints."""
+    symbol = query.get("symbol", "AAPL")
+    period = query.get("period", "annual")
+    limit = int(query.get("limit", 5))
+    if path == "stock-list":
+        return stock_list()
+    if path == "quote":
+        return quote(symbol)
+    if path.startswith("historical-chart/"):
+        return minute_bars()
+    if path == "income-statement":
+        return statements(symbol, INCOME_FIELDS, period, limit)
+    if path == "balance-sheet-statement":
+        return statements(symbol, BALANCE_FIELDS, period, limit)
+    if path == "cash-flow-statement":
+        return statements(symbol, CASH_FLOW_FIELDS, period, limit)
+    return None
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serve payloads for /stable/<path> requests."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle's algorithm
+    # holds the body back for the client's delayed ACK (~40 ms per request)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = url.path.removeprefix("/stable/")
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        body = self.server.body(path, query)
+        status = 200 if body is not None else 404
+        payload = body if body is not None else b'{"Error Message": "Unknown endpoint"}'
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """Stub FMP server caching encoded bodies per endpoint and arguments."""
+
+    daemon_threads = True
+
+    def __init__(self, payloads: str | Path | None = None):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.payloads = Path(payloads) if payloads else None
+        self.requests = 0
+        self._bodies: dict[tuple, bytes | None] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/stable"
+
+    def body(self, path: str, query: dict[str, str]) -> bytes | None:
+        """Get the encoded body for a request."""
+        key = (path, query.get("symbol"), query.get("period"), query.get("limit"))
+        with self._lock:
+            self.requests += 1
+            if key not in self._bodies:
+                self._bodies[key] = self._load(path, query)
+            return self._bodies[key]
+
+    def _load(self, path: str, query: dict[str, str]) -> bytes | None:
+        if self.payloads is not None:
+            recorded = self.payloads / (path.replace("/", "_") + ".json")
+            if recorded.exists():
+                return recorded.read_bytes()
+        body = generated_body(path, query)
+        return json.dumps(body).encode() if body is not None else None
+
+    def start(self) -> "StubServer":
+        """Serve from a daemon thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
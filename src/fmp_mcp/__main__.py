@@ -1,7 +1,40 @@
 """Entry point for running the FMP MCP server."""
 
+import argparse
 import asyncio
-from .server import main
+from .server import DEFAULT_HTTP_HOST, DEFAULT_HTTP_PORT, main, run_http_workers
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(prog="fmp_mcp", description=__doc__)
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "http"],
+        default="stdio",
+        help="stdio serves one session; http serves many sessions from one process "
+        "over streamable HTTP (/mcp) and SSE (/sse)",
+    )
+    parser.add_argument("--host", default=DEFAULT_HTTP_HOST, help="HTTP bind address")
+    parser.add_argument("--port", type=int, default=DEFAULT_HTTP_PORT, help="HTTP port")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="HTTP worker processes; more than one serves stateless streamable HTTP "
+        "with a shared cache and rate-limit budget",
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and args.transport != "http":
+        parser.error("--workers requires --transport http")
+    return args
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    if args.workers > 1:
+        run_http_workers(args.host, args.port, args.workers)
+    else:
+        asyncio.run(main(args.transport, args.host, args.port))
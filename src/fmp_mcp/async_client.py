@@ -0,0 +1,256 @@
+"""Async FMP transport over a shared, pooled HTTP session."""
+
+import importlib.util
+import os
+from typing import Any
+
+import httpx
+from fmp import FMPAPIError, FMPAuthError
+
+from .jsonstream import JSONArrayStream, json_loads
+from .tracing import span
+
+DEFAULT_BASE_URL = "https://financialmodelingprep.com/stable"
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_HTTP_TIMEOUT = 30.0
+
+# Bodies at least this large (or of unknown length) are decoded as they arrive
+STREAM_MIN_BYTES = 256 * 1024
+
+
+def _camel(name: str) -> str:
+    """Convert a snake_case argument name to FMP's camelCase query parameter."""
+    head, *rest = name.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+class AsyncFMPClient:
+    """Async counterpart of FMPClient returning raw JSON data.
+
+    Method names and arguments mirror FMPClient so tool handlers can use either
+    client. Responses are decoded straight from the body bytes (with orjson when
+    installed) and never validated into models; large array bodies are decoded
+    chunk by chunk while they download. All requests share one keep-alive
+    connection pool, negotiating HTTP/2 when the optional ``h2`` package is
+    installed.
+    """
+
+    def __init__(self, api_key: str, base_url: str | None = None):
+        self.api_key = api_key
+        self.base_url = (base_url or os.getenv("FMP_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        max_connections = int(os.getenv("FMP_HTTP_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS))
+        self._http = httpx.AsyncClient(
+            base_url=self.base_url + "/",
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=DEFAULT_HTTP_TIMEOUT,
+        )
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP session."""
+        await self._http.aclose()
+
+    async def _get(self, path: str, **params: Any) -> Any:
+        """Perform a GET request and return the decoded JSON body."""
+        query = {_camel(key): value for key, value in params.items() if value is not None}
+        query["apikey"] = self.api_key
+        with span("http", **{"http.method": "GET", "url.path": path}) as http:
+            async with self._http.stream("GET", path, params=query) as response:
+                if http is not None:
+                    http.set_attribute("http.status_code", response.status_code)
+                if response.status_code >= 400:
+                    await response.aread()
+                    if response.status_code in (401, 403):
+                        raise FMPAuthError(response.text or "Unauthorized", response.status_code)
+                    raise FMPAPIError(
+                        response.text or response.reason_phrase, response.status_code
+                    )
+                data = await self._read_json(response)
+
+        if isinstance(data, dict) and "Error Message" in data:
+            raise FMPAPIError(data["Error Message"], response.status_code)
+        return data
+
+    async def _read_json(self, response: httpx.Response) -> Any:
+        """Decode a response body, streaming large ones through JSONArrayStream."""
+        length = response.headers.get("content-length")
+        if length is not None and int(length) < STREAM_MIN_BYTES:
+            body = await response.aread()
+            with span("parse", **{"fmp.body_bytes": len(body)}):
+                return json_loads(body)
+
+        # Items are decoded as chunks arrive, so the whole body is never held at
+        # once; the parse span therefore also covers the download
+        stream = JSONArrayStream()
+        items: list[Any] = []
+        with span("parse", **{"fmp.streamed": True}) as parse:
+            async for chunk in response.aiter_bytes():
+                items.extend(stream.feed(chunk))
+            rest = stream.close()
+            if parse is not None:
+                parse.set_attribute("fmp.body_bytes", response.num_bytes_downloaded)
+        if not stream.array:
+            return rest
+        items.extend(rest)
+        return items
+
+    # Company
+
+    async def get_profile(self, symbol: str) -> Any:
+        return await self._get("profile", symbol=symbol)
+
+    async def search_symbol(self, query: str) -> Any:
+        return await self._get("search-symbol", query=query)
+
+    async def search_by_name(self, query: str) -> Any:
+        return await self._get("search-name", query=query)
+
+    async def search_by_cik(self, cik: str) -> Any:
+        return await self._get("search-cik", cik=cik)
+
+    async def search_by_cusip(self, cusip: str) -> Any:
+        return await self._get("search-cusip", cusip=cusip)
+
+    async def search_by_isin(self, isin: str) -> Any:
+        return await self._get("search-isin", isin=isin)
+
+    async def get_stock_list(self) -> Any:
+        return await self._get("stock-list")
+
+    async def screen_stocks(self, **criteria: Any) -> Any:
+        return await self._get("company-screener", **criteria)
+
+    async def search_stock_news(self, symbols: str, page: int = 0, limit: int = 50) -> Any:
+        return await self._get("news/stock", symbols=symbols, page=page, limit=limit)
+
+    async def get_general_news_latest(self, page: int = 0, limit: int = 20) -> Any:
+        return await self._get("news/general-latest", page=page, limit=limit)
+
+    async def get_stock_news_latest(self, page: int = 0, limit: int = 20) -> Any:
+        return await self._get("news/stock-latest", page=page, limit=limit)
+
+    # Market
+
+    async def get_quote(self, symbol: str) -> Any:
+        return await self._get("quote", symbol=symbol)
+
+    async def get_batch_quote(self, symbols: list[str]) -> Any:
+        return await self._get("batch-quote", symbols=",".join(symbols))
+
+    async def get_historical_chart(
+        self,
+        symbol: str,
+        interval: str = "1hour",
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ) -> Any:
+        return await self._get(
+            f"historical-chart/{interval}", symbol=symbol, from_=from_date, to=to_date
+        )
+
+    async def get_historical_price(
+        self,
+        symbol: str,
+        price_type: str = "full",
+        from_date: str | None = None,
+        to_date: str | None = None,
+        timeseries: int | None = None,
+    ) -> Any:
+        return await self._get(
+            f"historical-price-eod/{price_type}",
+            symbol=symbol,
+            from_=from_date,
+            to=to_date,
+            timeseries=timeseries,
+        )
+
+    async def get_industry_pe(
+        self, date: str, exchange: str | None = None, industry: str | None = None
+    ) -> Any:
+        return await self._get(
+            "industry-pe-snapshot", date=date, exchange=exchange, industry=industry
+        )
+
+    async def get_sector_pe(
+        self, date: str, exchange: str | None = None, sector: str | None = None
+    ) -> Any:
+        return await self._get("sector-pe-snapshot", date=date, exchange=exchange, sector=sector)
+
+    async def get_industry_performance(
+        self, date: str, exchange: str | None = None, industry: str | None = None
+    ) -> Any:
+        return await self._get(
+            "industry-performance-snapshot", date=date, exchange=exchange, industry=industry
+        )
+
+    async def get_historical_sector_pe(
+        self,
+        sector: str,
+        exchange: str | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ) -> Any:
+        return await self._get(
+            "historical-sector-pe", sector=sector, exchange=exchange, from_=from_date, to=to_date
+        )
+
+    # Crypto
+
+    async def get_crypto_quote(self, symbol: str) -> Any:
+        return await self._get("quote", symbol=symbol)
+
+    async def get_crypto_list(self) -> Any:
+        return await self._get("cryptocurrency-list")
+
+    async def get_crypto_intraday(
+        self,
+        symbol: str,
+        interval: str = "1hour",
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ) -> Any:
+        return await self.get_historical_chart(symbol, interval, from_date, to_date)
+
+    async def get_crypto_historical_price(
+        self, symbol: str, from_date: str | None = None, to_date: str | None = None
+    ) -> Any:
+        return await self.get_historical_price(symbol, "full", from_date, to_date)
+
+    async def get_crypto_news_latest(self, limit: int = 10) -> Any:
+        return await self._get("news/crypto-latest", limit=limit)
+
+    async def search_crypto_news(
+        self,
+        symbols: str | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        limit: int = 50,
+    ) -> Any:
+        return await self._get(
+            "news/crypto", symbols=symbols, from_=from_date, to=to_date, limit=limit
+        )
+
+    # Financials
+
+    async def get_income_statement(
+        self, symbol: str, period: str = "annual", limit: int = 5
+    ) -> Any:
+        return await self._get("income-statement", symbol=symbol, period=period, limit=limit)
+
+    async def get_balance_sheet(self, symbol: str, period: str = "annual", limit: int = 5) -> Any:
+        return await self._get(
+            "balance-sheet-statement", symbol=symbol, period=period, limit=limit
+        )
+
+    async def get_cash_flow_statement(
+        self, symbol: str, period: str = "annual", limit: int = 5
+    ) -> Any:
+        return await self._get("cash-flow-statement", symbol=symbol, period=period, limit=limit)
+
+    async def get_financial_growth(
+        self, symbol: str, period: str = "annual", limit: int = 5
+    ) -> Any:
+        return await self._get("financial-growth", symbol=symbol, period=period, limit=limit)
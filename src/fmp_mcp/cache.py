@@ -0,0 +1,323 @@
+"""TTL caches for formatted tool responses, in-process or shared via SQLite."""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from .store import connect_thread, default_cache_dir, env_path
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# TTL classes in seconds
+TTL_REALTIME = 15
+TTL_SHORT = 5 * 60
+TTL_MEDIUM = 60 * 60
+TTL_LONG = 6 * 60 * 60
+TTL_DAY = 24 * 60 * 60
+
+DEFAULT_TTL = 60
+
+# How long expired responses are kept to serve when upstream is failing
+DEFAULT_MAX_STALE = TTL_DAY
+
+# Seconds a shared-cache operation waits for another process's write lock
+SQLITE_BUSY_TIMEOUT = 0.5
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    expires REAL NOT NULL,
+    size INTEGER NOT NULL,
+    text TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires);
+CREATE TABLE IF NOT EXISTS usage (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO usage (id, bytes) VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses BEGIN
+    UPDATE usage SET bytes = bytes + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses BEGIN
+    UPDATE usage SET bytes = bytes - OLD.size;
+END;
+"""
+
+
+def make_cache_key(name: str, arguments: Any) -> str:
+    """Build a cache key from a tool name and its normalized arguments."""
+    arguments = {key: value for key, value in (arguments or {}).items() if value is not None}
+    return name + ":" + json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ResponseCache:
+    """LRU cache of formatted responses with per-entry TTLs and a byte budget.
+
+    Expired entries are kept for another ``max_stale`` seconds (still counting
+    against the budget) so they can be served when upstream is failing.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_stale: float = DEFAULT_MAX_STALE):
+        self.max_bytes = max_bytes
+        self.max_stale = max_stale
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[float, str, int]] = OrderedDict()
+
+    def get(self, name: str, arguments: Any) -> str | None:
+        """Return the cached response, or None on a miss or expired entry."""
+        key = make_cache_key(name, arguments)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is None or entry[0] <= now:
+            if entry is not None and entry[0] + self.max_stale <= now:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def get_stale(self, name: str, arguments: Any) -> tuple[str, float] | None:
+        """Return a response kept past its TTL and its seconds since expiry, or None."""
+        entry = self._entries.get(make_cache_key(name, arguments))
+        now = time.monotonic()
+        if entry is None or entry[0] + self.max_stale <= now:
+            return None
+        return entry[1], max(0.0, now - entry[0])
+
+    def set(self, name: str, arguments: Any, text: str, ttl: float = DEFAULT_TTL) -> None:
+        """Store a response for ``ttl`` seconds, evicting least recently used entries as needed."""
+        size = len(text.encode("utf-8"))
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        key = make_cache_key(name, arguments)
+        if key in self._entries:
+            self._remove(key)
+
+        while self._entries and self.size + size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+        self._entries[key] = (time.monotonic() + ttl, text, size)
+        self.size += size
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and current usage."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self.size -= size
+
+
+class SQLiteResponseCache:
+    """Response cache in a SQLite file shared by all server processes on a host.
+
+    Same interface as ResponseCache. Lookups never write: once the byte budget
+    is exceeded, the entries closest to expiry are evicted instead of the least
+    recently used. Lock contention is treated as a miss or a skipped store.
+    Its methods block, so the server calls them through the async helpers below.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_stale: float = DEFAULT_MAX_STALE,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_stale = max_stale
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._local = threading.local()
+        self._connect().executescript(SQLITE_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection."""
+        return connect_thread(self._local, self.path, timeout=SQLITE_BUSY_TIMEOUT)
+
+    def get(self, name: str, arguments: Any) -> str | None:
+        """Return the cached response, or None on a miss or expired entry."""
+        try:
+            row = self._connect().execute(
+                "SELECT text FROM responses WHERE key = ? AND expires > ?",
+                (make_cache_key(name, arguments), time.time()),
+            ).fetchone()
+        except sqlite3.OperationalError:
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return row[0]
+
+    def get_stale(self, name: str, arguments: Any) -> tuple[str, float] | None:
+        """Return a response kept past its TTL and its seconds since expiry, or None."""
+        now = time.time()
+        try:
+            row = self._connect().execute(
+                "SELECT text, expires FROM responses WHERE key = ? AND expires > ?",
+                (make_cache_key(name, arguments), now - self.max_stale),
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return (row[0], max(0.0, now - row[1])) if row is not None else None
+
+    def set(self, name: str, arguments: Any, text: str, ttl: float = DEFAULT_TTL) -> None:
+        """Store a response for ``ttl`` seconds, evicting entries nearest expiry as needed."""
+        size = len(text.encode("utf-8"))
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        key = make_cache_key(name, arguments)
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError:
+            return
+
+        try:
+            conn.execute(
+                "DELETE FROM responses WHERE key = ? OR expires <= ?",
+                (key, now - self.max_stale),
+            )
+            conn.execute(
+                "INSERT INTO responses (key, expires, size, text) VALUES (?, ?, ?, ?)",
+                (key, now + ttl, size, text),
+            )
+            (used,) = conn.execute("SELECT bytes FROM usage").fetchone()
+            while used > self.max_bytes:
+                oldest, oldest_size = conn.execute(
+                    "SELECT key, size FROM responses WHERE key != ? ORDER BY expires LIMIT 1",
+                    (key,),
+                ).fetchone()
+                conn.execute("DELETE FROM responses WHERE key = ?", (oldest,))
+                used -= oldest_size
+                self.evictions += 1
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            # Caching is best effort, never fail the tool call over it
+            conn.execute("ROLLBACK")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._connect().execute("DELETE FROM responses")
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters for this process and shared usage."""
+        conn = self._connect()
+        (entries,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        (used,) = conn.execute("SELECT bytes FROM usage").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": used,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Global response cache instance
+_response_cache: ResponseCache | SQLiteResponseCache | None = None
+
+
+def cache_enabled() -> bool:
+    """Check whether response caching is enabled via FMP_CACHE_ENABLED."""
+    return os.getenv("FMP_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+
+
+def get_response_cache() -> ResponseCache | SQLiteResponseCache:
+    """Get or create the response cache selected by FMP_CACHE_BACKEND.
+
+    "memory" (the default) keeps entries in this process; "sqlite" shares them
+    with other worker processes through FMP_CACHE_PATH.
+    """
+    global _response_cache
+
+    if _response_cache is None:
+        max_bytes = int(os.getenv("FMP_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        max_stale = float(os.getenv("FMP_CACHE_MAX_STALE", DEFAULT_MAX_STALE))
+        backend = os.getenv("FMP_CACHE_BACKEND", "memory").lower()
+        if backend == "memory":
+            _response_cache = ResponseCache(max_bytes=max_bytes, max_stale=max_stale)
+        elif backend == "sqlite":
+            path = env_path("FMP_CACHE_PATH", default_cache_dir() / "responses.sqlite3")
+            _response_cache = SQLiteResponseCache(path, max_bytes=max_bytes, max_stale=max_stale)
+        else:
+            raise ValueError(
+                f"Unknown FMP_CACHE_BACKEND: {backend!r} (expected 'memory' or 'sqlite')"
+            )
+
+    return _response_cache
+
+
+async def _call_cache(method: str, *args: Any) -> Any:
+    """Call a response cache method, off the event loop when it touches SQLite."""
+    cache = get_response_cache()
+    if isinstance(cache, SQLiteResponseCache):
+        try:
+            return await asyncio.to_thread(getattr(cache, method), *args)
+        except sqlite3.Error:
+            # Another process holds the lock; the cache is best effort
+            return None
+    return getattr(cache, method)(*args)
+
+
+async def cached_response(name: str, arguments: Any) -> str | None:
+    """Look up a fresh cached response."""
+    return await _call_cache("get", name, arguments)
+
+
+async def stale_response(name: str, arguments: Any) -> tuple[str, float] | None:
+    """Look up a response kept past its TTL, with its seconds since expiry."""
+    return await _call_cache("get_stale", name, arguments)
+
+
+async def store_response(name: str, arguments: Any, text: str, ttl: float) -> None:
+    """Cache a response for ``ttl`` seconds."""
+    await _call_cache("set", name, arguments, text, ttl)
+
+
+async def cache_stats() -> dict[str, Any] | None:
+    """Get the response cache stats, or None when the shared cache is locked."""
+    return await _call_cache("stats")
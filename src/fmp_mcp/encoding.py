@@ -0,0 +1,176 @@
+"""Columnar TOON encoding for uniform lists of rows."""
+
+import math
+import re
+from datetime import date, datetime, time
+from decimal import Decimal
+from operator import attrgetter, itemgetter
+from typing import Any, Callable
+
+from toon.primitives import encode_key, encode_string_literal, format_number
+
+DELIMITER = ","
+INDENT = "  "
+
+# Rows encoded at a time; bounds the per-column scratch lists of long tables
+BATCH_ROWS = 4096
+
+# Strings starting with a letter and free of characters that may need quoting;
+# these can never look like numbers or literals apart from null/true/false
+_PLAIN_STRING_RE = re.compile(r'[A-Za-z_.(/&][^\x00-\x1f:"\\\[\]{},\ud800-\udfff]*')
+_LITERALS = ("null", "true", "false")
+
+
+def _encode_string(value: str) -> str:
+    """Encode a string cell, skipping toon's checks for plainly safe strings."""
+    if (
+        _PLAIN_STRING_RE.fullmatch(value)
+        and value[-1] not in " \t"
+        and value not in _LITERALS
+    ):
+        return value
+    return encode_string_literal(value, DELIMITER)
+
+
+def _encode_float(value: float) -> str:
+    """Encode a float cell like toon's format_number, using repr when it is canonical."""
+    text = repr(value)
+    if "e" in text or "n" in text or value == 0:
+        return "null" if math.isnan(value) or math.isinf(value) else format_number(value)
+    return text[:-2] if text.endswith(".0") else text
+
+
+def _row_fields(rows: list[Any]) -> tuple[list[str], Callable[[str], Callable]] | None:
+    """Get the shared field names of the rows and a getter factory, or None."""
+    first = rows[0]
+
+    if isinstance(first, dict):
+        fields = list(first)
+        key_set = set(fields)
+        for row in rows:
+            if not isinstance(row, dict) or len(row) != len(fields) or row.keys() != key_set:
+                return None
+        return fields, itemgetter
+
+    model = type(first)
+    if not hasattr(model, "model_fields") or getattr(model, "model_computed_fields", None):
+        return None
+    if any(field.exclude for field in model.model_fields.values()):
+        return None
+    for row in rows:
+        # Extra fields would change the dumped keys from row to row
+        if type(row) is not model or getattr(row, "__pydantic_extra__", None):
+            return None
+    return list(model.model_fields), attrgetter
+
+
+def _encode_column(values: list[Any]) -> list[str] | None:
+    """Encode one column of cells, or return None if a cell is not a primitive."""
+    encoded = []
+    strings: dict[str, str] = {}
+    for value in values:
+        if value is None:
+            encoded.append("null")
+        elif value is True:
+            encoded.append("true")
+        elif value is False:
+            encoded.append("false")
+        elif type(value) is str:
+            text = strings.get(value)
+            if text is None:
+                text = strings[value] = _encode_string(value)
+            encoded.append(text)
+        elif type(value) is int:
+            encoded.append(str(value))
+        elif isinstance(value, float):
+            encoded.append(_encode_float(value))
+        elif isinstance(value, int):
+            encoded.append(str(int(value)))
+        elif isinstance(value, str):
+            encoded.append(encode_string_literal(value, DELIMITER))
+        elif isinstance(value, (date, datetime, time)):
+            encoded.append(encode_string_literal(value.isoformat(), DELIMITER))
+        elif isinstance(value, Decimal):
+            if not value.is_finite():
+                encoded.append("null")
+            elif value == value.to_integral_value():
+                encoded.append(str(int(value)))
+            else:
+                encoded.append(format_number(float(value)))
+        else:
+            return None
+    return encoded
+
+
+def _encode_rows(
+    rows: list[Any], fields: list[str], getter: Callable[[str], Callable]
+) -> list[str] | None:
+    """Encode rows as indented table lines, or return None if a cell is not a primitive."""
+    columns = []
+    for name in fields:
+        column = _encode_column(list(map(getter(name), rows)))
+        if column is None:
+            return None
+        columns.append(column)
+    return [INDENT + DELIMITER.join(cells) for cells in zip(*columns)]
+
+
+def encode_table_prefix(rows: list[Any], max_bytes: int | None) -> tuple[str, int] | None:
+    """Encode as many leading rows as fit in ``max_bytes`` as a TOON table.
+
+    Rows are encoded in batches of BATCH_ROWS and encoding stops at the first
+    row that would overflow the limit, so scratch memory stays bounded by one
+    batch and the output by ``max_bytes``. Returns the table and the number of
+    rows it holds, or None when a batch it reads does not fit the flat tabular
+    form.
+    """
+    if not rows:
+        return None
+
+    shape = _row_fields(rows[:1])
+    if shape is None or not shape[0]:
+        return None
+    fields, getter = shape
+    field_set = set(fields)
+    keys = DELIMITER.join(encode_key(name) for name in fields)
+
+    # Reserve room for the header as it would read with every row kept
+    budget = None
+    if max_bytes is not None:
+        budget = max_bytes - len(f"[{len(rows)}]{{{keys}}}:".encode("utf-8"))
+
+    lines: list[str] = []
+    size = 0
+    for start in range(0, len(rows), BATCH_ROWS):
+        batch = rows[start:start + BATCH_ROWS]
+        batch_shape = _row_fields(batch)
+        if batch_shape is None or batch_shape[1] is not getter or set(batch_shape[0]) != field_set:
+            return None
+        encoded = _encode_rows(batch, fields, getter)
+        if encoded is None:
+            return None
+        if budget is None:
+            lines.extend(encoded)
+            continue
+        for line in encoded:
+            size += 1 + (len(line) if line.isascii() else len(line.encode("utf-8")))
+            if size > budget:
+                break
+            lines.append(line)
+        if size > budget:
+            break
+
+    lines.insert(0, f"[{len(lines)}]{{{keys}}}:")
+    return "\n".join(lines), len(lines) - 1
+
+
+def encode_table(rows: list[Any]) -> str | None:
+    """Encode a list of flat, uniform dicts or pydantic models as a TOON table.
+
+    Values are read column by column straight from the rows, so models are never
+    dumped to per-row dicts. The output matches ``toon.encode`` of the dumped rows.
+    Returns None when the rows do not fit the flat tabular form, leaving the caller
+    to fall back to the generic encoder.
+    """
+    table = encode_table_prefix(rows, None)
+    return table[0] if table is not None else None
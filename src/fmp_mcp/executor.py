@@ -0,0 +1,147 @@
+"""Bounded worker pool for running blocking FMP client calls off the event loop."""
+
+import asyncio
+import functools
+import inspect
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Iterable
+
+from .metrics import get_metrics
+from .ratelimit import LANE_NAMES, RateLimitTimeoutError, current_priority, get_rate_limiter
+from .resilience import get_resilience
+from .tracing import span
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_CALL_TIMEOUT = 30.0
+DEFAULT_FANOUT_CONCURRENCY = 8
+
+# Global worker pool instance
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_max_workers() -> int:
+    """Get worker pool size from FMP_MAX_WORKERS."""
+    return max(1, int(os.getenv("FMP_MAX_WORKERS", DEFAULT_MAX_WORKERS)))
+
+
+def get_call_timeout() -> float | None:
+    """Get per-call timeout in seconds from FMP_CALL_TIMEOUT (0 disables it)."""
+    timeout = float(os.getenv("FMP_CALL_TIMEOUT", DEFAULT_CALL_TIMEOUT))
+    return timeout if timeout > 0 else None
+
+
+def get_fanout_concurrency() -> int:
+    """Get the parallelism for multi-call fan-outs from FMP_FANOUT_CONCURRENCY."""
+    return max(1, int(os.getenv("FMP_FANOUT_CONCURRENCY", DEFAULT_FANOUT_CONCURRENCY)))
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get or create the shared worker pool."""
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=get_max_workers(),
+            thread_name_prefix="fmp-worker",
+        )
+
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Shut down the worker pool, dropping calls that have not started yet."""
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _with_timeout(awaitable: Awaitable[Any]) -> Any:
+    """Await a call bounded by FMP_CALL_TIMEOUT."""
+    timeout = get_call_timeout()
+
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"FMP call timed out after {timeout:g}s") from None
+
+
+async def _acquire_token(priority: int) -> None:
+    """Wait for a rate-limit token, bounded by FMP_CALL_TIMEOUT."""
+    timeout = get_call_timeout()
+
+    try:
+        await asyncio.wait_for(get_rate_limiter().acquire(priority), timeout)
+    except asyncio.TimeoutError:
+        raise RateLimitTimeoutError(
+            f"Waited over {timeout:g}s for a rate-limit token; too many FMP calls are queued"
+        ) from None
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking callable in the worker pool and await its result.
+
+    The call is bounded by FMP_CALL_TIMEOUT. If the awaiting task is cancelled
+    (e.g. the MCP client cancels the request) or times out, a call still waiting
+    for a free worker is dropped; one already running finishes in the background
+    and its result is discarded.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+    return await _with_timeout(future)
+
+
+async def call_client(method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Call an FMP client method without blocking the event loop.
+
+    Each attempt first takes a token from the shared rate limiter in the priority
+    lane of the current tool call. Coroutine methods (the async transport) are
+    then awaited directly; blocking FMPClient methods run in the worker pool.
+    Queueing for the token and the call itself are each bounded by FMP_CALL_TIMEOUT;
+    a call that times out in the queue fails with RateLimitTimeoutError, which is
+    local back-pressure and so is not retried or held against the endpoint.
+    Transient upstream failures are retried with backoff, and calls to an endpoint
+    whose circuit breaker is open fail fast with CircuitOpenError.
+    """
+    endpoint = getattr(method, "__name__", "upstream")
+
+    async def attempt() -> Any:
+        priority = current_priority.get()
+        with span("ratelimit.wait", **{"fmp.lane": LANE_NAMES[priority]}):
+            await _acquire_token(priority)
+        start = time.perf_counter()
+        try:
+            with span("upstream", **{"fmp.endpoint": endpoint}):
+                if inspect.iscoroutinefunction(method):
+                    return await _with_timeout(method(*args, **kwargs))
+                return await run_blocking(method, *args, **kwargs)
+        except Exception:
+            get_metrics().inc("fmp_upstream_errors_total", endpoint=endpoint)
+            raise
+        finally:
+            get_metrics().observe(
+                "fmp_upstream_request_seconds", time.perf_counter() - start, endpoint=endpoint
+            )
+
+    return await get_resilience().call(endpoint, attempt)
+
+
+async def gather_bounded(
+    calls: Iterable[Callable[[], Awaitable[Any]]],
+    limit: int | None = None,
+) -> list[Any]:
+    """Run zero-argument async callables concurrently, at most ``limit`` at a time.
+
+    Results are returned in order; exceptions are returned in place of results
+    rather than cancelling the other calls.
+    """
+    semaphore = asyncio.Semaphore(limit or get_fanout_concurrency())
+
+    async def run(call: Callable[[], Awaitable[Any]]) -> Any:
+        async with semaphore:
+            return await call()
+
+    return await asyncio.gather(*(run(call) for call in calls), return_exceptions=True)
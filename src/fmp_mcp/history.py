@@ -0,0 +1,211 @@
+"""Serve historical ranges and financial-statement periods from the persistent store."""
+
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+from functools import partial
+from typing import Any, Awaitable, Callable
+
+from .executor import gather_bounded, run_blocking
+from .store import get_history_store
+
+# Rows dated on or after (today - SETTLE_DAYS) may still be revised upstream
+SETTLE_DAYS = 2
+
+DEFAULT_STATEMENT_RECHECK = 12 * 60 * 60
+
+RangeFetch = Callable[..., Awaitable[Any]]
+PeriodFetch = Callable[..., Awaitable[Any]]
+
+
+def settled_until() -> date:
+    """Get the latest date whose rows are treated as immutable."""
+    return datetime.now(timezone.utc).date() - timedelta(days=SETTLE_DAYS)
+
+
+def to_rows(result: Any) -> list[dict[str, Any]] | None:
+    """Convert a client result to a list of dated row dicts, or None if it has another shape."""
+    if not isinstance(result, list):
+        return None
+
+    rows = [item.model_dump() if hasattr(item, "model_dump") else item for item in result]
+    if not all(isinstance(row, dict) and isinstance(row.get("date"), str) for row in rows):
+        return None
+    return rows
+
+
+def _parse_date(value: Any) -> date | None:
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def missing_ranges(
+    spans: list[tuple[str, str]], start: str, end: str
+) -> list[tuple[str, str]]:
+    """Get the gaps in [start, end] not covered by the sorted, merged spans."""
+    gaps = []
+    cursor = start
+    for span_start, span_end in spans:
+        if span_end < cursor:
+            continue
+        if span_start > end:
+            break
+        if span_start > cursor:
+            gaps.append((cursor, (date.fromisoformat(span_start) - timedelta(days=1)).isoformat()))
+        cursor = (date.fromisoformat(span_end) + timedelta(days=1)).isoformat()
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+async def fetch_date_range(
+    dataset: str,
+    key: str,
+    fetch: RangeFetch,
+    from_date: str | None,
+    to_date: str | None,
+    capped: bool = False,
+    adjusted: bool = False,
+) -> Any:
+    """Fetch dated rows for [from_date, to_date], reusing settled rows from the store.
+
+    Each gap between the spans already held locally is requested upstream on its
+    own (concurrently), and the results are stitched with the stored rows into
+    the requested window, newest first. Rows newer than the settle cutoff are
+    always fetched live. Requests without an explicit date window, or results
+    that are not dated rows, pass through.
+
+    ``capped`` marks endpoints that may silently return only the latest part of
+    a long window (intraday charts); for those a segment only counts as covered
+    from the day after its earliest returned row.
+
+    ``adjusted`` marks series that upstream rewrites after splits or dividends
+    (split- or dividend-adjusted prices). Before stored rows of such a series
+    are reused, the newest stored day in the window is fetched again; if it
+    has changed, everything stored for the key is dropped and the window is
+    fetched afresh.
+    """
+    store = get_history_store()
+    start, end = _parse_date(from_date), _parse_date(to_date)
+    if store is None or start is None or end is None or start > end:
+        return await fetch(from_date=from_date, to_date=to_date)
+
+    settled = min(end, settled_until())
+    cutoff = settled.isoformat()
+    spans = await run_blocking(store.get_spans, dataset, key)
+    if adjusted and spans and start <= settled:
+        if not await _latest_stored_day_matches(store, dataset, key, fetch, start, settled):
+            await run_blocking(store.drop, dataset, key)
+            spans = []
+
+    segments = []
+    if start <= settled:
+        segments = missing_ranges(spans, start.isoformat(), cutoff)
+    if end > settled:
+        live_start = max(start, settled + timedelta(days=1)).isoformat()
+        if segments and segments[-1][1] == cutoff:
+            # Extend the trailing gap instead of making a separate live request
+            segments[-1] = (segments[-1][0], end.isoformat())
+        else:
+            segments.append((live_start, end.isoformat()))
+
+    if not segments:
+        return await run_blocking(store.get_rows, dataset, key, from_date, to_date)
+
+    # Long windows can have many gaps; fetch them within the fan-out limit
+    results = await gather_bounded(
+        partial(fetch, from_date=seg_start, to_date=seg_end) for seg_start, seg_end in segments
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    fetched = [to_rows(result) for result in results]
+    if any(rows is None for rows in fetched):
+        if len(segments) == 1 and segments[0] == (start.isoformat(), end.isoformat()):
+            return results[0]
+        return await fetch(from_date=from_date, to_date=to_date)
+
+    settled_rows, live_rows, covered = [], [], []
+    for (seg_start, seg_end), rows in zip(segments, fetched):
+        settled_rows.extend(row for row in rows if row["date"][:10] <= cutoff)
+        live_rows.extend(row for row in rows if row["date"][:10] > cutoff)
+        if capped and rows:
+            earliest = min(row["date"][:10] for row in rows)
+            if earliest > seg_start:
+                # The earliest returned day may itself be cut short
+                seg_start = (date.fromisoformat(earliest) + timedelta(days=1)).isoformat()
+        if seg_start <= min(seg_end, cutoff):
+            covered.append((seg_start, min(seg_end, cutoff)))
+
+    if covered:
+        await run_blocking(store.put_rows, dataset, key, settled_rows, covered)
+
+    live_rows.sort(key=lambda row: row["date"], reverse=True)
+    if start > settled:
+        return live_rows
+    stored = await run_blocking(store.get_rows, dataset, key, from_date, cutoff)
+    return live_rows + stored
+
+
+async def _latest_stored_day_matches(
+    store: Any, dataset: str, key: str, fetch: RangeFetch, start: date, end: date
+) -> bool:
+    """Re-fetch the newest stored day in [start, end] and check that upstream still agrees."""
+    day = await run_blocking(
+        store.get_latest_date, dataset, key, start.isoformat(), end.isoformat()
+    )
+    if day is None:
+        return True
+    day = day[:10]
+    fresh = to_rows(await fetch(from_date=day, to_date=day))
+    if fresh is None:
+        return True
+    fresh = sorted(
+        (row for row in fresh if row["date"][:10] == day),
+        key=lambda row: row["date"],
+        reverse=True,
+    )
+    return fresh == await run_blocking(store.get_rows, dataset, key, day, day)
+
+
+async def fetch_statements(
+    dataset: str,
+    key: str,
+    fetch: PeriodFetch,
+    limit: int,
+) -> Any:
+    """Fetch the latest ``limit`` statement periods, reusing closed periods from the store.
+
+    When enough periods are stored and were checked recently, no upstream call is
+    made. Otherwise a one-period probe detects whether a new period was published;
+    the full ``limit`` is requested only when periods are missing.
+    """
+    store = get_history_store()
+    if store is None:
+        return await fetch(limit=limit)
+
+    recheck = float(os.getenv("FMP_STATEMENT_RECHECK", DEFAULT_STATEMENT_RECHECK))
+    stored = await run_blocking(store.get_rows, dataset, key)
+
+    if len(stored) >= limit:
+        checked_at = await run_blocking(store.get_checked_at, dataset, key)
+        if checked_at is not None and time.time() - checked_at < recheck:
+            return stored[:limit]
+
+        probe = to_rows(await fetch(limit=1))
+        if probe and all(row["date"] == stored[0]["date"] for row in probe):
+            await run_blocking(store.mark_checked, dataset, key)
+            return stored[:limit]
+
+    result = await fetch(limit=limit)
+    rows = to_rows(result)
+    if rows is None:
+        return result
+
+    await run_blocking(store.put_rows, dataset, key, rows)
+    await run_blocking(store.mark_checked, dataset, key)
+    return rows
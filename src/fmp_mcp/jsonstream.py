@@ -0,0 +1,69 @@
+"""Incremental decoding of JSON array bodies as they arrive."""
+
+import json
+from typing import Any
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+_WHITESPACE = b" \t\r\n"
+
+
+class JSONArrayStream:
+    """Decodes the items of a top-level JSON array chunk by chunk.
+
+    Each fed chunk is split after its last ``}`` and everything before that is
+    decoded in one call, so finished items are released as soon as their bytes
+    have arrived and the undecoded body never grows beyond a chunk or so. A
+    split inside a string or a nested object leaves an incomplete prefix that
+    fails to decode; the bytes then wait for more data, with attempts spaced out
+    so a single huge item is still decoded in linear time. Bodies that are not
+    arrays are buffered whole and decoded by ``close``.
+    """
+
+    def __init__(self):
+        self.array: bool | None = None
+        self._buffer = bytearray()
+        self._retry_at = 0
+
+    def feed(self, data: bytes) -> list[Any]:
+        """Add a chunk of the body and return the items it completed."""
+        self._buffer += data
+        if self.array is None:
+            stripped = self._buffer.lstrip(_WHITESPACE)
+            if not stripped:
+                return []
+            self.array = stripped.startswith(b"[")
+            if self.array:
+                del self._buffer[:len(self._buffer) - len(stripped) + 1]
+        if not self.array or len(self._buffer) < self._retry_at:
+            return []
+
+        self._skip_separator()
+        end = self._buffer.rfind(b"}")
+        if end < 0:
+            return []
+        try:
+            items = json_loads(b"[" + self._buffer[:end + 1] + b"]")
+        except ValueError:
+            self._retry_at = 2 * len(self._buffer)
+            return []
+        del self._buffer[:end + 1]
+        self._retry_at = 0
+        return items
+
+    def close(self) -> Any:
+        """Decode what is left: the remaining items of an array, or the whole document."""
+        if not self.array:
+            return json_loads(bytes(self._buffer))
+        self._skip_separator()
+        return json_loads(b"[" + self._buffer)
+
+    def _skip_separator(self) -> None:
+        """Drop the whitespace and comma left between the last decoded item and the next."""
+        start = len(self._buffer) - len(self._buffer.lstrip(_WHITESPACE))
+        if self._buffer[start:start + 1] == b",":
+            start += 1
+        del self._buffer[:start]
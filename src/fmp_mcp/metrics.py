@@ -0,0 +1,241 @@
+"""In-process metrics for tool calls and upstream requests, with Prometheus text output."""
+
+from bisect import bisect_left
+from typing import Any
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Metric name: (type, help, buckets for histograms)
+METRICS = {
+    "fmp_tool_calls_total": (
+        "counter", "Tool calls by outcome (ok, cached, stale, error)", None
+    ),
+    "fmp_tool_duration_seconds": (
+        "histogram", "Tool call time from request to response", LATENCY_BUCKETS
+    ),
+    "fmp_tool_fetch_seconds": (
+        "histogram", "Time spent getting data, including rate-limit queueing and parsing",
+        LATENCY_BUCKETS,
+    ),
+    "fmp_tool_encode_seconds": (
+        "histogram", "Time spent projecting fields and encoding the response", LATENCY_BUCKETS
+    ),
+    "fmp_tool_response_bytes": ("histogram", "Encoded response size", SIZE_BUCKETS),
+    "fmp_tool_rows_total": ("counter", "Rows returned by tools", None),
+    "fmp_upstream_request_seconds": (
+        "histogram", "Upstream request time per client method", LATENCY_BUCKETS
+    ),
+    "fmp_upstream_errors_total": ("counter", "Failed upstream requests per client method", None),
+}
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating within its bucket, like histogram_quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+def _labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    pairs = (
+        key + '="' + value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') + '"'
+        for key, value in labels
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metrics:
+    """Counters and histograms keyed by metric name and label values."""
+
+    def __init__(self):
+        self.counters: dict[str, dict[tuple[tuple[str, str], ...], float]] = {}
+        self.histograms: dict[str, dict[tuple[tuple[str, str], ...], Histogram]] = {}
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        """Add to a counter."""
+        series = self.counters.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record a value in a histogram."""
+        series = self.histograms.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram(METRICS[name][2])
+        histogram.observe(value)
+
+    def tool_summary(self) -> list[dict[str, Any]]:
+        """Summarize calls, latency quantiles and payload sizes per tool."""
+        calls = self.counters.get("fmp_tool_calls_total", {})
+        tools = sorted({dict(key)["tool"] for key in calls})
+        summary = []
+        for tool in tools:
+            key = (("tool", tool),)
+            outcomes = {
+                dict(labels)["result"]: count
+                for labels, count in calls.items() if dict(labels)["tool"] == tool
+            }
+            total = self._histogram("fmp_tool_duration_seconds", key)
+            fetch = self._histogram("fmp_tool_fetch_seconds", key)
+            encode = self._histogram("fmp_tool_encode_seconds", key)
+            size = self._histogram("fmp_tool_response_bytes", key)
+            summary.append({
+                "tool": tool,
+                "calls": int(sum(outcomes.values())),
+                "cached": int(outcomes.get("cached", 0)),
+                "stale": int(outcomes.get("stale", 0)),
+                "errors": int(outcomes.get("error", 0)),
+                "p50_ms": round(total.quantile(0.5) * 1000, 2),
+                "p99_ms": round(total.quantile(0.99) * 1000, 2),
+                "fetch_p50_ms": round(fetch.quantile(0.5) * 1000, 2),
+                "encode_p50_ms": round(encode.quantile(0.5) * 1000, 2),
+                "bytes_avg": round(size.sum / size.count) if size.count else 0,
+                "rows": int(self.counters.get("fmp_tool_rows_total", {}).get(key, 0)),
+            })
+        return summary
+
+    def render(self, components: dict[str, Any] | None = None) -> str:
+        """Render all metrics, plus gauges for ``component_stats()``, as Prometheus text."""
+        lines = []
+        for name, (kind, help_text, _) in METRICS.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for labels, value in sorted(self.counters.get(name, {}).items()):
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+            for labels, histogram in sorted(self.histograms.get(name, {}).items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    bucket = labels + (("le", _number(bound)),)
+                    lines.append(f"{name}_bucket{_labels(bucket)} {cumulative}")
+                inf = labels + (("le", "+Inf"),)
+                lines.append(f"{name}_bucket{_labels(inf)} {histogram.count}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+        families = component_metrics(components) if components is not None else []
+        for name, kind, help_text, samples in families:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            lines += [f"{name}{_labels(labels)} {_number(value)}" for labels, value in samples]
+        return "\n".join(lines) + "\n"
+
+    def _histogram(self, name: str, key: tuple[tuple[str, str], ...]) -> Histogram:
+        return self.histograms.get(name, {}).get(key) or Histogram(METRICS[name][2])
+
+
+async def component_stats() -> dict[str, Any]:
+    """Collect the stats of the cache, rate limiter, retries and local indexes."""
+    from .cache import cache_enabled, cache_stats
+    from .ratelimit import get_rate_limiter
+    from .resilience import get_resilience
+    from .screener import get_local_screener
+    from .symbols import get_symbol_search
+
+    stats: dict[str, Any] = {}
+    if cache_enabled():
+        cache = await cache_stats()
+        if cache is not None:
+            stats["cache"] = cache
+    stats["rate_limit"] = get_rate_limiter().stats()
+    stats["upstream"] = get_resilience().stats()
+    for key, component in (("symbol_index", get_symbol_search()),
+                           ("screener", get_local_screener())):
+        if component is not None:
+            stats[key] = component.stats()
+    return stats
+
+
+def component_metrics(
+    stats: dict[str, Any],
+) -> list[tuple[str, str, str, list[tuple[tuple, float]]]]:
+    """Convert component stats to (name, type, help, samples) gauge and counter families."""
+    families = []
+
+    cache = stats.get("cache")
+    if cache is not None:
+        families += [
+            ("fmp_cache_entries", "gauge", "Cached responses", [((), cache["entries"])]),
+            ("fmp_cache_bytes", "gauge", "Bytes of cached responses", [((), cache["bytes"])]),
+            ("fmp_cache_hits_total", "counter", "Response cache hits", [((), cache["hits"])]),
+            ("fmp_cache_misses_total", "counter", "Response cache misses",
+             [((), cache["misses"])]),
+            ("fmp_cache_evictions_total", "counter", "Response cache evictions",
+             [((), cache["evictions"])]),
+        ]
+
+    limiter = stats["rate_limit"]
+    lanes = limiter["lanes"]
+    families += [
+        ("fmp_ratelimit_tokens", "gauge", "Rate-limit tokens available",
+         [((), limiter["tokens"])]),
+        ("fmp_ratelimit_queued", "gauge", "Calls waiting for a rate-limit token",
+         [((), limiter["queued"])]),
+        ("fmp_ratelimit_acquired_total", "counter", "Rate-limit tokens taken per priority lane",
+         [((("lane", lane),), lanes[lane]["acquired"]) for lane in lanes]),
+        ("fmp_ratelimit_wait_seconds_total", "counter",
+         "Time spent queued for rate-limit tokens per priority lane",
+         [((("lane", lane),), lanes[lane]["wait_total"]) for lane in lanes]),
+    ]
+
+    upstream = stats["upstream"]
+    families += [
+        ("fmp_upstream_retries_total", "counter", "Upstream requests retried",
+         [((), upstream["retries"])]),
+        ("fmp_upstream_circuit_open", "gauge", "Client methods whose circuit breaker is open",
+         [((("endpoint", endpoint),), 1)
+          for endpoint, state in upstream["circuits"].items() if state == "open"]),
+    ]
+
+    for key, label in (("symbol_index", "symbol index"), ("screener", "screener snapshot")):
+        if key in stats:
+            families.append((
+                f"fmp_{key}_entries", "gauge", f"Rows in the local {label}",
+                [((), stats[key]["entries"])],
+            ))
+    return families
+
+
+# Global metrics instance
+_metrics: Metrics | None = None
+
+
+def get_metrics() -> Metrics:
+    """Get or create the process-wide metrics."""
+    global _metrics
+
+    if _metrics is None:
+        _metrics = Metrics()
+
+    return _metrics
@@ -0,0 +1,158 @@
+"""Server-side pagination of large list results with opaque cursors."""
+
+import base64
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from .singleflight import get_single_flight
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+# Full results held for paging, least recently used dropped first
+DEFAULT_MAX_RESULTS = 16
+
+CURSOR_ARGUMENT = "cursor"
+PAGE_SIZE_ARGUMENT = "page_size"
+
+
+def page_schema(page_size: int) -> dict[str, Any]:
+    """Build the JSON schema properties added to paginated tools."""
+    return {
+        CURSOR_ARGUMENT: {
+            "type": "string",
+            "description": "Cursor from a previous page's next_cursor; page_size and "
+            "fields may be changed, other arguments are taken from the cursor",
+        },
+        PAGE_SIZE_ARGUMENT: {
+            "type": "integer",
+            "minimum": 1,
+            "maximum": MAX_PAGE_SIZE,
+            "description": f"Rows per page (default {page_size})",
+        },
+    }
+
+
+def encode_cursor(name: str, arguments: dict[str, Any], offset: int) -> str:
+    """Build an opaque cursor for the page of a call starting at ``offset``."""
+    payload = json.dumps({"t": name, "a": arguments, "o": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(name: str, cursor: str) -> tuple[dict[str, Any], int]:
+    """Get the original arguments and page offset from a cursor for this tool."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        arguments, offset = payload["a"], int(payload["o"])
+        valid = payload["t"] == name and isinstance(arguments, dict) and offset >= 0
+    except (ValueError, TypeError, KeyError):
+        valid = False
+    if not valid:
+        raise ValueError(f"Invalid cursor for {name}")
+    return arguments, offset
+
+
+def resume_arguments(
+    name: str, arguments: dict[str, Any], adjustable: tuple[str, ...]
+) -> tuple[dict[str, Any], int]:
+    """Get the arguments and offset to continue a call from its cursor.
+
+    Arguments in ``adjustable`` that are passed along with the cursor replace the
+    cursor's values; any other argument must match the call the cursor came from.
+    """
+    resumed, offset = decode_cursor(name, arguments[CURSOR_ARGUMENT])
+    for key, value in arguments.items():
+        if key == CURSOR_ARGUMENT or value is None:
+            continue
+        if key in adjustable:
+            resumed[key] = value
+        elif resumed.get(key) != value:
+            raise ValueError(
+                f"{key} does not match the cursor for {name}; "
+                f"with a cursor, only {' and '.join(adjustable)} may be changed"
+            )
+    return resumed, offset
+
+
+class ResultCache:
+    """Full list results kept in memory for paging, with TTLs and an entry limit."""
+
+    def __init__(self, max_results: int = DEFAULT_MAX_RESULTS):
+        self.max_results = max_results
+        self._entries: OrderedDict[str, tuple[float, list[Any]]] = OrderedDict()
+
+    def get(self, key: str) -> list[Any] | None:
+        """Return the held result, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, rows: list[Any], ttl: float) -> None:
+        """Hold a result for ``ttl`` seconds."""
+        self._entries[key] = (time.monotonic() + ttl, rows)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_results:
+            self._entries.popitem(last=False)
+
+
+async def fetch_page(
+    name: str,
+    key: str,
+    fetch: Callable[[], Awaitable[Any]],
+    arguments: dict[str, Any],
+    offset: int,
+    page_size: int,
+    ttl: float,
+) -> Any:
+    """Return one page of a list result, fetching the full result upstream only once.
+
+    ``key`` identifies the full result and ``arguments`` are stored in the next
+    cursor. Results that are not lists are returned unchanged.
+    """
+    cache = get_result_cache()
+    rows = cache.get(key)
+    if rows is None:
+        rows = await get_single_flight().do("rows:" + key, fetch)
+        if not isinstance(rows, list):
+            return rows
+        cache.set(key, rows, ttl)
+
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    page = rows[offset:offset + page_size]
+    end = offset + len(page)
+    return {
+        "results": page,
+        "total": len(rows),
+        "offset": offset,
+        "next_cursor": encode_cursor(name, arguments, end) if end < len(rows) else None,
+    }
+
+
+def shorten_page(name: str, arguments: dict[str, Any], page: dict[str, Any], count: int) -> Any:
+    """Cut a page from fetch_page to its first ``count`` rows, moving next_cursor back."""
+    end = page["offset"] + count
+    return {
+        **page,
+        "results": page["results"][:count],
+        "next_cursor": encode_cursor(name, arguments, end) if end < page["total"] else None,
+    }
+
+
+# Global result cache instance
+_result_cache: ResultCache | None = None
+
+
+def get_result_cache() -> ResultCache:
+    """Get or create the shared result cache."""
+    global _result_cache
+
+    if _result_cache is None:
+        _result_cache = ResultCache()
+
+    return _result_cache
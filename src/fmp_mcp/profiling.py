@@ -0,0 +1,140 @@
+"""Opt-in sampling profiler that dumps stacks of slow tool calls."""
+
+import contextlib
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Iterator
+
+from .store import default_cache_dir, env_path
+from .tracing import current_trace_id
+
+DEFAULT_SAMPLE_INTERVAL_MS = 5.0
+
+# Keep at most this many frames per sampled stack, innermost last
+MAX_STACK_DEPTH = 64
+
+
+def _folded_stack(frame) -> str:
+    """Render a frame's stack in the folded format read by flamegraph tools."""
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _idle(frame) -> bool:
+    """Check whether a pool thread is waiting for work rather than running a call."""
+    return frame.f_code.co_name == "_worker" and frame.f_code.co_filename.endswith("thread.py")
+
+
+class SlowCallProfiler:
+    """Samples thread stacks while tool calls run and dumps those of slow calls.
+
+    A background thread wakes every ``interval`` seconds while any call is in
+    progress and records the stacks of the event-loop thread and the worker
+    pool. Because calls share those threads, a call's profile also contains
+    whatever ran concurrently with it. Calls lasting at least ``threshold``
+    seconds are written to ``directory`` as folded stacks (one
+    ``frame;frame;frame count`` line per stack), which speedscope and
+    flamegraph.pl read directly.
+    """
+
+    def __init__(self, threshold: float, directory: str | Path, interval: float):
+        self.threshold = threshold
+        self.directory = Path(directory)
+        self.interval = interval
+        self.dumps = 0
+        self._active: dict[int, Counter] = {}
+        self._loop_threads: dict[int, int] = {}
+        self._ids = iter(range(sys.maxsize))
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._sampler: threading.Thread | None = None
+
+    @contextlib.contextmanager
+    def profile(self, name: str) -> Iterator[None]:
+        """Sample stacks while the block runs and dump them if it is slow."""
+        call_id = next(self._ids)
+        samples: Counter = Counter()
+        start = time.perf_counter()
+        with self._lock:
+            self._active[call_id] = samples
+            self._loop_threads[call_id] = threading.get_ident()
+            if self._sampler is None:
+                self._sampler = threading.Thread(
+                    target=self._run, name="fmp-profiler", daemon=True
+                )
+                self._sampler.start()
+            self._wake.notify()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                del self._active[call_id]
+                del self._loop_threads[call_id]
+            if elapsed >= self.threshold and samples:
+                self.dump(name, elapsed, samples)
+
+    def dump(self, name: str, elapsed: float, samples: Counter) -> Path:
+        """Write a call's samples as folded stacks and return the file path."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        suffix = current_trace_id() or f"{int(elapsed * 1000)}ms"
+        path = self.directory / f"{name}-{stamp}-{suffix}.folded"
+        lines = [f"{stack} {count}" for stack, count in samples.most_common()]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        self.dumps += 1
+        return path
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._active:
+                    self._wake.wait()
+                loop_threads = set(self._loop_threads.values())
+                active = list(self._active.values())
+
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stacks = []
+            for ident, frame in sys._current_frames().items():
+                name = names.get(ident, "")
+                if ident in loop_threads or (name.startswith("fmp-worker") and not _idle(frame)):
+                    stacks.append(f"{name or ident};{_folded_stack(frame)}")
+            for samples in active:
+                samples.update(stacks)
+            time.sleep(self.interval)
+
+
+def profile_call(name: str) -> contextlib.AbstractContextManager[None]:
+    """Profile a tool call when FMP_PROFILE_SLOW_MS is set; a no-op otherwise."""
+    profiler = get_profiler()
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.profile(name)
+
+
+# Global profiler instance; False until the environment has been read
+_profiler: SlowCallProfiler | None | bool = False
+
+
+def get_profiler() -> SlowCallProfiler | None:
+    """Get the slow-call profiler configured by FMP_PROFILE_SLOW_MS, or None when off."""
+    global _profiler
+
+    if _profiler is False:
+        threshold_ms = float(os.getenv("FMP_PROFILE_SLOW_MS", "0"))
+        if threshold_ms > 0:
+            interval_ms = float(os.getenv("FMP_PROFILE_INTERVAL_MS", DEFAULT_SAMPLE_INTERVAL_MS))
+            directory = env_path("FMP_PROFILE_DIR", default_cache_dir() / "profiles")
+            _profiler = SlowCallProfiler(threshold_ms / 1000, directory, interval_ms / 1000)
+        else:
+            _profiler = None
+
+    return _profiler
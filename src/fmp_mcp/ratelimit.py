@@ -0,0 +1,311 @@
+"""Client-side token-bucket rate limiter with priority lanes."""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from .store import connect_thread, default_cache_dir, env_path
+
+DEFAULT_RATE_PER_MINUTE = 300
+DEFAULT_BURST = 10
+
+# Seconds a shared-bucket update waits for another process's write lock, and
+# the pause before trying again when it gives up
+SHARED_BUSY_TIMEOUT = 0.5
+LOCKED_RETRY_DELAY = 0.05
+
+# Priority lanes, lower values are served first
+INTERACTIVE = 0
+NORMAL = 1
+BULK = 2
+
+LANE_NAMES = {INTERACTIVE: "interactive", NORMAL: "normal", BULK: "bulk"}
+
+# Intraday windows longer than this many days go to the bulk lane
+BULK_INTRADAY_DAYS = 31
+
+# Priority of the tool call currently being executed
+current_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "current_priority", default=NORMAL
+)
+
+
+class RateLimitTimeoutError(Exception):
+    """Raised when a call waits longer than its timeout for a rate-limit token.
+
+    The call never reached upstream, so it is neither retried nor counted
+    against the endpoint's circuit breaker.
+    """
+
+
+def intraday_priority(arguments: Any) -> int:
+    """Get the lane for an intraday chart call: bulk for multi-month windows."""
+    try:
+        start = date.fromisoformat(arguments["from_date"])
+        end = date.fromisoformat(arguments.get("to_date") or date.today().isoformat())
+    except (KeyError, TypeError, ValueError):
+        return NORMAL
+    return BULK if (end - start).days > BULK_INTRADAY_DAYS else NORMAL
+
+
+class TokenBucket:
+    """In-process bucket refilled at ``rate_per_minute`` holding up to ``burst`` tokens."""
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token, or return the seconds until one is available."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) * 60 / self.rate_per_minute
+
+    def give_back(self) -> None:
+        """Return an unused token."""
+        self._refill()
+        self.tokens = min(self.burst, self.tokens + 1)
+
+    def available(self) -> float:
+        """Get the current number of tokens."""
+        self._refill()
+        return self.tokens
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self._updated) * self.rate_per_minute / 60
+        )
+        self._updated = now
+
+
+class SharedTokenBucket:
+    """Token bucket kept in a SQLite file so server processes share one budget.
+
+    Each take runs in a short write transaction; refills use wall-clock time so
+    every process sees the same state.
+    """
+
+    def __init__(self, path: str | Path, rate_per_minute: float, burst: int):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self._local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS bucket (id INTEGER PRIMARY KEY CHECK (id = 0), "
+            "tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection."""
+        return connect_thread(self._local, self.path, timeout=SHARED_BUSY_TIMEOUT)
+
+    def _update(self, delta: float) -> tuple[bool, float]:
+        """Refill, then add ``delta`` tokens unless that would go negative.
+
+        Returns whether the change was applied and the resulting token count.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM bucket").fetchone()
+            now = time.time()
+            tokens = float(self.burst) if row is None else min(
+                self.burst, row[0] + (now - row[1]) * self.rate_per_minute / 60
+            )
+            applied = tokens + delta >= 0
+            if applied:
+                tokens = min(self.burst, tokens + delta)
+            conn.execute(
+                "INSERT OR REPLACE INTO bucket (id, tokens, updated) VALUES (0, ?, ?)",
+                (tokens, now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return applied, tokens
+
+    def take(self) -> float:
+        """Take a token, or return the seconds until one is available."""
+        taken, tokens = self._update(-1)
+        return 0.0 if taken else (1 - tokens) * 60 / self.rate_per_minute
+
+    def give_back(self) -> None:
+        """Return an unused token."""
+        self._update(1)
+
+    def available(self) -> float:
+        """Get the current number of tokens, reading without taking the write lock."""
+        row = self._connect().execute("SELECT tokens, updated FROM bucket").fetchone()
+        if row is None:
+            return float(self.burst)
+        return min(self.burst, row[0] + (time.time() - row[1]) * self.rate_per_minute / 60)
+
+
+class RateLimiter:
+    """Token bucket refilled at ``rate_per_minute`` holding up to ``burst`` tokens.
+
+    When no token is available, callers queue and are released in priority order
+    (FIFO within a lane) as tokens refill. A rate of 0 disables limiting. Pass a
+    SharedTokenBucket to draw from a budget shared with other processes; its
+    SQLite transactions run in a thread, and lock contention only delays the
+    queue instead of failing the call.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float = DEFAULT_RATE_PER_MINUTE,
+        burst: int = DEFAULT_BURST,
+        bucket: TokenBucket | SharedTokenBucket | None = None,
+    ):
+        self.rate_per_minute = rate_per_minute
+        self.burst = max(1, burst)
+        self.bucket = bucket or TokenBucket(rate_per_minute, self.burst)
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._releaser: asyncio.Task | None = None
+        self._background: set[asyncio.Future] = set()
+        self._lanes = {
+            lane: {"acquired": 0, "wait_total": 0.0, "wait_max": 0.0} for lane in LANE_NAMES
+        }
+
+    async def acquire(self, priority: int = NORMAL) -> float:
+        """Wait for a token and return the time spent queued in seconds."""
+        if self.rate_per_minute <= 0:
+            self._record(priority, 0.0)
+            return 0.0
+
+        start = time.monotonic()
+        if not self._waiters:
+            delay = await self._take()
+            if delay == 0:
+                self._record(priority, 0.0)
+                return 0.0
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._start_releaser()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # A token was granted as we were cancelled, hand it back
+                self._give_back()
+                self._start_releaser()
+            raise
+
+        waited = time.monotonic() - start
+        self._record(priority, waited)
+        return waited
+
+    def stats(self) -> dict[str, Any]:
+        """Return bucket state and per-lane queue wait metrics."""
+        lanes = {}
+        for lane, metrics in self._lanes.items():
+            acquired = metrics["acquired"]
+            lanes[LANE_NAMES[lane]] = {
+                **metrics,
+                "wait_avg": metrics["wait_total"] / acquired if acquired else 0.0,
+            }
+        return {
+            "rate_per_minute": self.rate_per_minute,
+            "burst": self.burst,
+            "tokens": self.bucket.available() if self.rate_per_minute > 0 else float(self.burst),
+            "queued": sum(1 for _, _, future in self._waiters if not future.done()),
+            "lanes": lanes,
+        }
+
+    async def _take(self) -> float:
+        """Take a token, or return the seconds to wait before trying again."""
+        try:
+            if isinstance(self.bucket, SharedTokenBucket):
+                return await asyncio.to_thread(self.bucket.take)
+            return self.bucket.take()
+        except sqlite3.Error:
+            # Another process holds the shared bucket; try again shortly
+            return LOCKED_RETRY_DELAY
+
+    def _give_back(self) -> None:
+        if not isinstance(self.bucket, SharedTokenBucket):
+            self.bucket.give_back()
+            return
+        task = asyncio.ensure_future(asyncio.to_thread(self.bucket.give_back))
+        self._background.add(task)
+        # A token lost to lock contention only makes the budget slightly stricter
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        task.add_done_callback(self._background.discard)
+
+    def _start_releaser(self) -> None:
+        if self._releaser is None:
+            self._releaser = asyncio.get_running_loop().create_task(self._release())
+
+    def _has_waiters(self) -> bool:
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        return bool(self._waiters)
+
+    async def _release(self) -> None:
+        # Grant tokens to waiters in priority order, sleeping while the bucket refills
+        try:
+            while self._has_waiters():
+                try:
+                    delay = await self._take()
+                except Exception as error:
+                    # Fail the head waiter rather than leave the whole queue stuck
+                    if self._has_waiters():
+                        heapq.heappop(self._waiters)[2].set_exception(error)
+                    continue
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif self._has_waiters():
+                    heapq.heappop(self._waiters)[2].set_result(None)
+                else:
+                    self._give_back()
+        finally:
+            self._releaser = None
+
+    def _record(self, priority: int, waited: float) -> None:
+        metrics = self._lanes[priority]
+        metrics["acquired"] += 1
+        metrics["wait_total"] += waited
+        metrics["wait_max"] = max(metrics["wait_max"], waited)
+
+
+# Global rate limiter instance
+_rate_limiter: RateLimiter | None = None
+
+
+def rate_limit_shared() -> bool:
+    """Check whether the budget is shared across processes via FMP_RATE_LIMIT_SHARED."""
+    return os.getenv("FMP_RATE_LIMIT_SHARED", "0").lower() in ("1", "true", "yes")
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get or create the shared rate limiter configured from the environment."""
+    global _rate_limiter
+
+    if _rate_limiter is None:
+        rate_per_minute = float(os.getenv("FMP_RATE_LIMIT_PER_MINUTE", DEFAULT_RATE_PER_MINUTE))
+        burst = max(1, int(os.getenv("FMP_RATE_LIMIT_BURST", DEFAULT_BURST)))
+        bucket = None
+        if rate_per_minute > 0 and rate_limit_shared():
+            path = env_path("FMP_RATE_LIMIT_PATH", default_cache_dir() / "ratelimit.sqlite3")
+            bucket = SharedTokenBucket(path, rate_per_minute, burst)
+        _rate_limiter = RateLimiter(rate_per_minute, burst, bucket)
+
+    return _rate_limiter
@@ -0,0 +1,184 @@
+"""Retries with jittered backoff and per-endpoint circuit breakers for upstream calls."""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Any, Awaitable, Callable
+
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_RETRY_BASE_DELAY = 0.5
+DEFAULT_RETRY_MAX_DELAY = 8.0
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN = 30.0
+
+# Upstream statuses worth retrying: rate limited or a server-side failure
+TRANSIENT_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(
+            f"{endpoint} is failing upstream; not retrying for another {retry_in:.0f}s"
+        )
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+def is_transient(error: BaseException) -> bool:
+    """Check whether an upstream error may succeed if the call is repeated."""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if getattr(error, "status_code", None) in TRANSIENT_STATUSES:
+        return True
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    # Only consult httpx when the async transport has already loaded it
+    httpx = sys.modules.get("httpx")
+    return httpx is not None and isinstance(error, httpx.TransportError)
+
+
+class CircuitBreaker:
+    """Fails fast after ``threshold`` consecutive transient failures of one endpoint.
+
+    Once open, calls are refused for ``cooldown`` seconds; after that a single
+    probe call is let through, closing the circuit on success and reopening it
+    on failure.
+    """
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        cooldown: float = DEFAULT_BREAKER_COOLDOWN,
+    ):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Get the circuit state: closed, open or half-open."""
+        if self.opened_at is None:
+            return "closed"
+        if self._probing or time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half-open"
+
+    def before_call(self, endpoint: str) -> None:
+        """Raise CircuitOpenError unless a call may go ahead."""
+        if self.opened_at is None:
+            return
+        remaining = self.opened_at + self.cooldown - time.monotonic()
+        if remaining > 0 or self._probing:
+            raise CircuitOpenError(endpoint, max(remaining, 0.0))
+        self._probing = True
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a transient failure, opening the circuit at the threshold."""
+        self.failures += 1
+        if self._probing or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def record_other(self) -> None:
+        """Record a call that ended without telling whether upstream is healthy."""
+        self._probing = False
+
+
+class Resilience:
+    """Retry policy plus one circuit breaker per endpoint."""
+
+    def __init__(
+        self,
+        attempts: int = DEFAULT_RETRY_ATTEMPTS,
+        base_delay: float = DEFAULT_RETRY_BASE_DELAY,
+        max_delay: float = DEFAULT_RETRY_MAX_DELAY,
+        threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        cooldown: float = DEFAULT_BREAKER_COOLDOWN,
+    ):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.retries = 0
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """Get or create the circuit breaker for an endpoint."""
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = self.breakers[endpoint] = CircuitBreaker(self.threshold, self.cooldown)
+        return breaker
+
+    def backoff(self, attempt: int) -> float:
+        """Get a full-jitter delay before retry number ``attempt`` (from 1)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    async def call(self, endpoint: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``call``, retrying transient failures while the endpoint's circuit allows."""
+        breaker = self.breaker(endpoint)
+        attempt = 1
+        while True:
+            breaker.before_call(endpoint)
+            try:
+                result = await call()
+            except Exception as error:
+                if not is_transient(error):
+                    breaker.record_other()
+                    raise
+                breaker.record_failure()
+                if attempt >= self.attempts or breaker.opened_at is not None:
+                    raise
+            except BaseException:
+                breaker.record_other()
+                raise
+            else:
+                breaker.record_success()
+                return result
+
+            await asyncio.sleep(self.backoff(attempt))
+            attempt += 1
+            self.retries += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return the retry count and the endpoints whose circuits are not closed."""
+        return {
+            "retries": self.retries,
+            "circuits": {
+                endpoint: breaker.state
+                for endpoint, breaker in self.breakers.items()
+                if breaker.state != "closed"
+            },
+        }
+
+
+# Global resilience instance
+_resilience: Resilience | None = None
+
+
+def get_resilience() -> Resilience:
+    """Get or create the shared retry and circuit-breaker policy from the environment."""
+    global _resilience
+
+    if _resilience is None:
+        _resilience = Resilience(
+            attempts=int(os.getenv("FMP_RETRY_ATTEMPTS", DEFAULT_RETRY_ATTEMPTS)),
+            base_delay=float(os.getenv("FMP_RETRY_BASE_DELAY", DEFAULT_RETRY_BASE_DELAY)),
+            max_delay=float(os.getenv("FMP_RETRY_MAX_DELAY", DEFAULT_RETRY_MAX_DELAY)),
+            threshold=int(os.getenv("FMP_BREAKER_THRESHOLD", DEFAULT_BREAKER_THRESHOLD)),
+            cooldown=float(os.getenv("FMP_BREAKER_COOLDOWN", DEFAULT_BREAKER_COOLDOWN)),
+        )
+
+    return _resilience
@@ -0,0 +1,198 @@
+"""Local stock screening over a columnar snapshot of the company screener universe."""
+
+import importlib.util
+import os
+from typing import Any, Awaitable, Callable
+
+from .cache import TTL_MEDIUM
+from .executor import call_client, run_blocking
+from .snapshot import BackgroundSnapshot, row_dicts
+
+# Rows requested for the snapshot; upstream returns the largest companies first
+DEFAULT_SNAPSHOT_LIMIT = 10000
+
+# screen_stocks bound arguments: (row field, True for a lower bound)
+BOUNDS = {
+    "market_cap_more_than": ("marketCap", True),
+    "market_cap_lower_than": ("marketCap", False),
+    "price_more_than": ("price", True),
+    "price_lower_than": ("price", False),
+    "beta_more_than": ("beta", True),
+    "beta_lower_than": ("beta", False),
+    "volume_more_than": ("volume", True),
+    "volume_lower_than": ("volume", False),
+    "dividend_more_than": ("lastAnnualDividend", True),
+    "dividend_lower_than": ("lastAnnualDividend", False),
+}
+
+# Case-insensitive text arguments; a comma-separated value matches any of its items
+TEXT_FILTERS = {
+    "sector": "sector",
+    "industry": "industry",
+    "country": "country",
+    "exchange": "exchangeShortName",
+}
+
+FLAG_FILTERS = {
+    "is_etf": "isEtf",
+    "is_fund": "isFund",
+    "is_actively_trading": "isActivelyTrading",
+}
+
+
+class ScreenerSnapshot:
+    """Screener rows with each filterable field held as a NumPy column.
+
+    Numbers and flags are float arrays with NaN for missing values, so a missing
+    value never satisfies a filter. Rows keep the upstream order.
+    """
+
+    def __init__(self, rows: list[dict[str, Any]], complete: bool):
+        import numpy as np
+
+        self.rows = rows
+        self.complete = complete
+        self.numbers = {
+            field: np.array([_number(row.get(field)) for row in rows], dtype=np.float64)
+            for field, _ in BOUNDS.values()
+        }
+        self.flags = {
+            field: np.array([_number(row.get(field)) for row in rows], dtype=np.float64)
+            for field in FLAG_FILTERS.values()
+        }
+        self.text = {
+            argument: np.array([_text(row, field) for row in rows], dtype=str)
+            for argument, field in TEXT_FILTERS.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def screen(self, criteria: dict[str, Any]) -> list[dict[str, Any]] | None:
+        """Evaluate screen_stocks criteria, or return None if the snapshot cannot answer.
+
+        Without the full universe, an answer is only exact when the snapshot holds
+        at least ``limit`` matches: every company larger than the snapshot's
+        smallest is in it, and upstream also returns the largest matches first.
+        """
+        import numpy as np
+
+        mask = np.ones(len(self.rows), dtype=bool)
+        limit = None
+        for name, value in criteria.items():
+            if value is None:
+                continue
+            if name == "limit":
+                limit = int(value)
+            elif name in BOUNDS:
+                field, lower = BOUNDS[name]
+                column = self.numbers[field]
+                mask &= column > float(value) if lower else column < float(value)
+            elif name in TEXT_FILTERS:
+                wanted = [item.strip().lower() for item in str(value).split(",")]
+                mask &= np.isin(self.text[name], wanted)
+            elif name in FLAG_FILTERS:
+                mask &= self.flags[FLAG_FILTERS[name]] == float(bool(value))
+            else:
+                return None
+
+        positions = np.flatnonzero(mask)
+        if limit is not None and limit >= 0:
+            if not self.complete and len(positions) < limit:
+                return None
+            positions = positions[:limit]
+        elif not self.complete:
+            return None
+        return [self.rows[position] for position in positions]
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    return float("nan")
+
+
+def _text(row: dict[str, Any], field: str) -> str:
+    value = row.get(field)
+    if value is None and field == "exchangeShortName":
+        value = row.get("exchange")
+    return str(value).lower() if value is not None else ""
+
+
+class LocalScreener(BackgroundSnapshot):
+    """Answers screen_stocks from a ScreenerSnapshot rebuilt every ``refresh_interval`` seconds."""
+
+    def __init__(
+        self, refresh_interval: float = TTL_MEDIUM, snapshot_limit: int = DEFAULT_SNAPSHOT_LIMIT
+    ):
+        super().__init__(refresh_interval)
+        self.snapshot_limit = snapshot_limit
+        self.snapshot: ScreenerSnapshot | None = None
+
+    async def load(self, client: Any) -> bool:
+        """Fetch the unfiltered screener universe and swap in a new snapshot."""
+        rows = row_dicts(await call_client(client.screen_stocks, limit=self.snapshot_limit))
+        if not rows:
+            return False
+        complete = len(rows) < self.snapshot_limit
+        self.snapshot = await run_blocking(ScreenerSnapshot, rows, complete)
+        return True
+
+    async def screen(
+        self, client: Any, criteria: dict[str, Any], fallback: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Screen locally when the snapshot can answer, otherwise call ``fallback``."""
+        self.refresh_if_stale(client)
+        if self.snapshot is not None:
+            rows = self.snapshot.screen(criteria)
+            if rows is not None:
+                self._counters["local"] += 1
+                return rows
+
+        self._counters["upstream"] += 1
+        return await fallback()
+
+    def stats(self) -> dict[str, Any]:
+        """Return snapshot size and how screens were answered."""
+        return {
+            "entries": len(self.snapshot) if self.snapshot is not None else 0,
+            **self._counters,
+        }
+
+
+async def screen_stocks(
+    client: Any, criteria: dict[str, Any], fallback: Callable[[], Awaitable[Any]]
+) -> Any:
+    """Screen from the local snapshot when enabled, otherwise upstream."""
+    screener = get_local_screener()
+    if screener is None:
+        return await fallback()
+    return await screener.screen(client, criteria, fallback)
+
+
+# Global local screener instance
+_local_screener: LocalScreener | None = None
+
+
+def local_screener_enabled() -> bool:
+    """Check whether local screening is opted into and NumPy is installed."""
+    if os.getenv("FMP_SCREENER_ENABLED", "0").lower() not in ("1", "true", "yes"):
+        return False
+    return importlib.util.find_spec("numpy") is not None
+
+
+def get_local_screener() -> LocalScreener | None:
+    """Get or create the local screener, or None when disabled."""
+    global _local_screener
+
+    if not local_screener_enabled():
+        return None
+    if _local_screener is None:
+        _local_screener = LocalScreener(
+            float(os.getenv("FMP_SCREENER_REFRESH", TTL_MEDIUM)),
+            int(os.getenv("FMP_SCREENER_SNAPSHOT_LIMIT", DEFAULT_SNAPSHOT_LIMIT)),
+        )
+
+    return _local_screener
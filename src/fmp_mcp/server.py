@@ -1,38 +1,65 @@
-"""MCP Server for Financial Modeling Prep API."""
+"""MCP Server for Financial Modeling Prep API.
+
+The FMP client, its models, the TOON encoder and dotenv are imported on first
+use so that the server answers initialize and tools/list without loading them.
+"""
 
 import os
 import json
-from typing import Any
-from dotenv import load_dotenv
-import toon
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable
 
 from mcp.server import Server
-from mcp.types import Tool, TextContent
-from fmp import FMPClient, FMPAPIError, FMPAuthError
-
-from .tools import (
-    get_company_tools,
-    handle_company_tool,
-    get_market_tools,
-    handle_market_tool,
-    get_crypto_tools,
-    handle_crypto_tool,
-    get_financials_tools,
-    handle_financials_tool,
+from mcp.types import ListToolsResult, Tool, TextContent
+
+from .cache import (
+    cache_enabled,
+    cached_response,
+    make_cache_key,
+    stale_response,
+    store_response,
+)
+from .executor import run_blocking, shutdown_executor
+from .metrics import component_stats, get_metrics
+from .pagination import (
+    CURSOR_ARGUMENT,
+    PAGE_SIZE_ARGUMENT,
+    fetch_page,
+    resume_arguments,
+    shorten_page,
 )
+from .profiling import profile_call
+from .ratelimit import RateLimitTimeoutError, current_priority
+from .resilience import CircuitOpenError, is_transient
+from .singleflight import get_single_flight
+from .tools import FIELDS_ARGUMENT, TOOLS, ToolSpec, check_fields, get_catalog, project
+from .tracing import set_attribute, span
+
+DEFAULT_HTTP_HOST = "127.0.0.1"
+DEFAULT_HTTP_PORT = 8000
+
+DEFAULT_MAX_RESPONSE_BYTES = 1024 * 1024
+
+if TYPE_CHECKING:
+    from fmp import FMPClient
 
-# Load environment variables
-load_dotenv()
+    from .async_client import AsyncFMPClient
 
 # Initialize MCP server
 app = Server("fmp-mcp")
 
 # Global FMP client instance
-fmp_client: FMPClient | None = None
+fmp_client: "FMPClient | AsyncFMPClient | None" = None
 
 
-def get_fmp_client() -> FMPClient:
-    """Get or create FMP client instance."""
+def get_fmp_client() -> "FMPClient | AsyncFMPClient":
+    """Get or create FMP client instance.
+
+    The default FMP_TRANSPORT=async uses the pooled async HTTP client, which
+    passes raw JSON straight to the encoder. "sync" opts into the blocking
+    FMPClient, which validates every response into pydantic models.
+    """
     global fmp_client
 
     if fmp_client is None:
@@ -42,13 +69,42 @@ def get_fmp_client() -> FMPClient:
                 "FMP_API_KEY environment variable is required. "
                 "Get your API key from: https://site.financialmodelingprep.com/developer/docs"
             )
-        fmp_client = FMPClient(api_key=api_key)
+        transport = os.getenv("FMP_TRANSPORT", "async").lower()
+        if transport == "async":
+            from .async_client import AsyncFMPClient
+
+            fmp_client = AsyncFMPClient(api_key=api_key)
+        elif transport == "sync":
+            from fmp import FMPClient
+
+            fmp_client = FMPClient(api_key=api_key)
+        else:
+            raise ValueError(f"Unknown FMP_TRANSPORT: {transport!r} (expected 'sync' or 'async')")
 
     return fmp_client
 
 
+async def close_fmp_client() -> None:
+    """Close the FMP client's pooled connections, if any."""
+    global fmp_client
+
+    if hasattr(fmp_client, "aclose"):
+        await fmp_client.aclose()
+    fmp_client = None
+
+
 def format_response(data: Any) -> str:
     """Format API response data as TOON string for reduced token usage."""
+    import toon
+
+    from .encoding import encode_table
+
+    if isinstance(data, list) and data:
+        # Flat uniform rows are encoded column by column without dumping models
+        table = encode_table(data)
+        if table is not None:
+            return table
+
     if hasattr(data, 'model_dump'):
         # Single Pydantic model
         return toon.encode(data.model_dump())
@@ -60,9 +116,115 @@ def format_response(data: Any) -> str:
         return toon.encode(data)
 
 
+def get_max_response_bytes() -> int | None:
+    """Get the response size limit from FMP_MAX_RESPONSE_BYTES (0 disables it)."""
+    limit = int(os.getenv("FMP_MAX_RESPONSE_BYTES", DEFAULT_MAX_RESPONSE_BYTES))
+    return limit if limit > 0 else None
+
+
+def format_limited(
+    data: Any, max_bytes: int | None, pager: Callable[[Any, int], Any] | None = None
+) -> tuple[str, str | None]:
+    """Format a response in at most ``max_bytes``, returning the text and a truncation note.
+
+    Flat tables, and the rows of pages that ``pager`` can shorten, are encoded
+    only up to the limit. Other lists and pages are cut to the longest prefix of
+    rows that fits; anything else is cut at the last line break under the limit.
+    """
+    from .encoding import encode_table_prefix
+
+    if pager is not None and isinstance(data, dict) and isinstance(data.get("results"), list):
+        page = _format_page(data, max_bytes, pager)
+        if page is not None:
+            return page
+
+    if max_bytes is None:
+        return format_response(data), None
+
+    if isinstance(data, list) and data:
+        table = encode_table_prefix(data, max_bytes)
+        if table is not None:
+            text, count = table
+            return text, _truncation_note(count, len(data), max_bytes, paged=False)
+
+    text = format_response(data)
+    size = len(text.encode("utf-8"))
+    if size <= max_bytes:
+        return text, None
+
+    if isinstance(data, list):
+        trim, total, paged = (lambda count: data[:count]), len(data), False
+    elif pager is not None and isinstance(data, dict) and isinstance(data.get("results"), list):
+        trim, total, paged = partial(pager, data), len(data["results"]), True
+    else:
+        cut = text.encode("utf-8")[:max_bytes].decode("utf-8", errors="ignore")
+        cut = cut[:cut.rfind("\n") + 1].rstrip("\n") or cut
+        return cut, (
+            f"truncated: response cut to {len(cut.encode('utf-8'))} of {size} bytes "
+            f"at the {max_bytes} byte response limit"
+        )
+
+    # Shrink in proportion to the overshoot; rows vary in size, so re-check each time
+    count = total
+    while count and size > max_bytes:
+        count = min(count - 1, int(count * max_bytes / size))
+        text = format_response(trim(count))
+        size = len(text.encode("utf-8"))
+    return text, _truncation_note(count, total, max_bytes, paged)
+
+
+def _format_page(
+    page: dict[str, Any], max_bytes: int | None, pager: Callable[[Any, int], Any]
+) -> tuple[str, str | None] | None:
+    """Format a page with its rows as a TOON table, shortened to fit ``max_bytes``.
+
+    Returns None when the rows do not fit the flat tabular form.
+    """
+    import toon
+
+    from .encoding import encode_table_prefix
+
+    rows = page["results"]
+    count = len(rows)
+    while count:
+        # The fields after the rows depend on where the page ends, via next_cursor
+        tail = page if count == len(rows) else pager(page, count)
+        rest = toon.encode({key: value for key, value in tail.items() if key != "results"})
+        room = None
+        if max_bytes is not None:
+            room = max_bytes - len("results\n") - len(rest.encode("utf-8"))
+        table = encode_table_prefix(rows[:count], room)
+        if table is None:
+            return None
+        text, fitted = table
+        if fitted == count:
+            return f"results{text}\n{rest}", _truncation_note(count, len(rows), max_bytes, True)
+        count = fitted
+    return None
+
+
+def _truncation_note(count: int, total: int, max_bytes: int, paged: bool) -> str | None:
+    """Describe rows dropped to fit the response limit, or None if none were."""
+    if count >= total:
+        return None
+    if paged:
+        return (
+            f"truncated: page shortened to {count} of {total} rows at the {max_bytes} byte "
+            "response limit; continue from next_cursor"
+        )
+    return (
+        f"truncated: showing the first {count} of {total} rows at the {max_bytes} byte "
+        "response limit; narrow the date range or request fewer fields to see the rest"
+    )
+
+
 def handle_fmp_error(error: Exception) -> str:
     """Convert FMP exceptions to error messages."""
-    if isinstance(error, FMPAuthError):
+    from fmp import FMPAPIError, FMPAuthError
+
+    if isinstance(error, CircuitOpenError):
+        return f"Upstream Unavailable: {str(error)}"
+    elif isinstance(error, FMPAuthError):
         return f"Authentication Error: {str(error)}. Please check your API key."
     elif isinstance(error, FMPAPIError):
         return f"API Error: {str(error)}"
@@ -70,66 +232,270 @@ def handle_fmp_error(error: Exception) -> str:
         return f"Error: {str(error)}"
 
 
-@app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available FMP API tools."""
-    tools = []
-    tools.extend(get_company_tools())
-    tools.extend(get_market_tools())
-    tools.extend(get_crypto_tools())
-    tools.extend(get_financials_tools())
-    return tools
+    return list(get_catalog().tools)
+
+
+@app.list_tools()
+async def handle_list_tools() -> ListToolsResult:
+    """Serve tools/list from the prebuilt catalog."""
+    return get_catalog()
+
+
+async def execute_tool(spec: ToolSpec, arguments: Any) -> tuple[str, str | None]:
+    """Run a tool upstream and return its formatted response and any truncation note."""
+    arguments = arguments or {}
+    cache_arguments = arguments
+    offset = 0
+    if spec.page_size and arguments.get(CURSOR_ARGUMENT):
+        arguments, offset = resume_arguments(
+            spec.name, arguments, (PAGE_SIZE_ARGUMENT, FIELDS_ARGUMENT)
+        )
+
+    fields = spec.fields_for(arguments)
+    current_priority.set(spec.priority_for(arguments))
+    client = get_fmp_client() if spec.uses_client else None
+    metrics = get_metrics()
+    tool_arguments = {
+        key: value for key, value in arguments.items()
+        if key not in (FIELDS_ARGUMENT, CURSOR_ARGUMENT, PAGE_SIZE_ARGUMENT)
+    }
+
+    start = time.perf_counter()
+    with span("fetch"):
+        if spec.page_size:
+            result = await fetch_page(
+                spec.name,
+                make_cache_key(spec.name, tool_arguments),
+                lambda: spec.handler(client, tool_arguments),
+                arguments,
+                offset,
+                int(arguments.get(PAGE_SIZE_ARGUMENT) or spec.page_size),
+                spec.ttl,
+            )
+        else:
+            result = await spec.handler(client, tool_arguments)
+    fetched = time.perf_counter()
+    metrics.observe("fmp_tool_fetch_seconds", fetched - start, tool=spec.name)
+
+    with span("encode") as encode:
+        if fields:
+            check_fields(result, fields, spec.presets)
+            result = project(result, fields)
+        pager = partial(shorten_page, spec.name, arguments) if spec.page_size else None
+        text, note = await run_blocking(
+            format_limited, result, get_max_response_bytes(), pager
+        )
+        if encode is not None:
+            encode.set_attribute("fmp.response_bytes", len(text.encode()))
+            encode.set_attribute("fmp.truncated", note is not None)
+    metrics.observe("fmp_tool_encode_seconds", time.perf_counter() - fetched, tool=spec.name)
+
+    rows = result.get("results") if spec.page_size and isinstance(result, dict) else result
+    if isinstance(rows, list):
+        metrics.inc("fmp_tool_rows_total", len(rows), tool=spec.name)
+    metrics.observe("fmp_tool_response_bytes", len(text.encode("utf-8")), tool=spec.name)
+
+    # Truncated responses are not cached, so a hit never loses its note
+    if spec.cached and cache_enabled() and note is None:
+        await store_response(spec.name, cache_arguments, text, spec.ttl)
+    return text, note
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Handle tool execution requests."""
-    try:
-        client = get_fmp_client()
-        result = None
-
-        # Try company tools
-        result = handle_company_tool(client, name, arguments)
-        if result is not None:
-            return [TextContent(type="text", text=format_response(result))]
+    with span("call_tool", **{"mcp.tool": name}), profile_call(name):
+        return await dispatch_tool(name, arguments)
 
-        # Try market tools
-        result = handle_market_tool(client, name, arguments)
-        if result is not None:
-            return [TextContent(type="text", text=format_response(result))]
 
-        # Try crypto tools
-        result = handle_crypto_tool(client, name, arguments)
-        if result is not None:
-            return [TextContent(type="text", text=format_response(result))]
+async def dispatch_tool(name: str, arguments: Any) -> list[TextContent]:
+    """Answer a tool call from the cache, a shared in-flight execution or upstream."""
+    start = time.perf_counter()
+    outcome = "error"
+    spec = TOOLS.get(name)
+    try:
+        # Unknown tool
+        if spec is None:
+            return [TextContent(
+                type="text",
+                text=f"Unknown tool: {name}"
+            )]
 
-        # Try financials tools
-        result = handle_financials_tool(client, name, arguments)
-        if result is not None:
-            return [TextContent(type="text", text=format_response(result))]
+        if spec.cached and cache_enabled():
+            cached = await cached_response(name, arguments)
+            if cached is not None:
+                outcome = "cached"
+                return [TextContent(type="text", text=cached)]
 
-        # Unknown tool
-        return [TextContent(
-            type="text",
-            text=f"Unknown tool: {name}"
-        )]
+        # Concurrent identical calls share one upstream execution
+        with span("dispatch"):
+            text, note = await get_single_flight().do(
+                make_cache_key(name, arguments),
+                lambda: execute_tool(spec, arguments),
+            )
+        outcome = "ok"
+        contents = [TextContent(type="text", text=text)]
+        if note is not None:
+            contents.append(TextContent(type="text", text=note))
+        return contents
 
     except Exception as e:
         error_msg = handle_fmp_error(e)
+        if spec is not None and spec.cached and cache_enabled() and (
+            is_transient(e) or isinstance(e, (CircuitOpenError, RateLimitTimeoutError))
+        ):
+            stale = await stale_response(name, arguments)
+            if stale is not None:
+                text, age = stale
+                outcome = "stale"
+                return [
+                    TextContent(type="text", text=text),
+                    TextContent(
+                        type="text",
+                        text=f"stale: served from cache {age:.0f}s past its TTL "
+                        f"because the upstream call failed ({error_msg})",
+                    ),
+                ]
         return [TextContent(type="text", text=error_msg)]
 
+    finally:
+        # Unknown names are not recorded, keeping label values bounded
+        set_attribute("fmp.outcome", outcome)
+        if spec is not None:
+            metrics = get_metrics()
+            metrics.inc("fmp_tool_calls_total", tool=name, result=outcome)
+            metrics.observe("fmp_tool_duration_seconds", time.perf_counter() - start, tool=name)
 
-async def main():
-    """Run the MCP server."""
-    from mcp.server.stdio import stdio_server
 
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
+def create_http_app(stateless: bool = False) -> Any:
+    """Build an ASGI app serving MCP over streamable HTTP (/mcp) and SSE (/sse).
+
+    Prometheus metrics for this process are served at /metrics.
+
+    All sessions share this process's client, caches and rate limiter. In
+    stateless mode every request stands alone, so any worker process can serve
+    it; SSE needs a session pinned to one process and is not offered.
+    """
+    import contextlib
+
+    from mcp.server.sse import SseServerTransport
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+    from starlette.responses import PlainTextResponse, Response
+    from starlette.routing import Mount, Route
+
+    session_manager = StreamableHTTPSessionManager(app=app, stateless=stateless)
+    sse = SseServerTransport("/messages/")
+
+    class StreamableHTTPEndpoint:
+        # A plain ASGI callable, so Starlette routes /mcp without a redirect to /mcp/
+        async def __call__(self, scope, receive, send):
+            await session_manager.handle_request(scope, receive, send)
+
+    async def handle_metrics(request):
+        return PlainTextResponse(
+            get_metrics().render(await component_stats()),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
         )
 
+    async def handle_sse(request):
+        async with sse.connect_sse(request.scope, request.receive, request._send) as streams:
+            await app.run(streams[0], streams[1], app.create_initialization_options())
+        return Response()
+
+    @contextlib.asynccontextmanager
+    async def lifespan(_):
+        try:
+            async with session_manager.run():
+                yield
+        finally:
+            await close_fmp_client()
+            shutdown_executor()
+
+    routes = [
+        Route("/mcp", endpoint=StreamableHTTPEndpoint(), methods=["GET", "POST", "DELETE"]),
+        Route("/metrics", endpoint=handle_metrics),
+    ]
+    if not stateless:
+        routes += [
+            Route("/sse", endpoint=handle_sse),
+            Mount("/messages/", app=sse.handle_post_message),
+        ]
+    return Starlette(routes=routes, lifespan=lifespan)
+
+
+def create_worker_app() -> Any:
+    """Build the stateless HTTP app run by each process in multi-worker mode."""
+    return create_http_app(stateless=True)
+
+
+async def run_stdio() -> None:
+    """Serve a single MCP session over stdin/stdout."""
+    from mcp.server.stdio import stdio_server
+
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        await close_fmp_client()
+        shutdown_executor()
+
+
+async def run_http(host: str = DEFAULT_HTTP_HOST, port: int = DEFAULT_HTTP_PORT) -> None:
+    """Serve many concurrent MCP sessions over HTTP from this process."""
+    import uvicorn
+
+    config = uvicorn.Config(create_http_app(), host=host, port=port, log_level="info")
+    await uvicorn.Server(config).serve()
+
+
+def run_http_workers(
+    host: str = DEFAULT_HTTP_HOST, port: int = DEFAULT_HTTP_PORT, workers: int = 2
+) -> None:
+    """Serve HTTP from several worker processes on one port.
+
+    Workers share the response cache and the upstream rate-limit budget through
+    SQLite files unless FMP_CACHE_BACKEND or FMP_RATE_LIMIT_SHARED say otherwise.
+    """
+    import uvicorn
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    os.environ.setdefault("FMP_CACHE_BACKEND", "sqlite")
+    os.environ.setdefault("FMP_RATE_LIMIT_SHARED", "1")
+
+    uvicorn.run(
+        "fmp_mcp.server:create_worker_app",
+        factory=True,
+        host=host,
+        port=port,
+        workers=workers,
+        log_level="info",
+    )
+
+
+async def main(
+    transport: str = "stdio", host: str = DEFAULT_HTTP_HOST, port: int = DEFAULT_HTTP_PORT
+):
+    """Run the MCP server over stdio or HTTP."""
+    from dotenv import load_dotenv
+
+    # Load environment variables
+    load_dotenv()
+
+    if transport == "stdio":
+        await run_stdio()
+    elif transport == "http":
+        await run_http(host, port)
+    else:
+        raise ValueError(f"Unknown transport: {transport!r} (expected 'stdio' or 'http')")
+
 
 if __name__ == "__main__":
     import asyncio
@@ -0,0 +1,73 @@
+"""Coalesce concurrent identical calls into a single in-flight execution."""
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """Share one in-flight execution between concurrent callers with the same key.
+
+    The first caller for a key starts the work as a task; callers arriving while
+    it runs await the same task. Cancelling one caller does not cancel the shared
+    work for the others, but once every caller has been cancelled the work is
+    cancelled too, freeing its worker thread and rate-limit slot.
+    """
+
+    def __init__(self):
+        self.executions = 0
+        self.shared = 0
+        self._calls: dict[str, asyncio.Task] = {}
+        self._waiters: dict[asyncio.Task, int] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``func`` once for all concurrent callers using ``key``."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.executions += 1
+        else:
+            self.shared += 1
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            remaining = self._waiters.pop(task) - 1
+            if remaining:
+                self._waiters[task] = remaining
+            elif not task.done():
+                # The last caller was cancelled; nobody is left to use the result
+                if self._calls.get(key) is task:
+                    del self._calls[key]
+                task.cancel()
+
+    def stats(self) -> dict[str, Any]:
+        """Return execution counters."""
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "shared": self.shared,
+        }
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every caller went away
+            task.exception()
+
+
+# Global single-flight instance
+_single_flight: SingleFlight | None = None
+
+
+def get_single_flight() -> SingleFlight:
+    """Get or create the shared single-flight group."""
+    global _single_flight
+
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+
+    return _single_flight
@@ -0,0 +1,61 @@
+"""In-memory snapshots of upstream list endpoints, rebuilt in the background."""
+
+import asyncio
+import contextvars
+import time
+from typing import Any
+
+from .ratelimit import BULK, current_priority
+
+# Wait this long before retrying a snapshot that failed
+RETRY_INTERVAL = 300
+
+
+def row_dicts(result: Any) -> list[dict[str, Any]]:
+    """Convert a list result to row dicts, or an empty list for other shapes."""
+    if not isinstance(result, list):
+        return []
+    rows = [item.model_dump() if hasattr(item, "model_dump") else item for item in result]
+    return [row for row in rows if isinstance(row, dict)]
+
+
+class BackgroundSnapshot:
+    """Base for local data reloaded from upstream every ``refresh_interval`` seconds.
+
+    Subclasses implement ``load``. Reloads run as background tasks on the bulk
+    priority lane, so the call that finds the data stale is never held up; until
+    the first load lands, callers go upstream.
+    """
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._next_refresh = 0.0
+        self._task: asyncio.Task | None = None
+        self._counters = {"local": 0, "upstream": 0, "refreshes": 0, "refresh_errors": 0}
+
+    async def load(self, client: Any) -> bool:
+        """Fetch and swap in fresh data, returning False if nothing usable came back."""
+        raise NotImplementedError
+
+    def refresh_if_stale(self, client: Any) -> None:
+        """Start a background reload if the data is missing or older than the interval."""
+        if time.monotonic() < self._next_refresh:
+            return
+        if self._task is None or self._task.done():
+            self._next_refresh = time.monotonic() + RETRY_INTERVAL
+            # Start from an empty context so the reload is not traced as part of this call
+            self._task = contextvars.Context().run(asyncio.create_task, self.refresh(client))
+
+    async def refresh(self, client: Any) -> None:
+        """Reload the data now."""
+        current_priority.set(BULK)
+        try:
+            loaded = await self.load(client)
+        except Exception:
+            loaded = False
+        if not loaded:
+            self._counters["refresh_errors"] += 1
+            return
+
+        self._next_refresh = time.monotonic() + self.refresh_interval
+        self._counters["refreshes"] += 1
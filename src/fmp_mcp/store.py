@@ -0,0 +1,212 @@
+"""Persistent SQLite store for immutable historical and financial-statement rows."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rows (
+    dataset TEXT NOT NULL,
+    key TEXT NOT NULL,
+    date TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (dataset, key, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS spans (
+    dataset TEXT NOT NULL,
+    key TEXT NOT NULL,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL,
+    PRIMARY KEY (dataset, key, start)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS checks (
+    dataset TEXT NOT NULL,
+    key TEXT NOT NULL,
+    checked_at REAL NOT NULL,
+    PRIMARY KEY (dataset, key)
+) WITHOUT ROWID;
+"""
+
+
+def default_cache_dir() -> Path:
+    """Get the fmp-mcp directory under the user cache directory."""
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(cache_home) / "fmp-mcp"
+
+
+def env_path(name: str, default: Path | None = None) -> Path | None:
+    """Get the path in environment variable ``name`` with ``~`` expanded, or ``default``."""
+    value = os.getenv(name)
+    return Path(value).expanduser() if value else default
+
+
+def connect_thread(local: threading.local, path: Path, timeout: float) -> sqlite3.Connection:
+    """Get the calling thread's WAL-mode connection to ``path``, opening it on first use."""
+    conn = getattr(local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        local.conn = conn
+    return conn
+
+
+def default_store_path() -> Path:
+    """Get the default store location under the user cache directory."""
+    return default_cache_dir() / "store.sqlite3"
+
+
+def merge_spans(spans: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    """Merge overlapping or adjacent inclusive date spans."""
+    merged: list[tuple[str, str]] = []
+    for start, end in sorted(spans):
+        if merged and start <= _next_day(merged[-1][1]):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _next_day(value: str) -> str:
+    return (date.fromisoformat(value) + timedelta(days=1)).isoformat()
+
+
+class HistoryStore:
+    """SQLite-backed store of dated rows and the date spans they cover.
+
+    Rows are grouped by dataset (e.g. ``eod-full``) and key (e.g. ``AAPL``).
+    The database runs in WAL mode so several server processes on one host can
+    share it.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection."""
+        return connect_thread(self._local, self.path, timeout=30)
+
+    def get_spans(self, dataset: str, key: str) -> list[tuple[str, str]]:
+        """Get the covered date spans for a key, sorted by start date."""
+        cursor = self._connect().execute(
+            "SELECT start, end FROM spans WHERE dataset = ? AND key = ? ORDER BY start",
+            (dataset, key),
+        )
+        return cursor.fetchall()
+
+    def get_rows(
+        self,
+        dataset: str,
+        key: str,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get stored rows for a key, newest first, optionally within [start, end]."""
+        query = "SELECT payload FROM rows WHERE dataset = ? AND key = ?"
+        params: list[Any] = [dataset, key]
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(start)
+        if end is not None:
+            # Timestamps like "2024-01-02 15:30:00" sort after their date prefix
+            query += " AND date <= ?"
+            params.append(end + "\uffff")
+        query += " ORDER BY date DESC"
+
+        cursor = self._connect().execute(query, params)
+        return [json.loads(payload) for (payload,) in cursor]
+
+    def put_rows(
+        self,
+        dataset: str,
+        key: str,
+        rows: list[dict[str, Any]],
+        spans: list[tuple[str, str]] | None = None,
+    ) -> None:
+        """Upsert rows (keyed by their ``date``) and mark date spans as covered."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO rows (dataset, key, date, payload) VALUES (?, ?, ?, ?)",
+                [(dataset, key, row["date"], json.dumps(row)) for row in rows],
+            )
+            if spans:
+                held = conn.execute(
+                    "SELECT start, end FROM spans WHERE dataset = ? AND key = ?",
+                    (dataset, key),
+                ).fetchall()
+                conn.execute("DELETE FROM spans WHERE dataset = ? AND key = ?", (dataset, key))
+                conn.executemany(
+                    "INSERT INTO spans (dataset, key, start, end) VALUES (?, ?, ?, ?)",
+                    [(dataset, key, s, e) for s, e in merge_spans(held + list(spans))],
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get_latest_date(self, dataset: str, key: str, start: str, end: str) -> str | None:
+        """Get the date of the newest stored row for a key within [start, end]."""
+        row = self._connect().execute(
+            "SELECT MAX(date) FROM rows WHERE dataset = ? AND key = ? AND date >= ? AND date <= ?",
+            (dataset, key, start, end + "\uffff"),
+        ).fetchone()
+        return row[0]
+
+    def drop(self, dataset: str, key: str) -> None:
+        """Forget every row, span and check recorded for a key."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for table in ("rows", "spans", "checks"):
+                conn.execute(f"DELETE FROM {table} WHERE dataset = ? AND key = ?", (dataset, key))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get_checked_at(self, dataset: str, key: str) -> float | None:
+        """Get when a key was last checked against upstream (epoch seconds)."""
+        row = self._connect().execute(
+            "SELECT checked_at FROM checks WHERE dataset = ? AND key = ?",
+            (dataset, key),
+        ).fetchone()
+        return row[0] if row else None
+
+    def mark_checked(self, dataset: str, key: str) -> None:
+        """Record that a key was just checked against upstream."""
+        self._connect().execute(
+            "INSERT OR REPLACE INTO checks (dataset, key, checked_at) VALUES (?, ?, ?)",
+            (dataset, key, time.time()),
+        )
+
+
+# Global history store instance
+_history_store: HistoryStore | None = None
+
+
+def store_enabled() -> bool:
+    """Check whether the persistent store is enabled via FMP_STORE_ENABLED."""
+    return os.getenv("FMP_STORE_ENABLED", "1").lower() not in ("0", "false", "no")
+
+
+def get_history_store() -> HistoryStore | None:
+    """Get or create the shared history store, or None when disabled."""
+    global _history_store
+
+    if not store_enabled():
+        return None
+
+    if _history_store is None:
+        _history_store = HistoryStore(env_path("FMP_STORE_PATH", default_store_path()))
+
+    return _history_store
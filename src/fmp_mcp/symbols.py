@@ -0,0 +1,268 @@
+"""Local symbol search over periodic snapshots of the stock and crypto lists."""
+
+import asyncio
+import os
+import re
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from .cache import TTL_DAY
+from .executor import call_client, run_blocking
+from .snapshot import BackgroundSnapshot, row_dicts
+
+DEFAULT_SEARCH_LIMIT = 50
+
+# Identifier values remembered per field, least recently used dropped first
+DEFAULT_MAX_LEARNED = 4096
+
+IDENTIFIERS = ("cik", "cusip", "isin")
+
+# Columns of every search result row, local or upstream, as FMP's search-symbol
+# returns them; identifier lookups add the identifier column
+SEARCH_COLUMNS = ("symbol", "name", "currency", "exchangeFullName", "exchange")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split a name into lowercase alphanumeric words."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def normalize_identifier(field: str, value: Any) -> str:
+    """Normalize a CIK (no leading zeros), CUSIP or ISIN for lookups."""
+    value = str(value).strip().upper()
+    return (value.lstrip("0") or "0") if field == "cik" else value
+
+
+def search_row(row: dict[str, Any], kind: str = "symbol") -> dict[str, Any]:
+    """Reduce a list or search row to SEARCH_COLUMNS, plus the identifier for lookups."""
+    result = {
+        "symbol": row.get("symbol"),
+        "name": row.get("name") or row.get("companyName") or "",
+        "currency": row.get("currency"),
+        "exchangeFullName": row.get("exchangeFullName"),
+        "exchange": row.get("exchangeShortName") or row.get("exchange"),
+    }
+    if kind in IDENTIFIERS:
+        result[kind] = row.get(kind)
+    return result
+
+
+class SymbolIndex:
+    """Immutable search index over symbol list rows.
+
+    Symbols and name words are kept in sorted arrays so a prefix is found with a
+    binary search and matches are a contiguous slice. Words map to the rows that
+    contain them, and identifier columns present in the rows map to their rows.
+    """
+
+    def __init__(self, rows: list[dict[str, Any]]):
+        self.entries: list[dict[str, Any]] = []
+        self._names: list[str] = []
+        self._identifiers: dict[str, dict[str, list[dict[str, Any]]]] = {
+            field: {} for field in IDENTIFIERS
+        }
+        postings: dict[str, list[int]] = {}
+        symbols = []
+
+        for row in rows:
+            symbol = row.get("symbol")
+            if not isinstance(symbol, str) or not symbol:
+                continue
+            entry = search_row(row)
+            name = entry["name"]
+            position = len(self.entries)
+            self.entries.append(entry)
+            self._names.append(name.lower())
+            symbols.append((symbol.upper(), position))
+            for word in set(tokenize(name)):
+                postings.setdefault(word, []).append(position)
+            for field in IDENTIFIERS:
+                if row.get(field):
+                    key = normalize_identifier(field, row[field])
+                    self._identifiers[field].setdefault(key, []).append(search_row(row, field))
+
+        symbols.sort()
+        self._symbols = [symbol for symbol, _ in symbols]
+        self._symbol_positions = [position for _, position in symbols]
+        self._words = sorted(postings)
+        self._postings = [postings[word] for word in self._words]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def search_symbol(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> list[dict[str, Any]]:
+        """Find symbols starting with the query, exact match first, then name matches."""
+        prefix = query.strip().upper()
+        if not prefix:
+            return []
+
+        found = []
+        start = bisect_left(self._symbols, prefix)
+        for index in range(start, len(self._symbols)):
+            if not self._symbols[index].startswith(prefix):
+                break
+            found.append(self._symbol_positions[index])
+        # Shorter symbols are closer to the query; the exact match is the shortest
+        found.sort(key=lambda position: len(self.entries[position]["symbol"]))
+
+        seen = set(found)
+        for position in self._match_name(query):
+            if position not in seen:
+                found.append(position)
+        return [self.entries[position] for position in found[:limit]]
+
+    def search_name(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> list[dict[str, Any]]:
+        """Find names containing a word starting with each word of the query."""
+        return [self.entries[position] for position in self._match_name(query)[:limit]]
+
+    def lookup(self, field: str, value: str) -> list[dict[str, Any]]:
+        """Get the rows carrying an identifier value."""
+        return self._identifiers[field].get(normalize_identifier(field, value), [])
+
+    def _match_name(self, query: str) -> list[int]:
+        words = tokenize(query)
+        if not words:
+            return []
+
+        matches: set[int] | None = None
+        for word in words:
+            positions: set[int] = set()
+            start = bisect_left(self._words, word)
+            for index in range(start, len(self._words)):
+                if not self._words[index].startswith(word):
+                    break
+                positions.update(self._postings[index])
+            matches = positions if matches is None else matches & positions
+            if not matches:
+                return []
+
+        # Names starting with the query rank first, then shorter names
+        text = query.strip().lower()
+        return sorted(
+            matches,
+            key=lambda position: (not self._names[position].startswith(text),
+                                  len(self._names[position]), position),
+        )
+
+
+class SymbolSearch(BackgroundSnapshot):
+    """Answers symbol searches from a SymbolIndex rebuilt every ``refresh_interval`` seconds.
+
+    Identifier rows returned upstream on a miss are remembered, up to
+    ``max_learned`` values per identifier, so repeated CIK, CUSIP and ISIN
+    lookups are also answered locally. Rows are reduced to ``search_row`` on
+    both paths, so a result has the same columns whether or not it came from
+    upstream.
+    """
+
+    def __init__(self, refresh_interval: float = TTL_DAY, max_learned: int = DEFAULT_MAX_LEARNED):
+        super().__init__(refresh_interval)
+        self.index: SymbolIndex | None = None
+        self.max_learned = max_learned
+        self._learned: dict[str, OrderedDict[str, list[Any]]] = {
+            field: OrderedDict() for field in IDENTIFIERS
+        }
+
+    def find(self, kind: str, query: str) -> list[Any]:
+        """Search the index; kind is symbol, name, or an identifier field."""
+        if kind in IDENTIFIERS:
+            learned = self._learned[kind]
+            key = normalize_identifier(kind, query)
+            if key in learned:
+                learned.move_to_end(key)
+                return learned[key]
+        if self.index is None:
+            return []
+        if kind == "symbol":
+            return self.index.search_symbol(query)
+        if kind == "name":
+            return self.index.search_name(query)
+        return self.index.lookup(kind, query)
+
+    def learn(self, kind: str, rows: list[dict[str, Any]]) -> None:
+        """Remember identifier rows returned by an upstream lookup."""
+        if kind not in IDENTIFIERS:
+            return
+        learned = self._learned[kind]
+        for row in rows:
+            if row.get(kind):
+                key = normalize_identifier(kind, row[kind])
+                rows = learned.setdefault(key, [])
+                learned.move_to_end(key)
+                if row not in rows:
+                    rows.append(row)
+        while len(learned) > self.max_learned:
+            learned.popitem(last=False)
+
+    async def load(self, client: Any) -> bool:
+        """Snapshot the stock and crypto lists and swap in a new index."""
+        results = await asyncio.gather(
+            call_client(client.get_stock_list),
+            call_client(client.get_crypto_list),
+            return_exceptions=True,
+        )
+        rows = [row for result in results for row in row_dicts(result)]
+        if not rows:
+            return False
+        self.index = await run_blocking(SymbolIndex, rows)
+        return True
+
+    async def search(
+        self, client: Any, kind: str, query: str, fallback: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Answer a search locally, calling ``fallback`` upstream on a miss."""
+        self.refresh_if_stale(client)
+        rows = self.find(kind, query)
+        if rows:
+            self._counters["local"] += 1
+            return rows
+
+        self._counters["upstream"] += 1
+        result = await fallback()
+        if not isinstance(result, list):
+            return result
+        rows = [search_row(row, kind) for row in row_dicts(result)]
+        self.learn(kind, rows)
+        return rows
+
+    def stats(self) -> dict[str, Any]:
+        """Return index size and how searches were answered."""
+        return {
+            "entries": len(self.index) if self.index is not None else 0,
+            **self._counters,
+        }
+
+
+async def search_symbols(
+    client: Any, kind: str, query: str, fallback: Callable[[], Awaitable[Any]]
+) -> Any:
+    """Answer a search from the local index when enabled, otherwise upstream."""
+    search = get_symbol_search()
+    if search is None:
+        return await fallback()
+    return await search.search(client, kind, query, fallback)
+
+
+# Global symbol search instance
+_symbol_search: SymbolSearch | None = None
+
+
+def symbol_index_enabled() -> bool:
+    """Check whether local symbol search is enabled via FMP_SYMBOL_INDEX_ENABLED."""
+    return os.getenv("FMP_SYMBOL_INDEX_ENABLED", "1").lower() not in ("0", "false", "no")
+
+
+def get_symbol_search() -> SymbolSearch | None:
+    """Get or create the symbol search, or None when disabled."""
+    global _symbol_search
+
+    if not symbol_index_enabled():
+        return None
+    if _symbol_search is None:
+        refresh = float(os.getenv("FMP_SYMBOL_INDEX_REFRESH", TTL_DAY))
+        _symbol_search = SymbolSearch(refresh)
+
+    return _symbol_search
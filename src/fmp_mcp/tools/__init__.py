@@ -1,17 +1,28 @@
 """Tools module for FMP MCP server."""
 
-from .company import get_company_tools, handle_company_tool
-from .market import get_market_tools, handle_market_tool
-from .crypto import get_crypto_tools, handle_crypto_tool
-from .financials import get_financials_tools, handle_financials_tool
+from .registry import (
+    FIELDS_ARGUMENT,
+    REQUIRED,
+    TOOLS,
+    ToolSpec,
+    check_fields,
+    client_call,
+    get_catalog,
+    project,
+    register,
+)
+
+# Importing the tool modules registers their tools
+from . import company, market, crypto, financials, stats  # noqa: F401
 
 __all__ = [
-    "get_company_tools",
-    "handle_company_tool",
-    "get_market_tools",
-    "handle_market_tool",
-    "get_crypto_tools",
-    "handle_crypto_tool",
-    "get_financials_tools",
-    "handle_financials_tool",
+    "FIELDS_ARGUMENT",
+    "REQUIRED",
+    "TOOLS",
+    "ToolSpec",
+    "check_fields",
+    "client_call",
+    "get_catalog",
+    "project",
+    "register",
 ]
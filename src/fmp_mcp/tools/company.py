@@ -1,294 +1,342 @@
 """Company-related MCP tools."""
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from mcp.types import Tool, TextContent
-from fmp import FMPClient
 
+from ..cache import TTL_DAY, TTL_LONG, TTL_SHORT
+from ..executor import call_client
+from ..pagination import DEFAULT_PAGE_SIZE
+from ..ratelimit import BULK, INTERACTIVE
+from ..screener import screen_stocks as screen_local
+from ..symbols import search_symbols
+from .registry import REQUIRED, Handler, client_call, register
 
-def get_company_tools() -> list[Tool]:
-    """Get list of company-related tools."""
-    return [
-        Tool(
-            name="get_company_profile",
-            description="Get detailed company profile including stock price, market cap, business description, and fundamental metrics",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Stock ticker symbol (e.g., 'AAPL', 'TSLA')"
-                    }
-                },
-                "required": ["symbol"]
-            }
-        ),
-        Tool(
-            name="search_symbol",
-            description="Search for stocks by company name or symbol. Returns matching ticker symbols.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Company name or partial symbol to search for"
-                    }
-                },
-                "required": ["query"]
-            }
-        ),
-        Tool(
-            name="search_by_name",
-            description="Search for ticker symbols by full or partial company name",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Full or partial company or asset name"
-                    }
-                },
-                "required": ["query"]
-            }
-        ),
-        Tool(
-            name="search_by_cik",
-            description="Retrieve company information by Central Index Key (CIK)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "cik": {
-                        "type": "string",
-                        "description": "Central Index Key of the company"
-                    }
-                },
-                "required": ["cik"]
-            }
-        ),
-        Tool(
-            name="search_by_cusip",
-            description="Search for securities by CUSIP number",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "cusip": {
-                        "type": "string",
-                        "description": "CUSIP number of the financial security"
-                    }
-                },
-                "required": ["cusip"]
-            }
-        ),
-        Tool(
-            name="search_by_isin",
-            description="Search for securities by International Securities Identification Number (ISIN)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "isin": {
-                        "type": "string",
-                        "description": "ISIN of the financial security"
-                    }
-                },
-                "required": ["isin"]
-            }
-        ),
-        Tool(
-            name="get_stock_list",
-            description="Retrieve a comprehensive list of all available stocks with symbol, name, price, exchange, and country information",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="screen_stocks",
-            description="Screen stocks based on various financial and market criteria (market cap, price, beta, volume, dividend, sector, industry, etc.)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "market_cap_more_than": {
-                        "type": "number",
-                        "description": "Minimum market capitalization"
-                    },
-                    "market_cap_lower_than": {
-                        "type": "number",
-                        "description": "Maximum market capitalization"
-                    },
-                    "price_more_than": {
-                        "type": "number",
-                        "description": "Minimum stock price"
-                    },
-                    "price_lower_than": {
-                        "type": "number",
-                        "description": "Maximum stock price"
-                    },
-                    "beta_more_than": {
-                        "type": "number",
-                        "description": "Minimum beta value"
-                    },
-                    "beta_lower_than": {
-                        "type": "number",
-                        "description": "Maximum beta value"
-                    },
-                    "volume_more_than": {
-                        "type": "number",
-                        "description": "Minimum trading volume"
-                    },
-                    "volume_lower_than": {
-                        "type": "number",
-                        "description": "Maximum trading volume"
-                    },
-                    "dividend_more_than": {
-                        "type": "number",
-                        "description": "Minimum dividend yield"
-                    },
-                    "dividend_lower_than": {
-                        "type": "number",
-                        "description": "Maximum dividend yield"
-                    },
-                    "sector": {
-                        "type": "string",
-                        "description": "Filter by sector (e.g., 'Technology', 'Healthcare')"
-                    },
-                    "industry": {
-                        "type": "string",
-                        "description": "Filter by industry (e.g., 'Consumer Electronics')"
-                    },
-                    "country": {
-                        "type": "string",
-                        "description": "Filter by country (e.g., 'US')"
-                    },
-                    "exchange": {
-                        "type": "string",
-                        "description": "Filter by exchange (e.g., 'NASDAQ', 'NYSE')"
-                    },
-                    "is_etf": {
-                        "type": "boolean",
-                        "description": "Filter for ETFs"
-                    },
-                    "is_fund": {
-                        "type": "boolean",
-                        "description": "Filter for mutual funds"
-                    },
-                    "is_actively_trading": {
-                        "type": "boolean",
-                        "description": "Filter for actively trading stocks"
-                    },
-                    "limit": {
-                        "type": "number",
-                        "description": "Maximum number of results to return"
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="search_stock_news",
-            description="Search for news articles related to specific stock symbols",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbols": {
-                        "type": "string",
-                        "description": "Comma-separated stock symbols (e.g., 'AAPL,TSLA,MSFT')"
-                    },
-                    "page": {
-                        "type": "number",
-                        "description": "Page number for pagination",
-                        "default": 0
-                    },
-                    "limit": {
-                        "type": "number",
-                        "description": "Maximum number of news articles to return",
-                        "default": 50
-                    }
-                },
-                "required": ["symbols"]
-            }
-        ),
-        Tool(
-            name="get_general_news_latest",
-            description="Get latest general market news articles (not symbol-specific)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "page": {
-                        "type": "number",
-                        "description": "Page number for pagination",
-                        "default": 0
-                    },
-                    "limit": {
-                        "type": "number",
-                        "description": "Maximum number of news articles to return",
-                        "default": 20
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="get_stock_news_latest",
-            description="Get latest stock market news articles (all stocks)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "page": {
-                        "type": "number",
-                        "description": "Page number for pagination",
-                        "default": 0
-                    },
-                    "limit": {
-                        "type": "number",
-                        "description": "Maximum number of news articles to return",
-                        "default": 20
-                    }
-                }
-            }
-        ),
-    ]
+if TYPE_CHECKING:
+    from fmp import FMPClient
 
+# Field presets for company profiles
+PROFILE_PRESETS = {
+    "minimal": ("symbol", "companyName", "price", "marketCap", "sector", "industry"),
+    "valuation": ("symbol", "price", "marketCap", "beta", "lastDividend", "range"),
+}
 
-def handle_company_tool(client: FMPClient, name: str, arguments: Any) -> Any:
-    """Handle company tool execution."""
-    if name == "get_company_profile":
-        return client.get_profile(arguments["symbol"])
 
-    elif name == "search_symbol":
-        return client.search_symbol(arguments["query"])
+def indexed_search(kind: str, method: str, argument: str) -> Handler:
+    """Build a handler answering from the local symbol index, upstream on a miss."""
+    upstream = client_call(method, argument)
 
-    elif name == "search_by_name":
-        return client.search_by_name(arguments["query"])
+    async def handler(client: "FMPClient", arguments: Any) -> Any:
+        return await search_symbols(
+            client, kind, arguments[argument], lambda: upstream(client, arguments)
+        )
 
-    elif name == "search_by_cik":
-        return client.search_by_cik(arguments["cik"])
+    return handler
 
-    elif name == "search_by_cusip":
-        return client.search_by_cusip(arguments["cusip"])
 
-    elif name == "search_by_isin":
-        return client.search_by_isin(arguments["isin"])
+async def screen_stocks(client: "FMPClient", arguments: Any) -> Any:
+    """Screen the local snapshot when it can answer, otherwise forward all criteria."""
+    return await screen_local(
+        client, arguments, lambda: call_client(client.screen_stocks, **arguments)
+    )
 
-    elif name == "get_stock_list":
-        return client.get_stock_list()
 
-    elif name == "screen_stocks":
-        return client.screen_stocks(**arguments)
+register(
+    Tool(
+        name="get_company_profile",
+        description="Get detailed company profile including stock price, market cap, business description, and fundamental metrics",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Stock ticker symbol (e.g., 'AAPL', 'TSLA')"
+                }
+            },
+            "required": ["symbol"]
+        }
+    ),
+    client_call("get_profile", "symbol"),
+    ttl=TTL_LONG,
+    priority=INTERACTIVE,
+    presets=PROFILE_PRESETS
+)
 
-    elif name == "search_stock_news":
-        return client.search_stock_news(
-            symbols=arguments["symbols"],
-            page=arguments.get("page", 0),
-            limit=arguments.get("limit", 50)
-        )
+register(
+    Tool(
+        name="search_symbol",
+        description="Search for stocks by company name or symbol. Returns matching ticker symbols.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Company name or partial symbol to search for"
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+    indexed_search("symbol", "search_symbol", "query"),
+    ttl=TTL_LONG,
+    priority=INTERACTIVE
+)
 
-    elif name == "get_general_news_latest":
-        return client.get_general_news_latest(
-            page=arguments.get("page", 0),
-            limit=arguments.get("limit", 20)
-        )
+register(
+    Tool(
+        name="search_by_name",
+        description="Search for ticker symbols by full or partial company name",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Full or partial company or asset name"
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+    indexed_search("name", "search_by_name", "query"),
+    ttl=TTL_LONG,
+    priority=INTERACTIVE
+)
 
-    elif name == "get_stock_news_latest":
-        return client.get_stock_news_latest(
-            page=arguments.get("page", 0),
-            limit=arguments.get("limit", 20)
-        )
+register(
+    Tool(
+        name="search_by_cik",
+        description="Retrieve company information by Central Index Key (CIK)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "cik": {
+                    "type": "string",
+                    "description": "Central Index Key of the company"
+                }
+            },
+            "required": ["cik"]
+        }
+    ),
+    indexed_search("cik", "search_by_cik", "cik"),
+    ttl=TTL_LONG,
+    priority=INTERACTIVE
+)
+
+register(
+    Tool(
+        name="search_by_cusip",
+        description="Search for securities by CUSIP number",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "cusip": {
+                    "type": "string",
+                    "description": "CUSIP number of the financial security"
+                }
+            },
+            "required": ["cusip"]
+        }
+    ),
+    indexed_search("cusip", "search_by_cusip", "cusip"),
+    ttl=TTL_LONG,
+    priority=INTERACTIVE
+)
+
+register(
+    Tool(
+        name="search_by_isin",
+        description="Search for securities by International Securities Identification Number (ISIN)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "isin": {
+                    "type": "string",
+                    "description": "ISIN of the financial security"
+                }
+            },
+            "required": ["isin"]
+        }
+    ),
+    indexed_search("isin", "search_by_isin", "isin"),
+    ttl=TTL_LONG,
+    priority=INTERACTIVE
+)
 
-    return None
+register(
+    Tool(
+        name="get_stock_list",
+        description="Retrieve a comprehensive list of all available stocks with symbol, name, price, exchange, and country information. Results are paged: pass next_cursor back as cursor for the next page",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    client_call("get_stock_list"),
+    ttl=TTL_DAY,
+    priority=BULK,
+    page_size=DEFAULT_PAGE_SIZE
+)
+
+register(
+    Tool(
+        name="screen_stocks",
+        description="Screen stocks based on various financial and market criteria (market cap, price, beta, volume, dividend, sector, industry, etc.). Results are paged: pass next_cursor back as cursor for the next page",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "market_cap_more_than": {
+                    "type": "number",
+                    "description": "Minimum market capitalization"
+                },
+                "market_cap_lower_than": {
+                    "type": "number",
+                    "description": "Maximum market capitalization"
+                },
+                "price_more_than": {
+                    "type": "number",
+                    "description": "Minimum stock price"
+                },
+                "price_lower_than": {
+                    "type": "number",
+                    "description": "Maximum stock price"
+                },
+                "beta_more_than": {
+                    "type": "number",
+                    "description": "Minimum beta value"
+                },
+                "beta_lower_than": {
+                    "type": "number",
+                    "description": "Maximum beta value"
+                },
+                "volume_more_than": {
+                    "type": "number",
+                    "description": "Minimum trading volume"
+                },
+                "volume_lower_than": {
+                    "type": "number",
+                    "description": "Maximum trading volume"
+                },
+                "dividend_more_than": {
+                    "type": "number",
+                    "description": "Minimum dividend yield"
+                },
+                "dividend_lower_than": {
+                    "type": "number",
+                    "description": "Maximum dividend yield"
+                },
+                "sector": {
+                    "type": "string",
+                    "description": "Filter by sector (e.g., 'Technology', 'Healthcare')"
+                },
+                "industry": {
+                    "type": "string",
+                    "description": "Filter by industry (e.g., 'Consumer Electronics')"
+                },
+                "country": {
+                    "type": "string",
+                    "description": "Filter by country (e.g., 'US')"
+                },
+                "exchange": {
+                    "type": "string",
+                    "description": "Filter by exchange (e.g., 'NASDAQ', 'NYSE')"
+                },
+                "is_etf": {
+                    "type": "boolean",
+                    "description": "Filter for ETFs"
+                },
+                "is_fund": {
+                    "type": "boolean",
+                    "description": "Filter for mutual funds"
+                },
+                "is_actively_trading": {
+                    "type": "boolean",
+                    "description": "Filter for actively trading stocks"
+                },
+                "limit": {
+                    "type": "number",
+                    "description": "Maximum number of results to return"
+                }
+            }
+        }
+    ),
+    screen_stocks,
+    ttl=TTL_SHORT,
+    priority=BULK,
+    page_size=DEFAULT_PAGE_SIZE
+)
+
+register(
+    Tool(
+        name="search_stock_news",
+        description="Search for news articles related to specific stock symbols",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbols": {
+                    "type": "string",
+                    "description": "Comma-separated stock symbols (e.g., 'AAPL,TSLA,MSFT')"
+                },
+                "page": {
+                    "type": "number",
+                    "description": "Page number for pagination",
+                    "default": 0
+                },
+                "limit": {
+                    "type": "number",
+                    "description": "Maximum number of news articles to return",
+                    "default": 50
+                }
+            },
+            "required": ["symbols"]
+        }
+    ),
+    client_call("search_stock_news", symbols=REQUIRED, page=0, limit=50),
+    ttl=TTL_SHORT
+)
+
+register(
+    Tool(
+        name="get_general_news_latest",
+        description="Get latest general market news articles (not symbol-specific)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "page": {
+                    "type": "number",
+                    "description": "Page number for pagination",
+                    "default": 0
+                },
+                "limit": {
+                    "type": "number",
+                    "description": "Maximum number of news articles to return",
+                    "default": 20
+                }
+            }
+        }
+    ),
+    client_call("get_general_news_latest", page=0, limit=20),
+    ttl=TTL_SHORT
+)
+
+register(
+    Tool(
+        name="get_stock_news_latest",
+        description="Get latest stock market news articles (all stocks)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "page": {
+                    "type": "number",
+                    "description": "Page number for pagination",
+                    "default": 0
+                },
+                "limit": {
+                    "type": "number",
+                    "description": "Maximum number of news articles to return",
+                    "default": 20
+                }
+            }
+        }
+    ),
+    client_call("get_stock_news_latest", page=0, limit=20),
+    ttl=TTL_SHORT
+)
@@ -1,147 +1,213 @@
 """Cryptocurrency MCP tools."""
 
-from typing import Any
+from functools import partial
+from typing import TYPE_CHECKING, Any
 from mcp.types import Tool, TextContent
-from fmp import FMPClient
-
-
-def get_crypto_tools() -> list[Tool]:
-    """Get list of cryptocurrency tools."""
-    return [
-        Tool(
-            name="get_crypto_quote",
-            description="Get real-time cryptocurrency quote with price, volume, and market data",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Crypto pair symbol (e.g., 'BTCUSD', 'ETHUSD')",
-                    }
-                },
-                "required": ["symbol"],
-            },
-        ),
-        Tool(
-            name="get_crypto_list",
-            description="Get list of all available cryptocurrencies",
-            inputSchema={"type": "object", "properties": {}},
+
+from ..cache import TTL_DAY, TTL_MEDIUM, TTL_REALTIME, TTL_SHORT
+from ..executor import call_client
+from ..history import fetch_date_range
+from ..pagination import DEFAULT_PAGE_SIZE
+from ..ratelimit import BULK, INTERACTIVE, intraday_priority
+from .market import BAR_PRESETS, QUOTE_PRESETS, fetch_quotes_batch, parse_symbols
+from .registry import client_call, register
+
+if TYPE_CHECKING:
+    from fmp import FMPClient
+
+
+async def get_crypto_quotes_batch(client: "FMPClient", arguments: Any) -> Any:
+    """Fetch quotes for a list of crypto pairs."""
+    return await fetch_quotes_batch(
+        client, parse_symbols(arguments["symbols"]), client.get_crypto_quote
+    )
+
+
+async def get_crypto_historical(client: "FMPClient", arguments: Any) -> Any:
+    """Fetch intraday crypto bars, reusing settled days from the store."""
+    interval = arguments.get("interval", "1hour")
+    return await fetch_date_range(
+        f"crypto-chart-{interval}",
+        arguments["symbol"].upper(),
+        partial(
+            call_client,
+            client.get_crypto_intraday,
+            symbol=arguments["symbol"],
+            interval=interval,
         ),
-        Tool(
-            name="get_crypto_historical",
-            description="Get intraday historical cryptocurrency price data with various time intervals (1min to 4hour)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Crypto pair symbol (e.g., 'BTCUSD')",
-                    },
-                    "interval": {
-                        "type": "string",
-                        "description": "Time interval: '1min', '5min', '15min', '30min', '1hour', '4hour'",
-                        "default": "1hour",
-                    },
-                    "from_date": {
-                        "type": "string",
-                        "description": "Start date in YYYY-MM-DD format",
-                    },
-                    "to_date": {"type": "string", "description": "End date in YYYY-MM-DD format"},
-                },
-                "required": ["symbol"],
+        arguments.get("from_date"),
+        arguments.get("to_date"),
+        capped=True,
+    )
+
+
+async def get_crypto_historical_price(client: "FMPClient", arguments: Any) -> Any:
+    """Fetch daily crypto bars, reusing settled days from the store."""
+    return await fetch_date_range(
+        "crypto-eod",
+        arguments["symbol"].upper(),
+        partial(call_client, client.get_crypto_historical_price, symbol=arguments["symbol"]),
+        arguments.get("from_date"),
+        arguments.get("to_date"),
+    )
+
+
+register(
+    Tool(
+        name="get_crypto_quote",
+        description="Get real-time cryptocurrency quote with price, volume, and market data",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Crypto pair symbol (e.g., 'BTCUSD', 'ETHUSD')",
+                }
             },
-        ),
-        Tool(
-            name="get_crypto_historical_price",
-            description="Get daily historical cryptocurrency price data (end-of-day prices)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Crypto pair symbol (e.g., 'BTCUSD', 'ETHUSD')",
-                    },
-                    "from_date": {
-                        "type": "string",
-                        "description": "Start date in YYYY-MM-DD format",
-                    },
-                    "to_date": {"type": "string", "description": "End date in YYYY-MM-DD format"},
-                },
-                "required": ["symbol"],
+            "required": ["symbol"],
+        },
+    ),
+    client_call("get_crypto_quote", "symbol"),
+    ttl=TTL_REALTIME,
+    priority=INTERACTIVE,
+    presets=QUOTE_PRESETS,
+)
+
+register(
+    Tool(
+        name="get_crypto_quotes_batch",
+        description="Get real-time quotes for many cryptocurrencies in one call, returned as a single table",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbols": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Crypto pair symbols (e.g., ['BTCUSD', 'ETHUSD'])",
+                }
             },
-        ),
-        Tool(
-            name="get_crypto_news",
-            description="Get latest cryptocurrency news articles",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "number",
-                        "description": "Maximum number of news articles to return",
-                        "default": 10,
-                    }
+            "required": ["symbols"],
+        },
+    ),
+    get_crypto_quotes_batch,
+    ttl=TTL_REALTIME,
+    priority=INTERACTIVE,
+    presets=QUOTE_PRESETS,
+)
+
+register(
+    Tool(
+        name="get_crypto_list",
+        description="Get list of all available cryptocurrencies. Results are paged: pass next_cursor back as cursor for the next page",
+        inputSchema={"type": "object", "properties": {}},
+    ),
+    client_call("get_crypto_list"),
+    ttl=TTL_DAY,
+    priority=BULK,
+    page_size=DEFAULT_PAGE_SIZE,
+)
+
+register(
+    Tool(
+        name="get_crypto_historical",
+        description="Get intraday historical cryptocurrency price data with various time intervals (1min to 4hour)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Crypto pair symbol (e.g., 'BTCUSD')",
                 },
-            },
-        ),
-        Tool(
-            name="search_crypto_news",
-            description="Search cryptocurrency news articles with filters",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbols": {
-                        "type": "string",
-                        "description": "Crypto pair symbol to search news for (e.g., 'BTCUSD', 'ETHUSD')",
-                    },
-                    "from_date": {
-                        "type": "string",
-                        "description": "Start date in YYYY-MM-DD format",
-                    },
-                    "to_date": {"type": "string", "description": "End date in YYYY-MM-DD format"},
-                    "limit": {
-                        "type": "number",
-                        "description": "Maximum number of news articles to return",
-                        "default": 50,
-                    },
+                "interval": {
+                    "type": "string",
+                    "description": "Time interval: '1min', '5min', '15min', '30min', '1hour', '4hour'",
+                    "default": "1hour",
+                },
+                "from_date": {
+                    "type": "string",
+                    "description": "Start date in YYYY-MM-DD format",
                 },
+                "to_date": {"type": "string", "description": "End date in YYYY-MM-DD format"},
             },
-        ),
-    ]
-
+            "required": ["symbol"],
+        },
+    ),
+    get_crypto_historical,
+    ttl=TTL_SHORT,
+    priority=intraday_priority,
+    presets=BAR_PRESETS,
+)
 
-def handle_crypto_tool(client: FMPClient, name: str, arguments: Any) -> Any:
-    """Handle crypto tool execution."""
-    if name == "get_crypto_quote":
-        return client.get_crypto_quote(arguments["symbol"])
-
-    elif name == "get_crypto_list":
-        return client.get_crypto_list()
+register(
+    Tool(
+        name="get_crypto_historical_price",
+        description="Get daily historical cryptocurrency price data (end-of-day prices)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Crypto pair symbol (e.g., 'BTCUSD', 'ETHUSD')",
+                },
+                "from_date": {
+                    "type": "string",
+                    "description": "Start date in YYYY-MM-DD format",
+                },
+                "to_date": {"type": "string", "description": "End date in YYYY-MM-DD format"},
+            },
+            "required": ["symbol"],
+        },
+    ),
+    get_crypto_historical_price,
+    ttl=TTL_MEDIUM,
+    presets=BAR_PRESETS,
+)
 
-    elif name == "get_crypto_historical":
-        return client.get_crypto_intraday(
-            symbol=arguments["symbol"],
-            interval=arguments.get("interval", "1hour"),
-            from_date=arguments.get("from_date"),
-            to_date=arguments.get("to_date"),
-        )
+register(
+    Tool(
+        name="get_crypto_news",
+        description="Get latest cryptocurrency news articles",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "number",
+                    "description": "Maximum number of news articles to return",
+                    "default": 10,
+                }
+            },
+        },
+    ),
+    client_call("get_crypto_news_latest", limit=10),
+    ttl=TTL_SHORT,
+)
 
-    elif name == "get_crypto_historical_price":
-        return client.get_crypto_historical_price(
-            symbol=arguments["symbol"],
-            from_date=arguments.get("from_date"),
-            to_date=arguments.get("to_date"),
-        )
-
-    elif name == "get_crypto_news":
-        return client.get_crypto_news_latest(limit=arguments.get("limit", 10))
-
-    elif name == "search_crypto_news":
-        return client.search_crypto_news(
-            symbols=arguments.get("symbols"),
-            from_date=arguments.get("from_date"),
-            to_date=arguments.get("to_date"),
-            limit=arguments.get("limit", 50),
-        )
-
-    return None
+register(
+    Tool(
+        name="search_crypto_news",
+        description="Search cryptocurrency news articles with filters",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbols": {
+                    "type": "string",
+                    "description": "Crypto pair symbol to search news for (e.g., 'BTCUSD', 'ETHUSD')",
+                },
+                "from_date": {
+                    "type": "string",
+                    "description": "Start date in YYYY-MM-DD format",
+                },
+                "to_date": {"type": "string", "description": "End date in YYYY-MM-DD format"},
+                "limit": {
+                    "type": "number",
+                    "description": "Maximum number of news articles to return",
+                    "default": 50,
+                },
+            },
+        },
+    ),
+    client_call(
+        "search_crypto_news", symbols=None, from_date=None, to_date=None, limit=50
+    ),
+    ttl=TTL_SHORT,
+)
@@ -1,140 +1,330 @@
 """Financial statements MCP tools."""
 
-from typing import Any
+from functools import partial
+from typing import TYPE_CHECKING, Any
 from mcp.types import Tool, TextContent
-from fmp import FMPClient
-
-
-def get_financials_tools() -> list[Tool]:
-    """Get list of financial statement tools."""
-    return [
-        Tool(
-            name="get_income_statement",
-            description="Get income statement data showing revenue, expenses, and profitability",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Stock ticker symbol"
-                    },
-                    "period": {
-                        "type": "string",
-                        "description": "Reporting period: 'annual' or 'quarter'",
-                        "default": "annual"
-                    },
-                    "limit": {
-                        "type": "number",
-                        "description": "Number of periods to retrieve",
-                        "default": 5
-                    }
-                },
-                "required": ["symbol"]
-            }
+
+from ..cache import TTL_LONG
+from ..executor import call_client, gather_bounded
+from ..history import fetch_statements
+from .market import parse_symbols
+from .registry import Handler, register
+
+if TYPE_CHECKING:
+    from fmp import FMPClient
+
+# Statement types accepted by get_financials_bulk
+STATEMENT_TYPES = {
+    "income": "get_income_statement",
+    "balance_sheet": "get_balance_sheet",
+    "cash_flow": "get_cash_flow_statement",
+    "growth": "get_financial_growth",
+}
+
+# Field presets per statement tool
+STATEMENT_PRESETS = {
+    "get_income_statement": {
+        "minimal": ("symbol", "date", "period", "revenue", "netIncome", "eps"),
+        "valuation": (
+            "symbol", "date", "period", "revenue", "grossProfit", "operatingIncome",
+            "ebitda", "netIncome", "epsDiluted",
         ),
-        Tool(
-            name="get_balance_sheet",
-            description="Get balance sheet data showing assets, liabilities, and equity",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Stock ticker symbol"
-                    },
-                    "period": {
-                        "type": "string",
-                        "description": "Reporting period: 'annual' or 'quarter'",
-                        "default": "annual"
-                    },
-                    "limit": {
-                        "type": "number",
-                        "description": "Number of periods to retrieve",
-                        "default": 5
-                    }
-                },
-                "required": ["symbol"]
-            }
+    },
+    "get_balance_sheet": {
+        "minimal": (
+            "symbol", "date", "period", "totalAssets", "totalLiabilities",
+            "totalStockholdersEquity",
         ),
-        Tool(
-            name="get_cash_flow_statement",
-            description="Get cash flow statement showing operating, investing, and financing activities",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Stock ticker symbol"
-                    },
-                    "period": {
-                        "type": "string",
-                        "description": "Reporting period: 'annual' or 'quarter'",
-                        "default": "annual"
-                    },
-                    "limit": {
-                        "type": "number",
-                        "description": "Number of periods to retrieve",
-                        "default": 5
-                    }
-                },
-                "required": ["symbol"]
-            }
+        "valuation": (
+            "symbol", "date", "period", "cashAndCashEquivalents", "totalDebt", "netDebt",
+            "totalStockholdersEquity",
         ),
-        Tool(
-            name="get_financial_growth",
-            description="Get financial growth metrics showing year-over-year growth rates",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Stock ticker symbol"
-                    },
-                    "period": {
-                        "type": "string",
-                        "description": "Reporting period: 'annual' or 'quarter'",
-                        "default": "annual"
-                    },
-                    "limit": {
-                        "type": "number",
-                        "description": "Number of periods to retrieve",
-                        "default": 5
-                    }
-                },
-                "required": ["symbol"]
-            }
+    },
+    "get_cash_flow_statement": {
+        "minimal": (
+            "symbol", "date", "period", "operatingCashFlow", "capitalExpenditure",
+            "freeCashFlow",
+        ),
+        "valuation": (
+            "symbol", "date", "period", "freeCashFlow", "stockBasedCompensation",
+            "commonStockRepurchased",
+        ),
+    },
+    "get_financial_growth": {
+        "minimal": ("symbol", "date", "period", "revenueGrowth", "netIncomeGrowth", "epsgrowth"),
+    },
+    "get_financials_bulk": {
+        "minimal": (
+            "symbol", "date", "period", "revenue", "netIncome", "totalAssets", "freeCashFlow",
         ),
-    ]
+        "valuation": (
+            "symbol", "date", "period", "revenue", "ebitda", "netIncome", "epsDiluted",
+            "totalDebt", "cashAndCashEquivalents", "freeCashFlow",
+        ),
+    },
+}
 
+# Columns identifying a merged row, placed first in the bulk table
+KEY_COLUMNS = ("symbol", "date", "period", "fiscalYear")
 
-def handle_financials_tool(client: FMPClient, name: str, arguments: Any) -> Any:
-    """Handle financial statement tool execution."""
-    if name == "get_income_statement":
-        return client.get_income_statement(
-            symbol=arguments["symbol"],
-            period=arguments.get("period", "annual"),
-            limit=arguments.get("limit", 5)
-        )
 
-    elif name == "get_balance_sheet":
-        return client.get_balance_sheet(
-            symbol=arguments["symbol"],
-            period=arguments.get("period", "annual"),
-            limit=arguments.get("limit", 5)
-        )
+async def fetch_statement(
+    client: "FMPClient", name: str, symbol: str, period: str, limit: int
+) -> Any:
+    """Fetch one statement for one symbol, reusing stored periods."""
+    return await fetch_statements(
+        name,
+        f"{symbol.upper()}:{period}",
+        partial(call_client, getattr(client, name), symbol=symbol, period=period),
+        limit
+    )
 
-    elif name == "get_cash_flow_statement":
-        return client.get_cash_flow_statement(
-            symbol=arguments["symbol"],
-            period=arguments.get("period", "annual"),
-            limit=arguments.get("limit", 5)
+
+async def fetch_financials_bulk(
+    client: "FMPClient",
+    symbols: list[str],
+    statements: list[str],
+    period: str,
+    limit: int,
+) -> Any:
+    """Fetch statements for many symbols concurrently and merge them by symbol and date.
+
+    Each (symbol, statement) pair is one rate-limited call. Rows for the same
+    symbol and date are merged into one row (the first statement wins on shared
+    columns) and missing columns are filled with None so the result is a single
+    table. Pairs that fail are reported under ``errors``.
+    """
+    pairs = [(symbol, statement) for symbol in symbols for statement in statements]
+    results = await gather_bounded(
+        partial(fetch_statement, client, STATEMENT_TYPES[statement], symbol, period, limit)
+        for symbol, statement in pairs
+    )
+    failures = [result for result in results if isinstance(result, Exception)]
+    if failures and len(failures) == len(results):
+        raise failures[0]
+
+    merged: dict[tuple[str, str], dict[str, Any]] = {}
+    columns: dict[str, None] = dict.fromkeys(KEY_COLUMNS)
+    errors = []
+    for (symbol, statement), result in zip(pairs, results):
+        if isinstance(result, Exception):
+            errors.append({"symbol": symbol, "statement": statement, "error": str(result)})
+            continue
+        for item in result if isinstance(result, list) else [result]:
+            row = item.model_dump() if hasattr(item, "model_dump") else item
+            target = merged.setdefault((symbol, str(row.get("date"))), {"symbol": symbol})
+            for column, value in row.items():
+                target.setdefault(column, value)
+                columns.setdefault(column)
+
+    order = {symbol: index for index, symbol in enumerate(symbols)}
+    keys = sorted(merged, key=lambda key: key[1], reverse=True)
+    keys.sort(key=lambda key: order[key[0]])
+    rows = [{column: merged[key].get(column) for column in columns} for key in keys]
+    return {"financials": rows, "errors": errors} if errors else rows
+
+
+def parse_statements(value: Any) -> list[str]:
+    """Normalize a statement list or comma-separated string, rejecting unknown types."""
+    if not value:
+        return list(STATEMENT_TYPES)
+    if isinstance(value, str):
+        value = value.split(",")
+
+    statements = []
+    for statement in value:
+        statement = str(statement).strip().lower()
+        if statement and statement not in statements:
+            statements.append(statement)
+    unknown = [statement for statement in statements if statement not in STATEMENT_TYPES]
+    if unknown:
+        raise ValueError(
+            f"Unknown statement type(s): {', '.join(unknown)}; "
+            f"expected any of {', '.join(STATEMENT_TYPES)}"
         )
+    return statements or list(STATEMENT_TYPES)
+
 
-    elif name == "get_financial_growth":
-        return client.get_financial_growth(
-            symbol=arguments["symbol"],
-            period=arguments.get("period", "annual"),
-            limit=arguments.get("limit", 5)
+def statement_handler(name: str) -> Handler:
+    """Build the handler for a single-symbol statement tool named after its client method."""
+    async def handler(client: "FMPClient", arguments: Any) -> Any:
+        return await fetch_statement(
+            client,
+            name,
+            arguments["symbol"],
+            arguments.get("period", "annual"),
+            int(arguments.get("limit", 5))
         )
 
-    return None
+    return handler
+
+
+async def get_financials_bulk(client: "FMPClient", arguments: Any) -> Any:
+    """Fetch and merge statements for a list of symbols."""
+    return await fetch_financials_bulk(
+        client,
+        parse_symbols(arguments["symbols"]),
+        parse_statements(arguments.get("statements")),
+        arguments.get("period", "annual"),
+        int(arguments.get("limit", 5))
+    )
+
+
+register(
+    Tool(
+        name="get_income_statement",
+        description="Get income statement data showing revenue, expenses, and profitability",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Stock ticker symbol"
+                },
+                "period": {
+                    "type": "string",
+                    "description": "Reporting period: 'annual' or 'quarter'",
+                    "default": "annual"
+                },
+                "limit": {
+                    "type": "number",
+                    "description": "Number of periods to retrieve",
+                    "default": 5
+                }
+            },
+            "required": ["symbol"]
+        }
+    ),
+    statement_handler("get_income_statement"),
+    ttl=TTL_LONG,
+    presets=STATEMENT_PRESETS["get_income_statement"]
+)
+
+register(
+    Tool(
+        name="get_balance_sheet",
+        description="Get balance sheet data showing assets, liabilities, and equity",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Stock ticker symbol"
+                },
+                "period": {
+                    "type": "string",
+                    "description": "Reporting period: 'annual' or 'quarter'",
+                    "default": "annual"
+                },
+                "limit": {
+                    "type": "number",
+                    "description": "Number of periods to retrieve",
+                    "default": 5
+                }
+            },
+            "required": ["symbol"]
+        }
+    ),
+    statement_handler("get_balance_sheet"),
+    ttl=TTL_LONG,
+    presets=STATEMENT_PRESETS["get_balance_sheet"]
+)
+
+register(
+    Tool(
+        name="get_cash_flow_statement",
+        description="Get cash flow statement showing operating, investing, and financing activities",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Stock ticker symbol"
+                },
+                "period": {
+                    "type": "string",
+                    "description": "Reporting period: 'annual' or 'quarter'",
+                    "default": "annual"
+                },
+                "limit": {
+                    "type": "number",
+                    "description": "Number of periods to retrieve",
+                    "default": 5
+                }
+            },
+            "required": ["symbol"]
+        }
+    ),
+    statement_handler("get_cash_flow_statement"),
+    ttl=TTL_LONG,
+    presets=STATEMENT_PRESETS["get_cash_flow_statement"]
+)
+
+register(
+    Tool(
+        name="get_financial_growth",
+        description="Get financial growth metrics showing year-over-year growth rates",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Stock ticker symbol"
+                },
+                "period": {
+                    "type": "string",
+                    "description": "Reporting period: 'annual' or 'quarter'",
+                    "default": "annual"
+                },
+                "limit": {
+                    "type": "number",
+                    "description": "Number of periods to retrieve",
+                    "default": 5
+                }
+            },
+            "required": ["symbol"]
+        }
+    ),
+    statement_handler("get_financial_growth"),
+    ttl=TTL_LONG,
+    presets=STATEMENT_PRESETS["get_financial_growth"]
+)
+
+register(
+    Tool(
+        name="get_financials_bulk",
+        description="Get income statement, balance sheet, cash flow and growth data for many symbols at once, merged into one table keyed by symbol and period",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbols": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Stock ticker symbols (e.g., ['AAPL', 'MSFT', 'GOOGL'])"
+                },
+                "statements": {
+                    "type": "array",
+                    "items": {
+                        "type": "string",
+                        "enum": ["income", "balance_sheet", "cash_flow", "growth"]
+                    },
+                    "description": "Statement types to include (default: all)"
+                },
+                "period": {
+                    "type": "string",
+                    "description": "Reporting period: 'annual' or 'quarter'",
+                    "default": "annual"
+                },
+                "limit": {
+                    "type": "number",
+                    "description": "Number of periods to retrieve per symbol",
+                    "default": 5
+                }
+            },
+            "required": ["symbols"]
+        }
+    ),
+    get_financials_bulk,
+    ttl=TTL_LONG,
+    presets=STATEMENT_PRESETS["get_financials_bulk"]
+)
@@ -1,229 +1,378 @@
 """Market data MCP tools."""
 
-from typing import Any
+from functools import partial
+from typing import TYPE_CHECKING, Any
 from mcp.types import Tool, TextContent
-from fmp import FMPClient
-
-
-def get_market_tools() -> list[Tool]:
-    """Get list of market data tools."""
-    return [
-        Tool(
-            name="get_quote",
-            description="Get real-time stock quote with price, volume, change, and other trading data",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Stock ticker symbol (e.g., 'AAPL')"
-                    }
-                },
-                "required": ["symbol"]
-            }
-        ),
-        Tool(
-            name="get_historical_chart",
-            description="Get intraday historical price data for a symbol with various time intervals (use get_historical_price for daily end-of-day data)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Stock ticker symbol"
-                    },
-                    "interval": {
-                        "type": "string",
-                        "description": "Time interval: '1min', '5min', '15min', '30min', '1hour', '4hour'",
-                        "default": "1hour"
-                    },
-                    "from_date": {
-                        "type": "string",
-                        "description": "Start date in YYYY-MM-DD format"
-                    },
-                    "to_date": {
-                        "type": "string",
-                        "description": "End date in YYYY-MM-DD format"
-                    }
-                },
-                "required": ["symbol"]
-            }
-        ),
-        Tool(
-            name="get_historical_price",
-            description="Get daily historical price data for a symbol with different price adjustment types",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "Stock ticker symbol"
-                    },
-                    "price_type": {
-                        "type": "string",
-                        "description": "Price type: 'full', 'light', 'non-split-adjusted', 'dividend-adjusted'",
-                        "default": "full"
-                    },
-                    "from_date": {
-                        "type": "string",
-                        "description": "Start date in YYYY-MM-DD format"
-                    },
-                    "to_date": {
-                        "type": "string",
-                        "description": "End date in YYYY-MM-DD format"
-                    },
-                    "timeseries": {
-                        "type": "number",
-                        "description": "Number of days to retrieve"
-                    }
-                },
-                "required": ["symbol"]
-            }
-        ),
-        Tool(
-            name="get_industry_pe",
-            description="Get price-to-earnings ratios for industries on a specific date",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "date": {
-                        "type": "string",
-                        "description": "Date in YYYY-MM-DD format"
-                    },
-                    "exchange": {
-                        "type": "string",
-                        "description": "Stock exchange (e.g., 'NASDAQ', 'NYSE')"
-                    },
-                    "industry": {
-                        "type": "string",
-                        "description": "Specific industry to filter by"
-                    }
-                },
-                "required": ["date"]
-            }
-        ),
-        Tool(
-            name="get_sector_pe",
-            description="Get price-to-earnings ratios for sectors on a specific date",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "date": {
-                        "type": "string",
-                        "description": "Date in YYYY-MM-DD format"
-                    },
-                    "exchange": {
-                        "type": "string",
-                        "description": "Stock exchange (e.g., 'NASDAQ', 'NYSE')"
-                    },
-                    "sector": {
-                        "type": "string",
-                        "description": "Specific sector to filter by"
-                    }
-                },
-                "required": ["date"]
-            }
-        ),
-        Tool(
-            name="get_industry_performance",
-            description="Get daily performance data for industries showing average percentage changes",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "date": {
-                        "type": "string",
-                        "description": "Date in YYYY-MM-DD format"
-                    },
-                    "exchange": {
-                        "type": "string",
-                        "description": "Stock exchange to filter by"
-                    },
-                    "industry": {
-                        "type": "string",
-                        "description": "Specific industry to filter by"
-                    }
-                },
-                "required": ["date"]
-            }
-        ),
-        Tool(
-            name="get_historical_sector_pe",
-            description="Get historical price-to-earnings ratios for a sector over a date range",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "sector": {
-                        "type": "string",
-                        "description": "Sector name (e.g., 'Energy', 'Technology')"
-                    },
-                    "exchange": {
-                        "type": "string",
-                        "description": "Stock exchange to filter by"
-                    },
-                    "from_date": {
-                        "type": "string",
-                        "description": "Start date in YYYY-MM-DD format"
-                    },
-                    "to_date": {
-                        "type": "string",
-                        "description": "End date in YYYY-MM-DD format"
-                    }
-                },
-                "required": ["sector"]
-            }
-        ),
-    ]
+
+from ..cache import TTL_MEDIUM, TTL_REALTIME, TTL_SHORT
+from ..executor import call_client, gather_bounded
+from ..history import fetch_date_range
+from ..ratelimit import INTERACTIVE, intraday_priority
+from .registry import REQUIRED, client_call, register
+
+if TYPE_CHECKING:
+    from fmp import FMPClient
+
+# Maximum symbols per multi-symbol quote request
+BATCH_QUOTE_CHUNK = 100
+
+# Field presets for quote tools
+QUOTE_PRESETS = {
+    "minimal": ("symbol", "price", "changePercentage", "volume"),
+    "valuation": (
+        "symbol", "price", "marketCap", "yearHigh", "yearLow", "priceAvg50", "priceAvg200"
+    ),
+}
+
+# Field presets for price bar tools
+BAR_PRESETS = {
+    "minimal": ("date", "close", "volume"),
+    "ohlc": ("date", "open", "high", "low", "close"),
+}
+
+
+def parse_symbols(value: Any) -> list[str]:
+    """Normalize a symbol list or comma-separated string, dropping duplicates."""
+    if isinstance(value, str):
+        value = value.split(",")
+
+    symbols = []
+    for symbol in value:
+        symbol = str(symbol).strip().upper()
+        if symbol and symbol not in symbols:
+            symbols.append(symbol)
+    return symbols
 
 
-def handle_market_tool(client: FMPClient, name: str, arguments: Any) -> Any:
-    """Handle market tool execution."""
-    if name == "get_quote":
-        return client.get_quote(arguments["symbol"])
+async def fetch_quotes_batch(client: "FMPClient", symbols: list[str], quote_method: Any) -> Any:
+    """Fetch quotes for many symbols as one list of rows.
 
-    elif name == "get_historical_chart":
-        return client.get_historical_chart(
+    Uses the client's multi-symbol quote endpoint when it has one, otherwise fans
+    out single-symbol ``quote_method`` calls with bounded parallelism. Symbols
+    that fail are reported under ``errors`` next to the ``quotes`` table.
+    """
+    batch_method = getattr(client, "get_batch_quote", None)
+    if batch_method is not None:
+        groups = [
+            symbols[i:i + BATCH_QUOTE_CHUNK] for i in range(0, len(symbols), BATCH_QUOTE_CHUNK)
+        ]
+        calls = [partial(call_client, batch_method, group) for group in groups]
+    else:
+        groups = [[symbol] for symbol in symbols]
+        calls = [partial(call_client, quote_method, symbol) for symbol in symbols]
+
+    results = await gather_bounded(calls)
+    failures = [result for result in results if isinstance(result, Exception)]
+    if failures and len(failures) == len(results):
+        raise failures[0]
+
+    quotes, errors = [], []
+    for group, result in zip(groups, results):
+        if isinstance(result, Exception):
+            errors.append({"symbols": ",".join(group), "error": str(result)})
+            continue
+        for item in result if isinstance(result, list) else [result]:
+            quotes.append(item.model_dump() if hasattr(item, "model_dump") else item)
+
+    order = {symbol: index for index, symbol in enumerate(symbols)}
+    quotes.sort(key=lambda quote: order.get(str(quote.get("symbol", "")).upper(), len(order)))
+    return {"quotes": quotes, "errors": errors} if errors else quotes
+
+
+async def get_quotes_batch(client: "FMPClient", arguments: Any) -> Any:
+    """Fetch quotes for a list of stock symbols."""
+    return await fetch_quotes_batch(
+        client, parse_symbols(arguments["symbols"]), client.get_quote
+    )
+
+
+async def get_historical_chart(client: "FMPClient", arguments: Any) -> Any:
+    """Fetch intraday bars, reusing settled days from the store."""
+    interval = arguments.get("interval", "1hour")
+    return await fetch_date_range(
+        f"chart-{interval}",
+        arguments["symbol"].upper(),
+        partial(
+            call_client,
+            client.get_historical_chart,
             symbol=arguments["symbol"],
-            interval=arguments.get("interval", "1hour"),
-            from_date=arguments.get("from_date"),
-            to_date=arguments.get("to_date")
-        )
+            interval=interval
+        ),
+        arguments.get("from_date"),
+        arguments.get("to_date"),
+        capped=True,
+        adjusted=True
+    )
 
-    elif name == "get_historical_price":
-        return client.get_historical_price(
+
+async def get_historical_price(client: "FMPClient", arguments: Any) -> Any:
+    """Fetch daily bars, reusing settled days from the store."""
+    if arguments.get("timeseries") is not None:
+        return await call_client(
+            client.get_historical_price,
             symbol=arguments["symbol"],
             price_type=arguments.get("price_type", "full"),
             from_date=arguments.get("from_date"),
             to_date=arguments.get("to_date"),
-            timeseries=arguments.get("timeseries")
+            timeseries=arguments["timeseries"]
         )
 
-    elif name == "get_industry_pe":
-        return client.get_industry_pe(
-            date=arguments["date"],
-            exchange=arguments.get("exchange"),
-            industry=arguments.get("industry")
-        )
-
-    elif name == "get_sector_pe":
-        return client.get_sector_pe(
-            date=arguments["date"],
-            exchange=arguments.get("exchange"),
-            sector=arguments.get("sector")
-        )
+    price_type = arguments.get("price_type", "full")
+    return await fetch_date_range(
+        f"eod-{price_type}",
+        arguments["symbol"].upper(),
+        partial(
+            call_client,
+            client.get_historical_price,
+            symbol=arguments["symbol"],
+            price_type=price_type
+        ),
+        arguments.get("from_date"),
+        arguments.get("to_date"),
+        adjusted=price_type != "non-split-adjusted"
+    )
 
-    elif name == "get_industry_performance":
-        return client.get_industry_performance(
-            date=arguments["date"],
-            exchange=arguments.get("exchange"),
-            industry=arguments.get("industry")
-        )
 
-    elif name == "get_historical_sector_pe":
-        return client.get_historical_sector_pe(
+async def get_historical_sector_pe(client: "FMPClient", arguments: Any) -> Any:
+    """Fetch historical sector P/E, reusing settled days from the store."""
+    return await fetch_date_range(
+        "historical-sector-pe",
+        f"{arguments['sector']}:{arguments.get('exchange') or ''}",
+        partial(
+            call_client,
+            client.get_historical_sector_pe,
             sector=arguments["sector"],
-            exchange=arguments.get("exchange"),
-            from_date=arguments.get("from_date"),
-            to_date=arguments.get("to_date")
-        )
+            exchange=arguments.get("exchange")
+        ),
+        arguments.get("from_date"),
+        arguments.get("to_date")
+    )
+
+
+register(
+    Tool(
+        name="get_quote",
+        description="Get real-time stock quote with price, volume, change, and other trading data",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Stock ticker symbol (e.g., 'AAPL')"
+                }
+            },
+            "required": ["symbol"]
+        }
+    ),
+    client_call("get_quote", "symbol"),
+    ttl=TTL_REALTIME,
+    priority=INTERACTIVE,
+    presets=QUOTE_PRESETS
+)
+
+register(
+    Tool(
+        name="get_quotes_batch",
+        description="Get real-time quotes for many stock symbols in one call, returned as a single table",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbols": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Stock ticker symbols (e.g., ['AAPL', 'MSFT', 'NVDA'])"
+                }
+            },
+            "required": ["symbols"]
+        }
+    ),
+    get_quotes_batch,
+    ttl=TTL_REALTIME,
+    priority=INTERACTIVE,
+    presets=QUOTE_PRESETS
+)
 
-    return None
+register(
+    Tool(
+        name="get_historical_chart",
+        description="Get intraday historical price data for a symbol with various time intervals (use get_historical_price for daily end-of-day data)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Stock ticker symbol"
+                },
+                "interval": {
+                    "type": "string",
+                    "description": "Time interval: '1min', '5min', '15min', '30min', '1hour', '4hour'",
+                    "default": "1hour"
+                },
+                "from_date": {
+                    "type": "string",
+                    "description": "Start date in YYYY-MM-DD format"
+                },
+                "to_date": {
+                    "type": "string",
+                    "description": "End date in YYYY-MM-DD format"
+                }
+            },
+            "required": ["symbol"]
+        }
+    ),
+    get_historical_chart,
+    ttl=TTL_SHORT,
+    priority=intraday_priority,
+    presets=BAR_PRESETS
+)
+
+register(
+    Tool(
+        name="get_historical_price",
+        description="Get daily historical price data for a symbol with different price adjustment types",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "Stock ticker symbol"
+                },
+                "price_type": {
+                    "type": "string",
+                    "description": "Price type: 'full', 'light', 'non-split-adjusted', 'dividend-adjusted'",
+                    "default": "full"
+                },
+                "from_date": {
+                    "type": "string",
+                    "description": "Start date in YYYY-MM-DD format"
+                },
+                "to_date": {
+                    "type": "string",
+                    "description": "End date in YYYY-MM-DD format"
+                },
+                "timeseries": {
+                    "type": "number",
+                    "description": "Number of days to retrieve"
+                }
+            },
+            "required": ["symbol"]
+        }
+    ),
+    get_historical_price,
+    ttl=TTL_MEDIUM,
+    presets=BAR_PRESETS
+)
+
+register(
+    Tool(
+        name="get_industry_pe",
+        description="Get price-to-earnings ratios for industries on a specific date",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "date": {
+                    "type": "string",
+                    "description": "Date in YYYY-MM-DD format"
+                },
+                "exchange": {
+                    "type": "string",
+                    "description": "Stock exchange (e.g., 'NASDAQ', 'NYSE')"
+                },
+                "industry": {
+                    "type": "string",
+                    "description": "Specific industry to filter by"
+                }
+            },
+            "required": ["date"]
+        }
+    ),
+    client_call("get_industry_pe", date=REQUIRED, exchange=None, industry=None),
+    ttl=TTL_MEDIUM
+)
+
+register(
+    Tool(
+        name="get_sector_pe",
+        description="Get price-to-earnings ratios for sectors on a specific date",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "date": {
+                    "type": "string",
+                    "description": "Date in YYYY-MM-DD format"
+                },
+                "exchange": {
+                    "type": "string",
+                    "description": "Stock exchange (e.g., 'NASDAQ', 'NYSE')"
+                },
+                "sector": {
+                    "type": "string",
+                    "description": "Specific sector to filter by"
+                }
+            },
+            "required": ["date"]
+        }
+    ),
+    client_call("get_sector_pe", date=REQUIRED, exchange=None, sector=None),
+    ttl=TTL_MEDIUM
+)
+
+register(
+    Tool(
+        name="get_industry_performance",
+        description="Get daily performance data for industries showing average percentage changes",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "date": {
+                    "type": "string",
+                    "description": "Date in YYYY-MM-DD format"
+                },
+                "exchange": {
+                    "type": "string",
+                    "description": "Stock exchange to filter by"
+                },
+                "industry": {
+                    "type": "string",
+                    "description": "Specific industry to filter by"
+                }
+            },
+            "required": ["date"]
+        }
+    ),
+    client_call(
+        "get_industry_performance", date=REQUIRED, exchange=None, industry=None
+    ),
+    ttl=TTL_MEDIUM
+)
+
+register(
+    Tool(
+        name="get_historical_sector_pe",
+        description="Get historical price-to-earnings ratios for a sector over a date range",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sector": {
+                    "type": "string",
+                    "description": "Sector name (e.g., 'Energy', 'Technology')"
+                },
+                "exchange": {
+                    "type": "string",
+                    "description": "Stock exchange to filter by"
+                },
+                "from_date": {
+                    "type": "string",
+                    "description": "Start date in YYYY-MM-DD format"
+                },
+                "to_date": {
+                    "type": "string",
+                    "description": "End date in YYYY-MM-DD format"
+                }
+            },
+            "required": ["sector"]
+        }
+    ),
+    get_historical_sector_pe,
+    ttl=TTL_MEDIUM
+)
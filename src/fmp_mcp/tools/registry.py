@@ -0,0 +1,215 @@
+"""Declarative registry of MCP tools."""
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from mcp.types import ListToolsResult, Tool
+
+from ..cache import DEFAULT_TTL
+from ..executor import call_client
+from ..pagination import page_schema
+from ..ratelimit import NORMAL
+
+Handler = Callable[[Any, dict[str, Any]], Awaitable[Any]]
+
+# Marks a keyword argument of client_call as required
+REQUIRED = object()
+
+# Tool argument selecting the columns to return, added to every tool
+FIELDS_ARGUMENT = "fields"
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """A registered tool: MCP definition, handler, cache TTL, rate-limit lane and field presets.
+
+    A ``ttl`` of 0 keeps the tool's responses out of the response cache, and
+    handlers registered with ``uses_client=False`` are passed None instead of
+    an FMP client, so they run without an API key.
+    """
+
+    tool: Tool
+    handler: Handler
+    ttl: float = DEFAULT_TTL
+    priority: int | Callable[[dict[str, Any]], int] = NORMAL
+    presets: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    page_size: int | None = None
+    uses_client: bool = True
+
+    @property
+    def cached(self) -> bool:
+        """Whether responses of this tool go through the response cache."""
+        return self.ttl > 0
+
+    @property
+    def name(self) -> str:
+        return self.tool.name
+
+    def priority_for(self, arguments: dict[str, Any]) -> int:
+        """Get the rate-limit lane for a call with these arguments."""
+        return self.priority(arguments) if callable(self.priority) else self.priority
+
+    def fields_for(self, arguments: dict[str, Any]) -> list[str] | None:
+        """Get the requested columns from a preset name, field list or comma-separated string."""
+        value = arguments.get(FIELDS_ARGUMENT)
+        if not value:
+            return None
+        if isinstance(value, str):
+            if value in self.presets:
+                return list(self.presets[value])
+            value = value.split(",")
+        return [name.strip() for name in value if name.strip()] or None
+
+
+def fields_schema(presets: dict[str, tuple[str, ...]]) -> dict[str, Any]:
+    """Build the JSON schema of the ``fields`` argument."""
+    description = (
+        "Optional columns to return, as a list of field names or a comma-separated string"
+    )
+    if presets:
+        description += "; or a preset: " + "; ".join(
+            f"'{name}' ({', '.join(columns)})" for name, columns in presets.items()
+        )
+    return {
+        "type": ["array", "string"],
+        "items": {"type": "string"},
+        "description": description,
+    }
+
+
+def _columns(data: Any, columns: set[str], in_list: bool = False) -> bool:
+    """Add the column names of a result's rows to ``columns``; return whether it has rows."""
+    if isinstance(data, list):
+        found = False
+        for item in data:
+            found = _columns(item, columns, in_list=True) or found
+        return found
+    if hasattr(data, "model_dump"):
+        columns.update(type(data).model_fields)
+        return True
+    if isinstance(data, dict):
+        columns.update(data)
+        nested = [value for value in data.values() if isinstance(value, (list, dict))]
+        found = in_list or not nested
+        for value in nested:
+            found = _columns(value, columns) or found
+        return found
+    return False
+
+
+def check_fields(data: Any, fields: list[str], presets: dict[str, tuple[str, ...]]) -> None:
+    """Raise ValueError if a requested field is not a column of any row in the result.
+
+    Results without rows are not checked. A misspelt preset name arrives here as
+    a field, so the message lists the tool's presets too.
+    """
+    columns: set[str] = set()
+    if not _columns(data, columns):
+        return
+    unknown = [name for name in fields if name not in columns]
+    if unknown:
+        message = f"Unknown field(s): {', '.join(unknown)}"
+        if presets:
+            message += f"; presets are {', '.join(presets)}"
+        raise ValueError(message)
+
+
+def project(data: Any, fields: list[str]) -> Any:
+    """Keep only ``fields`` in each row of a result, in that order.
+
+    Rows holding none of the fields, such as per-symbol errors, are left as they
+    are, and envelopes like ``{"quotes": [...], "errors": [...]}`` are projected
+    inside.
+    """
+    if isinstance(data, list):
+        return [project(item, fields) for item in data]
+    if hasattr(data, "model_dump"):
+        if not any(name in type(data).model_fields for name in fields):
+            return data
+        row = {}
+        for name in fields:
+            value = getattr(data, name, None)
+            row[name] = value.model_dump() if hasattr(value, "model_dump") else value
+        return row
+    if isinstance(data, dict):
+        if any(name in data for name in fields):
+            return {name: data.get(name) for name in fields}
+        return {key: project(value, fields) for key, value in data.items()}
+    return data
+
+
+# All registered tools by name, in registration order
+TOOLS: dict[str, ToolSpec] = {}
+
+# tools/list result, built once on first use and frozen afterwards
+_catalog: ListToolsResult | None = None
+
+
+def register(
+    tool: Tool,
+    handler: Handler,
+    *,
+    ttl: float = DEFAULT_TTL,
+    priority: int | Callable[[dict[str, Any]], int] = NORMAL,
+    presets: dict[str, tuple[str, ...]] | None = None,
+    page_size: int | None = None,
+    uses_client: bool = True,
+) -> ToolSpec:
+    """Register a tool with its handler and policies, adding the ``fields`` argument.
+
+    Tools given a ``page_size`` return list results a page at a time and also
+    take ``cursor`` and ``page_size`` arguments.
+    """
+    if tool.name in TOOLS:
+        raise ValueError(f"Tool already registered: {tool.name}")
+    if _catalog is not None:
+        raise RuntimeError(f"Cannot register {tool.name}: the tool catalog is already built")
+
+    presets = dict(presets or {})
+    schema = dict(tool.inputSchema)
+    schema["properties"] = {
+        **schema.get("properties", {}),
+        FIELDS_ARGUMENT: fields_schema(presets),
+        **(page_schema(page_size) if page_size else {}),
+    }
+    tool = tool.model_copy(update={"inputSchema": schema})
+
+    spec = ToolSpec(
+        tool=tool,
+        handler=handler,
+        ttl=ttl,
+        priority=priority,
+        presets=presets,
+        page_size=page_size,
+        uses_client=uses_client,
+    )
+    TOOLS[tool.name] = spec
+    return spec
+
+
+def get_catalog() -> ListToolsResult:
+    """Get the tools/list result, building it from the registry on first use."""
+    global _catalog
+
+    if _catalog is None:
+        _catalog = ListToolsResult(tools=[spec.tool for spec in TOOLS.values()])
+
+    return _catalog
+
+
+def client_call(method: str, *args: str, **kwargs: Any) -> Handler:
+    """Build a handler that forwards tool arguments to an FMP client method.
+
+    ``args`` name required tool arguments passed positionally. ``kwargs`` map
+    keyword parameters (named like the tool arguments) to their defaults, with
+    REQUIRED marking arguments that must be present.
+    """
+    async def handler(client: Any, arguments: dict[str, Any]) -> Any:
+        positional = [arguments[name] for name in args]
+        keyword = {
+            name: arguments[name] if default is REQUIRED else arguments.get(name, default)
+            for name, default in kwargs.items()
+        }
+        return await call_client(getattr(client, method), *positional, **keyword)
+
+    return handler
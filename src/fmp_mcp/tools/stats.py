@@ -0,0 +1,29 @@
+"""Server introspection MCP tools."""
+
+from typing import Any
+from mcp.types import Tool
+
+from ..metrics import component_stats, get_metrics
+from ..ratelimit import INTERACTIVE
+from .registry import register
+
+
+async def server_stats(client: Any, arguments: Any) -> Any:
+    """Report per-tool metrics and the state of the cache, rate limiter and indexes."""
+    return {"tools": get_metrics().tool_summary(), **await component_stats()}
+
+
+register(
+    Tool(
+        name="fmp_server_stats",
+        description="Report this server's per-tool call counts, latency percentiles, response sizes, cache hit rate, rate-limit queueing and upstream circuit state",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    server_stats,
+    ttl=0,
+    priority=INTERACTIVE,
+    uses_client=False
+)
@@ -0,0 +1,146 @@
+"""Opt-in tracing of tool-call phases as OTLP/JSON spans written to a file.
+
+Each finished tool call is appended as one line holding an OTLP
+ExportTraceServiceRequest, the format read by the OpenTelemetry Collector's
+``otlpjsonfile`` receiver, so traces can be forwarded to any tracing backend.
+"""
+
+import contextlib
+import contextvars
+import json
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+from .store import env_path
+
+SERVICE_NAME = "fmp-mcp"
+
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar(
+    "fmp_current_span", default=None
+)
+
+
+def _attribute(key: str, value: Any) -> dict[str, Any]:
+    """Encode one attribute as an OTLP key/value pair."""
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+class Span:
+    """One timed phase of a tool call."""
+
+    def __init__(self, name: str, parent: "Span | None", attributes: dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent is not None else ""
+        # Spans of one trace share a list, exported when the root span ends
+        self.trace: list[Span] = parent.trace if parent is not None else []
+        self.attributes = attributes
+        self.start = time.time_ns()
+        self.end = 0
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def to_otlp(self) -> dict[str, Any]:
+        """Encode the span as an OTLP/JSON span."""
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start),
+            "endTimeUnixNano": str(self.end),
+            "attributes": [_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+
+
+class Tracer:
+    """Records spans and appends each finished trace to ``path``."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name: str, attributes: dict[str, Any]) -> Iterator[Span]:
+        """Time a block as a child of the current span, or as a new trace's root."""
+        parent = _current_span.get()
+        span = Span(name, parent, attributes)
+        span.trace.append(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as error:
+            span.error = f"{type(error).__name__}: {error}"
+            raise
+        finally:
+            span.end = time.time_ns()
+            _current_span.reset(token)
+            if parent is None:
+                self.export(span.trace)
+
+    def export(self, spans: list[Span]) -> None:
+        """Append one trace as an OTLP ExportTraceServiceRequest line."""
+        request = {"resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{
+                "scope": {"name": "fmp_mcp"},
+                "spans": [span.to_otlp() for span in spans],
+            }],
+        }]}
+        line = json.dumps(request, separators=(",", ":")) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as file:
+            file.write(line)
+
+
+def span(name: str, **attributes: Any) -> contextlib.AbstractContextManager[Span | None]:
+    """Time a block as a span when tracing is enabled; a no-op otherwise."""
+    tracer = get_tracer()
+    if tracer is None:
+        return contextlib.nullcontext()
+    return tracer.span(name, attributes)
+
+
+def set_attribute(key: str, value: Any) -> None:
+    """Attach an attribute to the current span, if any."""
+    current = _current_span.get()
+    if current is not None:
+        current.set_attribute(key, value)
+
+
+def current_trace_id() -> str | None:
+    """Get the trace ID of the current span, if any."""
+    current = _current_span.get()
+    return current.trace_id if current is not None else None
+
+
+# Global tracer instance; False until the environment has been read
+_tracer: Tracer | None | bool = False
+
+
+def get_tracer() -> Tracer | None:
+    """Get the tracer writing to FMP_TRACE_FILE, or None when tracing is off."""
+    global _tracer
+
+    if _tracer is False:
+        path = env_path("FMP_TRACE_FILE")
+        _tracer = Tracer(path) if path else None
+
+    return _tracer
@@ -0,0 +1,145 @@
+"""Tests for the async FMP transport against a local stub HTTP server."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from fmp import FMPAPIError, FMPAuthError
+
+from fmp_mcp.async_client import AsyncFMPClient
+
+
+class StubFMPHandler(BaseHTTPRequestHandler):
+    """Serve canned FMP responses and record every request."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.server.requests.append((url.path, query))
+        self.server.peers.add(self.client_address)
+
+        if query.get("apikey") != "test_key":
+            status, body = 401, {"Error Message": "Invalid API KEY."}
+        elif url.path == "/stable/quote":
+            status, body = 200, [{"symbol": query["symbol"], "price": 150.0}]
+        elif url.path == "/stable/error":
+            status, body = 200, {"Error Message": "Limit Reach"}
+        else:
+            status, body = 200, []
+
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Run a stub FMP server on a free local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubFMPHandler)
+    server.requests = []
+    server.peers = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(server, api_key="test_key"):
+    host, port = server.server_address
+    return AsyncFMPClient(api_key=api_key, base_url=f"http://{host}:{port}/stable")
+
+
+@pytest.mark.asyncio
+async def test_get_quote(stub_server):
+    """Test that quotes are fetched and decoded as raw JSON."""
+    client = make_client(stub_server)
+    try:
+        result = await client.get_quote("AAPL")
+    finally:
+        await client.aclose()
+
+    assert result == [{"symbol": "AAPL", "price": 150.0}]
+
+
+@pytest.mark.asyncio
+async def test_query_parameters_are_camel_cased(stub_server):
+    """Test that snake_case arguments map to FMP query parameters."""
+    client = make_client(stub_server)
+    try:
+        await client.get_historical_chart("AAPL", "5min", from_date="2024-01-01")
+        await client.screen_stocks(market_cap_more_than=1e9, sector="Technology")
+    finally:
+        await client.aclose()
+
+    chart_path, chart_query = stub_server.requests[0]
+    assert chart_path == "/stable/historical-chart/5min"
+    assert chart_query["from"] == "2024-01-01"
+    assert "to" not in chart_query
+
+    _, screen_query = stub_server.requests[1]
+    assert screen_query["marketCapMoreThan"] == "1000000000.0"
+    assert screen_query["sector"] == "Technology"
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused(stub_server):
+    """Test that sequential requests share one keep-alive connection."""
+    client = make_client(stub_server)
+    try:
+        for symbol in ("AAPL", "MSFT", "NVDA"):
+            await client.get_quote(symbol)
+    finally:
+        await client.aclose()
+
+    assert len(stub_server.requests) == 3
+    assert len(stub_server.peers) == 1
+
+
+@pytest.mark.asyncio
+async def test_auth_error(stub_server):
+    """Test that rejected API keys raise FMPAuthError."""
+    client = make_client(stub_server, api_key="bad_key")
+    try:
+        with pytest.raises(FMPAuthError):
+            await client.get_quote("AAPL")
+    finally:
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_error_message_body(stub_server):
+    """Test that FMP error payloads raise FMPAPIError."""
+    client = make_client(stub_server)
+    try:
+        with pytest.raises(FMPAPIError, match="Limit Reach"):
+            await client._get("error")
+    finally:
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_large_bodies_are_decoded_while_streaming(stub_server, monkeypatch):
+    """Test that bodies over the streaming threshold decode to the same rows."""
+    import fmp_mcp.async_client as async_client
+
+    monkeypatch.setattr(async_client, "STREAM_MIN_BYTES", 0)
+    client = make_client(stub_server)
+    try:
+        quote = await client.get_quote("AAPL")
+        with pytest.raises(FMPAPIError, match="Limit Reach"):
+            await client._get("error")
+    finally:
+        await client.aclose()
+
+    assert quote == [{"symbol": "AAPL", "price": 150.0}]
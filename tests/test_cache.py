@@ -0,0 +1,150 @@
+"""Tests for the tool response cache."""
+
+import asyncio
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from fmp_mcp.cache import (
+    ResponseCache,
+    SQLiteResponseCache,
+    cached_response,
+    make_cache_key,
+    store_response,
+)
+
+
+def test_cache_key_normalizes_arguments():
+    """Test that argument order and None values do not change the key."""
+    key1 = make_cache_key("get_income_statement", {"symbol": "AAPL", "limit": 5})
+    key2 = make_cache_key("get_income_statement", {"limit": 5, "symbol": "AAPL", "period": None})
+    assert key1 == key2
+    assert key1 != make_cache_key("get_balance_sheet", {"symbol": "AAPL", "limit": 5})
+
+
+def test_cache_hit_and_miss_counters():
+    """Test that lookups are counted as hits and misses."""
+    cache = ResponseCache()
+
+    assert cache.get("get_quote", {"symbol": "AAPL"}) is None
+    cache.set("get_quote", {"symbol": "AAPL"}, "symbol: AAPL", ttl=60)
+    assert cache.get("get_quote", {"symbol": "AAPL"}) == "symbol: AAPL"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_cache_entries_expire():
+    """Test that entries are dropped once their TTL has passed."""
+    cache = ResponseCache(max_stale=0)
+
+    with patch("fmp_mcp.cache.time.monotonic", return_value=1000.0):
+        cache.set("get_quote", {"symbol": "AAPL"}, "price: 150", ttl=15)
+    with patch("fmp_mcp.cache.time.monotonic", return_value=1010.0):
+        assert cache.get("get_quote", {"symbol": "AAPL"}) == "price: 150"
+    with patch("fmp_mcp.cache.time.monotonic", return_value=1016.0):
+        assert cache.get("get_quote", {"symbol": "AAPL"}) is None
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_keeps_expired_entries_to_serve_stale():
+    """Test that expired entries stay available as stale until max_stale passes."""
+    cache = ResponseCache(max_stale=60)
+
+    with patch("fmp_mcp.cache.time.monotonic", return_value=1000.0):
+        cache.set("get_quote", {"symbol": "AAPL"}, "price: 150", ttl=15)
+    with patch("fmp_mcp.cache.time.monotonic", return_value=1030.0):
+        assert cache.get("get_quote", {"symbol": "AAPL"}) is None
+        assert cache.get_stale("get_quote", {"symbol": "AAPL"}) == ("price: 150", 15.0)
+    with patch("fmp_mcp.cache.time.monotonic", return_value=1080.0):
+        assert cache.get_stale("get_quote", {"symbol": "AAPL"}) is None
+
+
+def test_cache_evicts_least_recently_used_by_bytes():
+    """Test that the byte budget evicts the least recently used entry."""
+    cache = ResponseCache(max_bytes=20)
+
+    cache.set("get_quote", {"symbol": "A"}, "x" * 8)
+    cache.set("get_quote", {"symbol": "B"}, "y" * 8)
+    cache.get("get_quote", {"symbol": "A"})
+    cache.set("get_quote", {"symbol": "C"}, "z" * 8)
+
+    assert cache.get("get_quote", {"symbol": "A"}) is not None
+    assert cache.get("get_quote", {"symbol": "B"}) is None
+    assert cache.get("get_quote", {"symbol": "C"}) is not None
+    assert cache.stats()["bytes"] == 16
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_skips_oversized_and_uncached_tools():
+    """Test that oversized responses and zero-TTL entries are not stored."""
+    cache = ResponseCache(max_bytes=4)
+
+    cache.set("get_quote", {"symbol": "AAPL"}, "too large", ttl=60)
+    cache.set("get_crypto_quote", {"symbol": "BTCUSD"}, "ok", ttl=0)
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    """Test that separate SQLite cache instances (as in worker processes) share entries."""
+    path = tmp_path / "responses.sqlite3"
+    writer = SQLiteResponseCache(path)
+    reader = SQLiteResponseCache(path)
+
+    writer.set("get_quote", {"symbol": "AAPL"}, "price: 150", ttl=60)
+    assert reader.get("get_quote", {"symbol": "AAPL"}) == "price: 150"
+    assert reader.get("get_quote", {"symbol": "MSFT"}) is None
+
+    with patch("fmp_mcp.cache.time.time", return_value=10**10):
+        assert reader.get("get_quote", {"symbol": "AAPL"}) is None
+    assert reader.stats()["hits"] == 1
+
+
+def test_sqlite_cache_evicts_nearest_expiry_by_bytes(tmp_path):
+    """Test that the shared byte budget evicts the entry closest to expiry."""
+    cache = SQLiteResponseCache(tmp_path / "responses.sqlite3", max_bytes=20)
+
+    cache.set("get_quote", {"symbol": "A"}, "x" * 8, ttl=10)
+    cache.set("get_quote", {"symbol": "B"}, "y" * 8, ttl=600)
+    cache.set("get_quote", {"symbol": "B"}, "y" * 8, ttl=600)
+    cache.set("get_quote", {"symbol": "C"}, "z" * 8, ttl=300)
+
+    assert cache.get("get_quote", {"symbol": "A"}) is None
+    assert cache.get("get_quote", {"symbol": "B"}) is not None
+    assert cache.get("get_quote", {"symbol": "C"}) is not None
+    assert cache.stats()["bytes"] == 16
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_locked_sqlite_cache_does_not_block_the_event_loop(tmp_path, monkeypatch):
+    """Test that a store blocked by another process's lock runs off the loop and is skipped."""
+    import fmp_mcp.cache as cache_module
+
+    path = tmp_path / "responses.sqlite3"
+    cache = SQLiteResponseCache(path)
+    monkeypatch.setattr(cache_module, "_response_cache", cache)
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.ensure_future(ticker())
+    try:
+        await store_response("get_quote", {"symbol": "AAPL"}, "price: 150", 60)
+    finally:
+        task.cancel()
+        other.execute("ROLLBACK")
+
+    assert ticks > 10
+    assert await cached_response("get_quote", {"symbol": "AAPL"}) is None
@@ -0,0 +1,92 @@
+"""Tests for the columnar TOON encoder."""
+
+import math
+from datetime import date
+
+import toon
+from pydantic import BaseModel
+
+from fmp_mcp import encoding
+from fmp_mcp.encoding import encode_table, encode_table_prefix
+
+
+class Bar(BaseModel):
+    date: str
+    open: float
+    volume: int
+    adjusted: bool | None = None
+
+
+def test_encode_table_matches_toon_for_dicts():
+    """Test that tricky cell values are quoted and formatted like toon.encode."""
+    rows = [
+        {"symbol": "AAPL", "name": "Apple, Inc.", "price": 150.0, "change": -0.5, "note": None},
+        {"symbol": "true", "name": " padded ", "price": 1e-7, "change": 12, "note": "a:b"},
+        {"symbol": "123", "name": "", "price": math.nan, "change": -0.0, "note": "- dash"},
+        {"symbol": "BRK.B", "name": 'say "hi"', "price": 1e22, "change": True, "note": "x\ny"},
+    ]
+
+    assert encode_table(rows) == toon.encode(rows)
+
+
+def test_encoded_cells_match_toon_one_by_one():
+    """Test each fast-path string and float cell against toon.encode of the same column."""
+    values = [
+        "AAPL", "BRK.B", "Apple Inc", "(note)", "/path", "&co", "a b", "trailing ", "\ttab",
+        "null", "True", "1.5", "-1", "05", "1e5", "-", "- x", "#", "a,b", "a|b", "[x]", "{x}",
+        "a:b", "é", "日本", "x\\y", "",
+        0.0, -0.0, 1.0, -2.5, 0.1, 1e-7, 1e21, 1.5e300, 123456789.125, math.inf, -math.inf,
+    ]
+    for value in values:
+        rows = [{"v": value}, {"v": value}]
+        assert encode_table(rows) == toon.encode(rows), value
+
+def test_encode_table_reads_models_without_dumping():
+    """Test that pydantic rows encode like their model_dump output."""
+    rows = [
+        Bar(date="2024-01-02", open=187.15, volume=1000),
+        Bar(date="2024-01-03", open=184.22, volume=2000, adjusted=True),
+    ]
+
+    assert encode_table(rows) == toon.encode([row.model_dump() for row in rows])
+
+
+def test_encode_table_normalizes_dates():
+    """Test that date cells are written as ISO strings."""
+    rows = [{"date": date(2024, 1, 2), "close": 1.5}]
+
+    assert encode_table(rows) == toon.encode(rows)
+
+
+def test_encode_table_falls_back_for_irregular_rows():
+    """Test that non-uniform or nested rows are left to the generic encoder."""
+    assert encode_table([]) is None
+    assert encode_table([{"a": 1}, {"b": 2}]) is None
+    assert encode_table([{"a": 1}, {"a": 1, "b": 2}]) is None
+    assert encode_table([{"a": {"b": 1}}]) is None
+    assert encode_table([{"a": [1, 2]}]) is None
+    assert encode_table([{}]) is None
+    assert encode_table(["AAPL", "MSFT"]) is None
+
+
+def test_encode_table_prefix_stops_at_the_byte_limit(monkeypatch):
+    """Test that batched encoding matches toon and keeps only rows under the limit."""
+    monkeypatch.setattr(encoding, "BATCH_ROWS", 7)
+    rows = [
+        {"date": f"2024-01-{i % 28 + 1:02d}", "close": i + 0.5, "note": "é"} for i in range(50)
+    ]
+    assert encode_table_prefix(rows, None) == (toon.encode(rows), 50)
+
+    text, count = encode_table_prefix(rows, 400)
+    assert len(text.encode("utf-8")) <= 400
+    assert 0 < count < 50
+    assert text == toon.encode(rows[:count])
+
+
+def test_encode_table_prefix_ignores_rows_past_the_limit(monkeypatch):
+    """Test that irregular rows in batches after the cut do not force the generic encoder."""
+    monkeypatch.setattr(encoding, "BATCH_ROWS", 10)
+    rows = [{"a": i} for i in range(100)] + [{"b": 1}]
+    text, count = encode_table_prefix(rows, 64)
+    assert text == toon.encode(rows[:count])
+    assert encode_table_prefix(rows, None) is None
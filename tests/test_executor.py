@@ -0,0 +1,76 @@
+"""Tests for the blocking-call worker pool."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+
+import fmp_mcp.executor as executor_module
+from fmp_mcp.executor import call_client, run_blocking
+
+
+@pytest.fixture(autouse=True)
+def fresh_executor():
+    """Give each test its own worker pool."""
+    executor_module.shutdown_executor()
+    yield
+    executor_module.shutdown_executor()
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_runs_off_event_loop():
+    """Test that blocking calls run in a worker thread."""
+    loop_thread = threading.get_ident()
+    worker_thread = await run_blocking(threading.get_ident)
+    assert worker_thread != loop_thread
+
+
+@pytest.mark.asyncio
+async def test_call_client_passes_arguments():
+    """Test that call_client forwards positional and keyword arguments."""
+    def method(symbol, limit=5):
+        return f"{symbol}:{limit}"
+
+    assert await call_client(method, "AAPL", limit=3) == "AAPL:3"
+
+
+@pytest.mark.asyncio
+async def test_blocking_calls_run_concurrently():
+    """Test that several slow calls overlap instead of running serially."""
+    with patch.dict('os.environ', {'FMP_MAX_WORKERS': '4'}):
+        start = time.perf_counter()
+        await asyncio.gather(*(run_blocking(time.sleep, 0.2) for _ in range(4)))
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.6
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_timeout():
+    """Test that calls exceeding FMP_CALL_TIMEOUT raise TimeoutError."""
+    with patch.dict('os.environ', {'FMP_CALL_TIMEOUT': '0.05'}):
+        with pytest.raises(TimeoutError, match="timed out"):
+            await run_blocking(time.sleep, 0.5)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_is_dropped_before_it_starts():
+    """Test that cancelling a queued call prevents it from running."""
+    started = threading.Event()
+    ran = []
+
+    with patch.dict('os.environ', {'FMP_MAX_WORKERS': '1'}):
+        blocker = asyncio.ensure_future(run_blocking(started.wait, 1))
+        queued = asyncio.ensure_future(run_blocking(ran.append, "queued"))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        await asyncio.sleep(0.05)
+        started.set()
+        await blocker
+
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+    assert ran == []
@@ -0,0 +1,219 @@
+"""Tests for the persistent historical data store."""
+
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+from unittest.mock import patch
+
+import fmp_mcp.store as store_module
+from fmp_mcp.history import fetch_date_range, fetch_statements, missing_ranges
+from fmp_mcp.store import HistoryStore, env_path, merge_spans
+
+
+@pytest.fixture(autouse=True)
+def temp_store(tmp_path):
+    """Point the shared store at a temporary database."""
+    store_module._history_store = None
+    with patch.dict('os.environ', {'FMP_STORE_PATH': str(tmp_path / "store.sqlite3")}):
+        yield
+    store_module._history_store = None
+
+
+class FakeUpstream:
+    """Serve one daily bar per calendar day and record requested windows."""
+
+    def __init__(self):
+        self.calls = []
+        self.scale = 1.0
+
+    async def __call__(self, from_date, to_date):
+        self.calls.append((from_date, to_date))
+        day, end = date.fromisoformat(from_date), date.fromisoformat(to_date)
+        rows = []
+        while day <= end:
+            rows.append({"date": day.isoformat(), "close": day.day * self.scale})
+            day += timedelta(days=1)
+        return list(reversed(rows))
+
+
+def test_merge_spans():
+    """Test that overlapping and adjacent spans are merged."""
+    spans = [
+        ("2024-01-05", "2024-01-10"),
+        ("2024-01-01", "2024-01-06"),
+        ("2024-01-11", "2024-01-12"),
+        ("2024-02-01", "2024-02-02"),
+    ]
+    assert merge_spans(spans) == [("2024-01-01", "2024-01-12"), ("2024-02-01", "2024-02-02")]
+
+
+def test_missing_ranges():
+    """Test the uncovered gap computation."""
+    spans = [("2020-01-01", "2020-12-31"), ("2022-01-01", "2022-12-31")]
+    assert missing_ranges(spans, "2020-03-01", "2020-06-30") == []
+    assert missing_ranges(spans, "2019-01-01", "2020-06-30") == [("2019-01-01", "2019-12-31")]
+    assert missing_ranges(spans, "2019-06-01", "2023-01-31") == [
+        ("2019-06-01", "2019-12-31"),
+        ("2021-01-01", "2021-12-31"),
+        ("2023-01-01", "2023-01-31"),
+    ]
+    assert missing_ranges([], "2020-01-01", "2020-01-31") == [("2020-01-01", "2020-01-31")]
+
+
+def test_store_persists_across_instances(tmp_path):
+    """Test that rows and spans survive reopening the database."""
+    path = tmp_path / "shared.sqlite3"
+    HistoryStore(path).put_rows("eod-full", "AAPL", [{"date": "2024-01-02", "close": 1.0}],
+                                [("2024-01-01", "2024-01-31")])
+
+    reopened = HistoryStore(path)
+    assert reopened.get_spans("eod-full", "AAPL") == [("2024-01-01", "2024-01-31")]
+    assert reopened.get_rows("eod-full", "AAPL") == [{"date": "2024-01-02", "close": 1.0}]
+
+
+def test_env_path_expands_the_home_directory(tmp_path):
+    """Test that configured paths starting with ~ resolve under the home directory."""
+    with patch.dict('os.environ', {'HOME': str(tmp_path), 'FMP_STORE_PATH': "~/store.sqlite3"}):
+        assert env_path("FMP_STORE_PATH") == tmp_path / "store.sqlite3"
+    with patch.dict('os.environ', {'FMP_STORE_PATH': ""}):
+        assert env_path("FMP_STORE_PATH", tmp_path) == tmp_path
+
+@pytest.mark.asyncio
+async def test_fetch_date_range_only_fetches_missing_dates():
+    """Test that a widened window only requests the uncovered dates."""
+    upstream = FakeUpstream()
+
+    first = await fetch_date_range("eod-full", "AAPL", upstream, "2020-01-01", "2020-01-31")
+    assert len(first) == 31
+    assert first[0]["date"] == "2020-01-31"
+
+    second = await fetch_date_range("eod-full", "AAPL", upstream, "2019-12-01", "2020-01-31")
+    assert len(second) == 62
+    assert upstream.calls[1] == ("2019-12-01", "2019-12-31")
+
+    third = await fetch_date_range("eod-full", "AAPL", upstream, "2019-12-15", "2020-01-15")
+    assert len(third) == 32
+    assert len(upstream.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_date_range_fetches_each_gap_and_stitches():
+    """Test that only the gap segments are fetched and results are stitched in order."""
+    upstream = FakeUpstream()
+
+    await fetch_date_range("eod-full", "AAPL", upstream, "2020-01-01", "2020-12-31")
+    await fetch_date_range("eod-full", "AAPL", upstream, "2022-01-01", "2022-12-31")
+    rows = await fetch_date_range("eod-full", "AAPL", upstream, "2019-12-01", "2023-01-31")
+
+    assert sorted(upstream.calls[2:]) == [
+        ("2019-12-01", "2019-12-31"),
+        ("2021-01-01", "2021-12-31"),
+        ("2023-01-01", "2023-01-31"),
+    ]
+    dates = [row["date"] for row in rows]
+    assert dates == sorted(dates, reverse=True)
+    assert len(dates) == len(set(dates)) == (date(2023, 1, 31) - date(2019, 12, 1)).days + 1
+
+    await fetch_date_range("eod-full", "AAPL", upstream, "2019-12-01", "2023-01-31")
+    assert len(upstream.calls) == 5
+
+
+@pytest.mark.asyncio
+async def test_gap_segments_are_fetched_within_the_fanout_limit():
+    """Test that a window with many gaps never has more fetches in flight than allowed."""
+    upstream = FakeUpstream()
+    for day in range(1, 21, 2):
+        stored_day = f"2020-01-{day:02}"
+        await fetch_date_range("eod-full", "AAPL", upstream, stored_day, stored_day)
+    in_flight, peak = 0, 0
+
+    async def fetch(from_date, to_date):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return await upstream(from_date, to_date)
+
+    with patch.dict('os.environ', {'FMP_FANOUT_CONCURRENCY': '2'}):
+        rows = await fetch_date_range("eod-full", "AAPL", fetch, "2020-01-01", "2020-01-31")
+
+    assert len(upstream.calls) == 10 + 10
+    assert peak == 2
+    assert len(rows) == 31
+
+@pytest.mark.asyncio
+async def test_adjusted_series_are_refetched_after_a_revision():
+    """Test that a changed stored bar (e.g. after a split) drops the key's stored rows."""
+    upstream = FakeUpstream()
+    window = ("2020-01-01", "2020-01-31")
+
+    await fetch_date_range("eod-full", "AAPL", upstream, *window, adjusted=True)
+    await fetch_date_range("eod-full", "AAPL", upstream, *window, adjusted=True)
+    assert upstream.calls[1] == ("2020-01-31", "2020-01-31")
+    assert len(upstream.calls) == 2
+
+    upstream.scale = 0.25
+    rows = await fetch_date_range("eod-full", "AAPL", upstream, *window, adjusted=True)
+    assert upstream.calls[2:] == [("2020-01-31", "2020-01-31"), window]
+    assert {row["close"] for row in rows} == {day * 0.25 for day in range(1, 32)}
+
+
+@pytest.mark.asyncio
+async def test_capped_segments_only_cover_returned_rows():
+    """Test that truncated intraday windows are not marked as fully covered."""
+    calls = []
+
+    async def fetch(from_date, to_date):
+        calls.append((from_date, to_date))
+        return [{"date": "2024-03-10 15:00:00"}, {"date": "2024-03-09 09:30:00"}]
+
+    await fetch_date_range("chart-1min", "AAPL", fetch, "2024-03-01", "2024-03-10", capped=True)
+    await fetch_date_range("chart-1min", "AAPL", fetch, "2024-03-01", "2024-03-10", capped=True)
+
+    assert calls[1] == ("2024-03-01", "2024-03-09")
+
+
+@pytest.mark.asyncio
+async def test_fetch_date_range_always_fetches_recent_dates():
+    """Test that rows newer than the settle cutoff are never served from the store."""
+    upstream = FakeUpstream()
+    today = date.today()
+    start = (today - timedelta(days=10)).isoformat()
+
+    await fetch_date_range("eod-full", "AAPL", upstream, start, today.isoformat())
+    await fetch_date_range("eod-full", "AAPL", upstream, start, today.isoformat())
+
+    assert len(upstream.calls) == 2
+    assert upstream.calls[1][0] > start
+
+
+@pytest.mark.asyncio
+async def test_fetch_date_range_passes_through_without_window():
+    """Test that requests without both dates bypass the store."""
+    async def fetch(from_date, to_date):
+        return {"symbol": "AAPL", "historical": []}
+
+    assert await fetch_date_range("eod-full", "AAPL", fetch, None, None) == {
+        "symbol": "AAPL", "historical": []
+    }
+
+
+@pytest.mark.asyncio
+async def test_fetch_statements_reuses_stored_periods():
+    """Test that stored periods are served without refetching the full limit."""
+    calls = []
+    periods = [{"date": f"{year}-09-30", "revenue": year} for year in (2024, 2023, 2022)]
+
+    async def fetch(limit):
+        calls.append(limit)
+        return periods[:limit]
+
+    assert await fetch_statements("get_income_statement", "AAPL:annual", fetch, 3) == periods
+    assert await fetch_statements("get_income_statement", "AAPL:annual", fetch, 2) == periods[:2]
+    assert calls == [3]
+
+    with patch.dict('os.environ', {'FMP_STATEMENT_RECHECK': '0'}):
+        assert await fetch_statements("get_income_statement", "AAPL:annual", fetch, 3) == periods
+    assert calls == [3, 1]
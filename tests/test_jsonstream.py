@@ -0,0 +1,50 @@
+"""Tests for incremental decoding of JSON array bodies."""
+
+import json
+
+import pytest
+
+from fmp_mcp.jsonstream import JSONArrayStream
+
+
+def decode_in_chunks(body: bytes, size: int):
+    """Feed a body in chunks of ``size`` bytes and collect the result."""
+    stream = JSONArrayStream()
+    items = []
+    for start in range(0, len(body), size):
+        items.extend(stream.feed(body[start:start + size]))
+    rest = stream.close()
+    return items + rest if stream.array else rest
+
+
+def test_items_match_json_loads_at_every_chunk_size():
+    """Test that splits inside strings, nested objects and numbers decode correctly."""
+    rows = [
+        {"symbol": "A}B", "name": 'Brace }, {"x": 1} inside', "price": 12.5},
+        {"symbol": "NEST", "profile": {"ceo": "Jane", "tags": ["a", "}"]}, "price": -3},
+        {"symbol": "ÄÖ", "name": "Ünïcode", "price": 1e21},
+        {},
+    ]
+    body = b" \n" + json.dumps(rows, indent=1, ensure_ascii=False).encode() + b"\n"
+    for size in range(1, 40):
+        assert decode_in_chunks(body, size) == rows
+
+
+def test_items_are_released_before_the_body_ends():
+    """Test that complete items are returned while the rest is still arriving."""
+    stream = JSONArrayStream()
+    assert stream.feed(b'[{"a": 1}, {"a"') == [{"a": 1}]
+    assert stream.feed(b': 2}') == [{"a": 2}]
+    assert stream.feed(b"]") == []
+    assert stream.close() == []
+
+
+def test_non_array_bodies_decode_whole():
+    """Test that objects, scalars and empty arrays pass through unchanged."""
+    assert decode_in_chunks(b'{"Error Message": "Limit Reach"}', 4) == {
+        "Error Message": "Limit Reach"
+    }
+    assert decode_in_chunks(b"[1, 2, 3]", 2) == [1, 2, 3]
+    assert decode_in_chunks(b"[]", 1) == []
+    with pytest.raises(ValueError):
+        decode_in_chunks(b'[{"a": 1},', 3)
@@ -0,0 +1,84 @@
+"""Tests for tool and upstream metrics."""
+
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from fmp_mcp.metrics import Histogram, Metrics, component_stats
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    """Test quantile estimates from bucket counts."""
+    histogram = Histogram((0.1, 0.2, 0.4))
+    for value in (0.05, 0.15, 0.15, 0.3):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == pytest.approx(0.15)
+    assert histogram.quantile(1.0) == pytest.approx(0.4)
+    assert histogram.sum == pytest.approx(0.65)
+
+
+@pytest.mark.asyncio
+async def test_render_prometheus_text():
+    """Test counters and cumulative histogram buckets in the exposition format."""
+    metrics = Metrics()
+    metrics.inc("fmp_tool_calls_total", tool="get_quote", result="ok")
+    metrics.inc("fmp_tool_calls_total", tool="get_quote", result="ok")
+    metrics.observe("fmp_tool_duration_seconds", 0.02, tool="get_quote")
+
+    text = metrics.render(await component_stats())
+    assert '# TYPE fmp_tool_calls_total counter' in text
+    assert 'fmp_tool_calls_total{result="ok",tool="get_quote"} 2' in text
+    assert 'fmp_tool_duration_seconds_bucket{tool="get_quote",le="0.01"} 0' in text
+    assert 'fmp_tool_duration_seconds_bucket{tool="get_quote",le="0.025"} 1' in text
+    assert 'fmp_tool_duration_seconds_bucket{tool="get_quote",le="+Inf"} 1' in text
+    assert 'fmp_tool_duration_seconds_count{tool="get_quote"} 1' in text
+    assert "fmp_ratelimit_tokens " in text
+
+
+@pytest.mark.asyncio
+async def test_call_tool_records_metrics_and_stats_tool_reports_them():
+    """Test that tool calls are recorded and summarized by fmp_server_stats."""
+    from fmp_mcp.server import call_tool
+    import fmp_mcp.metrics as metrics_module
+    import fmp_mcp.server as server_module
+
+    client = Mock()
+    client.get_quote.return_value = [{"symbol": "AAPL", "price": 150}]
+    server_module.fmp_client = client
+
+    with patch.dict('os.environ', {'FMP_CACHE_ENABLED': '0', 'FMP_API_KEY': 'test_key'}), \
+            patch.object(metrics_module, "_metrics", Metrics()):
+        await call_tool("get_quote", {"symbol": "AAPL"})
+        await call_tool("get_quote", {"symbol": "AAPL"})
+        summary = metrics_module.get_metrics().tool_summary()
+        stats = (await call_tool("fmp_server_stats", {}))[0].text
+
+    server_module.fmp_client = None
+    assert summary[0]["tool"] == "get_quote"
+    assert summary[0]["calls"] == 2
+    assert summary[0]["rows"] == 2
+    assert summary[0]["bytes_avg"] > 0
+    assert "get_quote" in stats and "rate_limit" in stats
+
+
+@pytest.mark.asyncio
+async def test_stats_tool_needs_no_api_key_and_skips_the_cache():
+    """Test that fmp_server_stats works without FMP_API_KEY and leaves the hit rate alone."""
+    from fmp_mcp.cache import ResponseCache
+    from fmp_mcp.server import call_tool
+    import fmp_mcp.cache as cache_module
+    import fmp_mcp.server as server_module
+
+    server_module.fmp_client = None
+    cache = ResponseCache()
+    with patch.dict('os.environ', {'FMP_CACHE_ENABLED': '1'}), \
+            patch.object(cache_module, "_response_cache", cache):
+        os.environ.pop("FMP_API_KEY", None)
+        first = (await call_tool("fmp_server_stats", {}))[0].text
+        second = (await call_tool("fmp_server_stats", {}))[0].text
+
+    assert "rate_limit" in first and "rate_limit" in second
+    assert server_module.fmp_client is None
+    assert cache.hits == cache.misses == 0
@@ -0,0 +1,140 @@
+"""Tests for paging large list results."""
+
+from functools import partial
+from unittest.mock import Mock, patch
+
+import pytest
+import toon
+
+import fmp_mcp.pagination as pagination
+from fmp_mcp.pagination import (
+    decode_cursor,
+    encode_cursor,
+    fetch_page,
+    resume_arguments,
+    shorten_page,
+)
+from fmp_mcp.server import format_limited
+
+
+@pytest.fixture(autouse=True)
+def fresh_result_cache():
+    """Give each test an empty result cache."""
+    pagination._result_cache = None
+    yield
+    pagination._result_cache = None
+
+
+def test_cursor_round_trip():
+    """Test that a cursor carries the arguments and offset for its own tool only."""
+    cursor = encode_cursor("screen_stocks", {"sector": "Technology", "page_size": 2}, 4)
+
+    assert decode_cursor("screen_stocks", cursor) == ({"sector": "Technology", "page_size": 2}, 4)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor("get_stock_list", cursor)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor("screen_stocks", "not-a-cursor")
+
+
+def test_resumed_calls_may_change_only_page_size_and_fields():
+    """Test that page_size and fields override the cursor and other changes are rejected."""
+    cursor = encode_cursor("screen_stocks", {"sector": "Technology", "page_size": 2}, 4)
+    adjustable = ("page_size", "fields")
+
+    arguments = {"cursor": cursor, "sector": "Technology", "page_size": 10, "fields": ["symbol"]}
+    assert resume_arguments("screen_stocks", arguments, adjustable) == (
+        {"sector": "Technology", "page_size": 10, "fields": ["symbol"]}, 4
+    )
+    with pytest.raises(ValueError, match="sector does not match the cursor"):
+        resume_arguments("screen_stocks", {"cursor": cursor, "sector": "Energy"}, adjustable)
+
+
+def test_page_rows_are_encoded_as_a_table_up_to_the_limit():
+    """Test that page rows match toon.encode and are cut by row count to fit the limit."""
+    rows = [{"symbol": f"S{i}", "name": f"Stock {i}"} for i in range(100)]
+    page = {"results": rows[:50], "total": 100, "offset": 0, "next_cursor": "c"}
+    pager = partial(shorten_page, "get_stock_list", {})
+
+    assert format_limited(page, None, pager) == (toon.encode(page), None)
+
+    text, note = format_limited(page, 300, pager)
+    count = int(note.split("page shortened to ")[1].split()[0])
+    assert len(text.encode()) <= 300 < len(toon.encode(pager(page, count + 1)).encode())
+    assert text == toon.encode(pager(page, count))
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_hits_upstream_once():
+    """Test that every page is served from one upstream fetch."""
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return [{"symbol": f"S{i}"} for i in range(5)]
+
+    first = await fetch_page("get_stock_list", "key", fetch, {}, 0, 2, 60)
+    assert first["results"] == [{"symbol": "S0"}, {"symbol": "S1"}]
+    assert first["total"] == 5
+
+    arguments, offset = decode_cursor("get_stock_list", first["next_cursor"])
+    last = await fetch_page("get_stock_list", "key", fetch, arguments, 4, 2, 60)
+    assert last["results"] == [{"symbol": "S4"}]
+    assert last["next_cursor"] is None
+    assert offset == 2
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_call_tool_pages_with_cursor():
+    """Test paging get_stock_list through call_tool with a follow-up cursor."""
+    from fmp_mcp.server import call_tool
+    import fmp_mcp.server as server_module
+
+    client = Mock()
+    client.get_stock_list.return_value = [
+        {"symbol": f"S{i}", "name": f"Stock {i}", "price": i} for i in range(3)
+    ]
+    server_module.fmp_client = client
+
+    with patch.dict('os.environ', {'FMP_CACHE_ENABLED': '0', 'FMP_API_KEY': 'test_key'}):
+        first = (await call_tool("get_stock_list", {"page_size": 2, "fields": ["symbol"]}))[0].text
+        cursor = next(
+            line.split(": ", 1)[1] for line in first.splitlines()
+            if line.startswith("next_cursor")
+        )
+        second = (await call_tool("get_stock_list", {"cursor": cursor}))[0].text
+
+    server_module.fmp_client = None
+    assert "S0" in first and "S1" in first and "Stock" not in first
+    assert "S2" in second and "Stock" not in second
+    assert "next_cursor: null" in second
+    assert client.get_stock_list.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_oversized_page_is_shortened_and_cursor_moved_back():
+    """Test that a page over the response limit continues right after its last row."""
+    from fmp_mcp.server import call_tool
+    import fmp_mcp.server as server_module
+
+    client = Mock()
+    client.get_stock_list.return_value = [
+        {"symbol": f"S{i}", "name": f"Stock {i}"} for i in range(100)
+    ]
+    server_module.fmp_client = client
+
+    with patch.dict('os.environ', {
+        'FMP_CACHE_ENABLED': '0', 'FMP_API_KEY': 'test_key', 'FMP_MAX_RESPONSE_BYTES': '600'
+    }):
+        first = await call_tool("get_stock_list", {"page_size": 50})
+        cursor = next(
+            line.split(": ", 1)[1] for line in first[0].text.splitlines()
+            if line.startswith("next_cursor")
+        )
+
+    server_module.fmp_client = None
+    assert len(first[0].text) <= 600
+    shown = int(first[1].text.split("page shortened to ")[1].split()[0])
+    assert first[1].text.endswith("continue from next_cursor")
+    assert f"S{shown - 1}," in first[0].text and f"S{shown}," not in first[0].text
+    assert decode_cursor("get_stock_list", cursor)[1] == shown
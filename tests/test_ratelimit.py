@@ -0,0 +1,130 @@
+"""Tests for the client-side rate limiter."""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from fmp_mcp.ratelimit import (
+    BULK,
+    INTERACTIVE,
+    NORMAL,
+    RateLimiter,
+    SharedTokenBucket,
+    intraday_priority,
+)
+
+
+def test_intraday_priority():
+    """Test that only long intraday windows go to the bulk lane."""
+    assert intraday_priority(
+        {"symbol": "AAPL", "from_date": "2022-01-01", "to_date": "2024-01-01"}
+    ) == BULK
+    assert intraday_priority(
+        {"symbol": "AAPL", "from_date": "2024-01-01", "to_date": "2024-01-05"}
+    ) == NORMAL
+    assert intraday_priority({"symbol": "AAPL"}) == NORMAL
+
+
+@pytest.mark.asyncio
+async def test_burst_is_served_immediately():
+    """Test that calls within the burst do not wait."""
+    limiter = RateLimiter(rate_per_minute=60, burst=3)
+
+    waits = [await limiter.acquire() for _ in range(3)]
+
+    assert waits == [0.0, 0.0, 0.0]
+    assert limiter.stats()["lanes"]["normal"]["acquired"] == 3
+
+
+@pytest.mark.asyncio
+async def test_calls_beyond_burst_are_paced():
+    """Test that calls beyond the burst wait for tokens to refill."""
+    limiter = RateLimiter(rate_per_minute=600, burst=1)
+
+    await limiter.acquire()
+    waited = await limiter.acquire()
+
+    assert 0.05 < waited < 0.5
+
+
+@pytest.mark.asyncio
+async def test_interactive_calls_jump_ahead_of_bulk():
+    """Test that queued interactive calls are released before earlier bulk calls."""
+    limiter = RateLimiter(rate_per_minute=1200, burst=1)
+    order = []
+
+    async def call(label, priority):
+        await limiter.acquire(priority)
+        order.append(label)
+
+    await limiter.acquire()
+    bulk = [asyncio.ensure_future(call(f"bulk{i}", BULK)) for i in range(3)]
+    await asyncio.sleep(0)
+    quote = asyncio.ensure_future(call("quote", INTERACTIVE))
+    await asyncio.gather(*bulk, quote)
+
+    assert order[0] == "quote"
+    stats = limiter.stats()
+    assert stats["lanes"]["bulk"]["wait_max"] > stats["lanes"]["interactive"]["wait_max"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_consume_token():
+    """Test that cancelling a queued call leaves the token for the next caller."""
+    limiter = RateLimiter(rate_per_minute=1200, burst=1)
+
+    await limiter.acquire()
+    cancelled = asyncio.ensure_future(limiter.acquire())
+    waiting = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await asyncio.wait_for(waiting, 1) < 0.2
+
+
+@pytest.mark.asyncio
+async def test_zero_rate_disables_limiting():
+    """Test that a rate of 0 never queues."""
+    limiter = RateLimiter(rate_per_minute=0, burst=1)
+
+    waits = [await limiter.acquire() for _ in range(5)]
+
+    assert waits == [0.0] * 5
+
+
+@pytest.mark.asyncio
+async def test_shared_bucket_spans_limiters(tmp_path):
+    """Test that limiters in different processes draw from one shared budget."""
+    path = tmp_path / "ratelimit.sqlite3"
+    first = RateLimiter(600, 2, SharedTokenBucket(path, 600, 2))
+    second = RateLimiter(600, 2, SharedTokenBucket(path, 600, 2))
+
+    assert await first.acquire() == 0.0
+    assert await second.acquire() == 0.0
+    waited = await first.acquire()
+
+    assert 0.05 < waited < 0.5
+    assert second.stats()["tokens"] < 1
+
+
+@pytest.mark.asyncio
+async def test_queue_survives_a_locked_shared_bucket(tmp_path):
+    """Test that lock errors from the shared bucket delay waiters instead of stranding them."""
+    bucket = SharedTokenBucket(tmp_path / "ratelimit.sqlite3", 1200, 1)
+    limiter = RateLimiter(1200, 1, bucket)
+    take = bucket.take
+    failures = iter([sqlite3.OperationalError("database is locked")] * 3)
+
+    def flaky_take():
+        error = next(failures, None)
+        if error is not None:
+            raise error
+        return take()
+
+    await limiter.acquire()
+    bucket.take = flaky_take
+    waiters = [asyncio.ensure_future(limiter.acquire()) for _ in range(2)]
+
+    waits = await asyncio.wait_for(asyncio.gather(*waiters), 2)
+    assert len(waits) == 2
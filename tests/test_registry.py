@@ -0,0 +1,146 @@
+"""Tests for the declarative tool registry."""
+
+import pytest
+from unittest.mock import Mock, patch
+from mcp.types import Tool
+from pydantic import BaseModel
+
+from fmp_mcp.cache import TTL_DAY, TTL_REALTIME
+from fmp_mcp.ratelimit import BULK, INTERACTIVE, NORMAL
+from fmp_mcp.tools import (
+    REQUIRED,
+    TOOLS,
+    check_fields,
+    client_call,
+    get_catalog,
+    project,
+    register,
+)
+
+
+def test_every_tool_has_a_handler_and_policy():
+    """Test that each registered tool carries its schema, handler and policies."""
+    for name, spec in TOOLS.items():
+        assert spec.name == name
+        assert spec.tool.inputSchema["type"] == "object"
+        assert callable(spec.handler)
+        # Server stats describe the live process and are never cached
+        assert spec.ttl > 0 or name == "fmp_server_stats"
+
+
+def test_tool_policies():
+    """Test cache TTLs and rate-limit lanes for representative tools."""
+    assert TOOLS["get_quote"].ttl == TTL_REALTIME
+    assert TOOLS["get_quote"].priority_for({"symbol": "AAPL"}) == INTERACTIVE
+    assert TOOLS["get_stock_list"].ttl == TTL_DAY
+    assert TOOLS["get_stock_list"].priority_for({}) == BULK
+    assert TOOLS["get_income_statement"].priority_for({"symbol": "AAPL"}) == NORMAL
+    assert TOOLS["get_historical_chart"].priority_for(
+        {"symbol": "AAPL", "from_date": "2022-01-01", "to_date": "2024-01-01"}
+    ) == BULK
+
+
+def test_register_rejects_duplicates():
+    """Test that a tool name can only be registered once."""
+    tool = Tool(name="get_quote", inputSchema={"type": "object", "properties": {}})
+    with pytest.raises(ValueError, match="already registered"):
+        register(tool, client_call("get_quote", "symbol"))
+
+
+@pytest.mark.asyncio
+async def test_client_call_maps_arguments():
+    """Test positional, required and defaulted argument mapping."""
+    client = Mock()
+    client.search_stock_news.return_value = ["news"]
+
+    handler = client_call("search_stock_news", symbols=REQUIRED, page=0, limit=50)
+    result = await handler(client, {"symbols": "AAPL", "limit": 5})
+
+    assert result == ["news"]
+    client.search_stock_news.assert_called_once_with(symbols="AAPL", page=0, limit=5)
+
+    handler = client_call("get_profile", "symbol")
+    await handler(client, {"symbol": "AAPL"})
+    client.get_profile.assert_called_once_with("AAPL")
+
+
+def test_catalog_is_built_once_and_frozen():
+    """Test that tools/list is served from one prebuilt catalog."""
+    catalog = get_catalog()
+
+    assert get_catalog() is catalog
+    assert [tool.name for tool in catalog.tools] == list(TOOLS)
+
+    tool = Tool(name="late_tool", inputSchema={"type": "object", "properties": {}})
+    with pytest.raises(RuntimeError, match="already built"):
+        register(tool, client_call("get_quote", "symbol"))
+    assert "late_tool" not in TOOLS
+
+
+def test_every_tool_accepts_fields():
+    """Test that the registry adds the fields argument to every tool schema."""
+    for spec in TOOLS.values():
+        assert "fields" in spec.tool.inputSchema["properties"]
+    assert "'minimal'" in TOOLS["get_quote"].tool.inputSchema["properties"]["fields"]["description"]
+
+
+def test_fields_for_presets_and_lists():
+    """Test resolving presets, lists and comma-separated field names."""
+    spec = TOOLS["get_quote"]
+
+    assert spec.fields_for({"symbol": "AAPL"}) is None
+    assert spec.fields_for({"fields": "minimal"}) == list(spec.presets["minimal"])
+    assert spec.fields_for({"fields": "symbol, price"}) == ["symbol", "price"]
+    assert spec.fields_for({"fields": ["price", "symbol"]}) == ["price", "symbol"]
+
+
+def test_project_rows_and_envelopes():
+    """Test projecting rows, models and partial-failure envelopes."""
+    class Quote(BaseModel):
+        symbol: str
+        price: float
+        volume: int
+
+    rows = [
+        {"symbol": "AAPL", "price": 150.0, "volume": 10},
+        Quote(symbol="MSFT", price=1, volume=2),
+    ]
+    assert project(rows, ["price", "symbol"]) == [
+        {"price": 150.0, "symbol": "AAPL"},
+        {"price": 1.0, "symbol": "MSFT"},
+    ]
+
+    envelope = {"quotes": [{"symbol": "AAPL", "price": 150.0}], "errors": [{"symbols": "X"}]}
+    assert project(envelope, ["symbol"]) == {
+        "quotes": [{"symbol": "AAPL"}],
+        "errors": [{"symbols": "X"}],
+    }
+    assert project({"symbol": "AAPL"}, ["symbol", "missing"]) == {"symbol": "AAPL", "missing": None}
+
+
+def test_check_fields_reports_columns_no_row_has():
+    """Test that unknown fields are rejected, naming the presets, and empty results pass."""
+    rows = [{"symbol": "AAPL", "price": 150.0}]
+    presets = {"minimal": ("symbol", "price")}
+
+    check_fields(rows, ["price", "symbol"], presets)
+    check_fields({"results": [], "total": 0}, ["anything"], presets)
+    with pytest.raises(ValueError, match="Unknown field\\(s\\): volume; presets are minimal"):
+        check_fields({"quotes": rows, "errors": []}, ["symbol", "volume"], presets)
+
+
+@pytest.mark.asyncio
+async def test_misspelt_preset_is_an_error_not_full_rows():
+    """Test that a preset name that is not a preset or a column fails the call."""
+    from fmp_mcp.server import call_tool
+    import fmp_mcp.server as server_module
+
+    client = Mock()
+    client.get_quote.return_value = [{"symbol": "AAPL", "price": 150.0, "volume": 10}]
+    server_module.fmp_client = client
+    with patch.dict('os.environ', {'FMP_CACHE_ENABLED': '0', 'FMP_API_KEY': 'test_key'}):
+        result = await call_tool("get_quote", {"symbol": "AAPL", "fields": "minmal"})
+    server_module.fmp_client = None
+
+    presets = ", ".join(TOOLS["get_quote"].presets)
+    assert result[0].text == f"Error: Unknown field(s): minmal; presets are {presets}"
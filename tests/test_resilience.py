@@ -0,0 +1,121 @@
+"""Tests for upstream retries and circuit breakers."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+import fmp_mcp.ratelimit as ratelimit_module
+import fmp_mcp.resilience as resilience_module
+from fmp_mcp.async_client import AsyncFMPClient
+from fmp_mcp.executor import call_client
+from fmp_mcp.ratelimit import RateLimiter, RateLimitTimeoutError
+from fmp_mcp.resilience import CircuitOpenError, Resilience, is_transient
+
+
+class UpstreamError(Exception):
+    """Error carrying an HTTP status like FMPAPIError."""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_transient_errors():
+    """Test which errors are retried."""
+    assert is_transient(UpstreamError(429))
+    assert is_transient(UpstreamError(503))
+    assert is_transient(TimeoutError())
+    assert not is_transient(UpstreamError(404))
+    assert not is_transient(ValueError("bad argument"))
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors_with_backoff():
+    """Test that a transient failure is retried and a permanent one is not."""
+    resilience = Resilience(attempts=3, base_delay=0)
+    call = AsyncMock(side_effect=[UpstreamError(429), UpstreamError(502), "ok"])
+
+    assert await resilience.call("get_quote", call) == "ok"
+    assert call.await_count == 3
+
+    call = AsyncMock(side_effect=UpstreamError(404))
+    with pytest.raises(UpstreamError):
+        await resilience.call("get_quote", call)
+    assert call.await_count == 1
+    assert resilience.retries == 2
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_probes_after_cooldown():
+    """Test that repeated failures open the circuit until a probe succeeds."""
+    resilience = Resilience(attempts=1, threshold=2, cooldown=30)
+    failing = AsyncMock(side_effect=UpstreamError(503))
+
+    with patch("fmp_mcp.resilience.time.monotonic", return_value=100.0):
+        for _ in range(2):
+            with pytest.raises(UpstreamError):
+                await resilience.call("get_quote", failing)
+        with pytest.raises(CircuitOpenError):
+            await resilience.call("get_quote", failing)
+        assert await resilience.call("get_profile", AsyncMock(return_value="ok")) == "ok"
+        assert resilience.stats()["circuits"] == {"get_quote": "open"}
+    assert failing.await_count == 2
+
+    with patch("fmp_mcp.resilience.time.monotonic", return_value=131.0):
+        assert await resilience.call("get_quote", AsyncMock(return_value="ok")) == "ok"
+    assert resilience.breaker("get_quote").state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_call_client_retries_a_503_from_the_async_transport():
+    """Test that a real FMPAPIError for a 503 is retried once and the 200 is returned."""
+    statuses = [503, 200]
+
+    def handler(request):
+        status = statuses.pop(0)
+        if status == 503:
+            return httpx.Response(503, text="Service Unavailable")
+        return httpx.Response(200, json=[{"symbol": request.url.params["symbol"]}])
+
+    client = AsyncFMPClient(api_key="test_key", base_url="http://fmp.test/stable")
+    await client._http.aclose()
+    client._http = httpx.AsyncClient(
+        base_url="http://fmp.test/stable/", transport=httpx.MockTransport(handler)
+    )
+    resilience = Resilience(attempts=3, base_delay=0)
+    try:
+        with patch.object(resilience_module, "_resilience", resilience):
+            result = await call_client(client.get_quote, "AAPL")
+    finally:
+        await client.aclose()
+
+    assert result == [{"symbol": "AAPL"}]
+    assert statuses == []
+    assert resilience.retries == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_back_pressure_never_opens_a_circuit():
+    """Test that calls timing out in the limiter queue are not retried or held against upstream."""
+    calls = 0
+
+    async def get_income_statement():
+        nonlocal calls
+        calls += 1
+        return []
+
+    resilience = Resilience(attempts=3, base_delay=0, threshold=2)
+    with patch.dict('os.environ', {'FMP_CALL_TIMEOUT': '0.1'}), \
+            patch.object(ratelimit_module, "_rate_limiter", RateLimiter(60, 1)), \
+            patch.object(resilience_module, "_resilience", resilience):
+        results = await asyncio.gather(
+            *(call_client(get_income_statement) for _ in range(8)), return_exceptions=True
+        )
+
+    assert results.count([]) == 1
+    assert sum(isinstance(result, RateLimitTimeoutError) for result in results) == 7
+    assert calls == 1
+    assert resilience.retries == 0
+    assert resilience.breaker("get_income_statement").state == "closed"
@@ -0,0 +1,64 @@
+"""Tests for local stock screening."""
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import fmp_mcp.screener as screener_module
+from fmp_mcp.screener import LocalScreener, ScreenerSnapshot, get_local_screener
+
+FIXTURE = json.loads((Path(__file__).parent / "fixtures" / "company_screener.json").read_text())
+UNIVERSE = FIXTURE["universe"]
+
+
+@pytest.mark.parametrize("case", FIXTURE["cases"], ids=lambda case: json.dumps(case["criteria"]))
+def test_snapshot_matches_expected_screens(case):
+    """Test that local screens return the hand-checked rows, in order, for each fixture case."""
+    snapshot = ScreenerSnapshot(UNIVERSE, complete=True)
+
+    rows = snapshot.screen(case["criteria"])
+    assert [row["symbol"] for row in rows] == case["symbols"]
+
+
+def test_partial_snapshot_answers_only_exact_screens():
+    """Test that a snapshot of the largest companies declines screens it may get wrong."""
+    snapshot = ScreenerSnapshot(UNIVERSE[:6], complete=False)
+
+    rows = snapshot.screen({"sector": "Technology", "limit": 3})
+    assert [row["symbol"] for row in rows] == ["NVDA", "MSFT", "AAPL"]
+    assert snapshot.screen({"sector": "Healthcare", "limit": 3}) is None
+    assert snapshot.screen({"sector": "Technology"}) is None
+    assert ScreenerSnapshot(UNIVERSE, complete=True).screen({"ipo_date": "2020"}) is None
+
+
+@pytest.mark.asyncio
+async def test_local_screener_snapshots_universe_once():
+    """Test that screens after the first snapshot stay local."""
+    client = Mock()
+    client.screen_stocks.return_value = UNIVERSE
+    screener = LocalScreener(snapshot_limit=1000)
+    fallback = AsyncMock(return_value=UNIVERSE[:1])
+
+    assert await screener.screen(client, {"sector": "Technology"}, fallback) == UNIVERSE[:1]
+    await screener._task
+
+    rows = await screener.screen(client, {"is_etf": True}, fallback)
+    assert [row["symbol"] for row in rows] == ["SPY"]
+    assert fallback.await_count == 1
+    client.screen_stocks.assert_called_once_with(limit=1000)
+
+
+def test_local_screener_is_opt_in():
+    """Test that screens go upstream unless FMP_SCREENER_ENABLED is set."""
+    screener_module._local_screener = None
+    try:
+        with patch.dict('os.environ', {}, clear=True):
+            assert get_local_screener() is None
+        with patch.dict('os.environ', {'FMP_SCREENER_ENABLED': "1"}):
+            assert isinstance(get_local_screener(), LocalScreener)
+    finally:
+        screener_module._local_screener = None
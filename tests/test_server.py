@@ -1,5 +1,7 @@
 """Basic tests for FMP MCP server."""
 
+import time
+
 import pytest
 from unittest.mock import Mock, patch
 from fmp_mcp.server import format_response, handle_fmp_error
@@ -70,8 +72,8 @@ async def test_list_tools():
     tools = await list_tools()
 
     # Check we have the right number of tools
-    # 8 company + 7 market + 4 crypto + 4 financials = 23 tools
-    assert len(tools) == 23
+    # 11 company + 8 market + 7 crypto + 5 financials + 1 stats = 32 tools
+    assert len(tools) == 32
 
     # Check some specific tools exist
     tool_names = [tool.name for tool in tools]
@@ -80,6 +82,25 @@ async def test_list_tools():
     assert "get_crypto_quote" in tool_names
     assert "get_income_statement" in tool_names
     assert "screen_stocks" in tool_names
+    assert "get_quotes_batch" in tool_names
+    assert "get_crypto_quotes_batch" in tool_names
+    assert "get_financials_bulk" in tool_names
+
+
+@pytest.mark.asyncio
+async def test_tools_list_request_goes_through_the_sdk_handler():
+    """Test that tools/list served via the Server.list_tools decorator returns the catalog."""
+    from mcp.types import ListToolsRequest, ListToolsResult
+
+    from fmp_mcp.server import app
+    from fmp_mcp.tools import get_catalog
+
+    handler = app.request_handlers[ListToolsRequest]
+    result = await handler(ListToolsRequest(method="tools/list"))
+
+    assert isinstance(result.root, ListToolsResult)
+    assert result.root.tools == get_catalog().tools
+    assert len(result.root.tools) == 32
 
 
 @pytest.mark.asyncio
@@ -95,7 +116,7 @@ async def test_get_fmp_client_without_api_key():
 @pytest.mark.asyncio
 async def test_get_fmp_client_with_api_key():
     """Test that get_fmp_client creates client with API key."""
-    from fmp_mcp.server import get_fmp_client
+    from fmp_mcp.server import get_fmp_client, close_fmp_client
     import fmp_mcp.server as server_module
 
     # Reset the global client
@@ -107,4 +128,265 @@ async def test_get_fmp_client_with_api_key():
         assert client.api_key == 'test_key'
 
     # Reset for other tests
+    await close_fmp_client()
+
+
+@pytest.mark.asyncio
+async def test_get_fmp_client_transports():
+    """Test that raw async is the default and FMP_TRANSPORT=sync opts into models."""
+    from fmp import FMPClient
+    from fmp_mcp.server import get_fmp_client, close_fmp_client
+    from fmp_mcp.async_client import AsyncFMPClient
+    import fmp_mcp.server as server_module
+
+    server_module.fmp_client = None
+
+    with patch.dict('os.environ', {'FMP_API_KEY': 'test_key'}):
+        assert isinstance(get_fmp_client(), AsyncFMPClient)
+    await close_fmp_client()
+
+    with patch.dict('os.environ', {'FMP_API_KEY': 'test_key', 'FMP_TRANSPORT': 'sync'}):
+        assert isinstance(get_fmp_client(), FMPClient)
+    await close_fmp_client()
+    assert server_module.fmp_client is None
+
+
+@pytest.mark.asyncio
+async def test_quotes_batch_uses_multi_symbol_endpoint():
+    """Test that batch quotes use the client's multi-symbol endpoint when available."""
+    from fmp_mcp.tools.market import fetch_quotes_batch
+
+    client = Mock()
+    client.get_batch_quote.return_value = [{"symbol": "MSFT"}, {"symbol": "AAPL"}]
+
+    result = await fetch_quotes_batch(client, ["AAPL", "MSFT"], client.get_quote)
+
+    assert result == [{"symbol": "AAPL"}, {"symbol": "MSFT"}]
+    client.get_batch_quote.assert_called_once_with(["AAPL", "MSFT"])
+    client.get_quote.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_quotes_batch_fans_out_per_symbol():
+    """Test that batch quotes fan out when no multi-symbol endpoint exists."""
+    from fmp_mcp.tools.market import fetch_quotes_batch
+
+    client = Mock(spec=["get_crypto_quote"])
+
+    def get_crypto_quote(symbol):
+        if symbol == "BADUSD":
+            raise FMPAPIError("Unknown symbol", 404)
+        return [{"symbol": symbol, "price": 1.0}]
+
+    client.get_crypto_quote.side_effect = get_crypto_quote
+
+    result = await fetch_quotes_batch(
+        client, ["BTCUSD", "BADUSD", "ETHUSD"], client.get_crypto_quote
+    )
+
+    assert [quote["symbol"] for quote in result["quotes"]] == ["BTCUSD", "ETHUSD"]
+    assert result["errors"][0]["symbols"] == "BADUSD"
+    assert client.get_crypto_quote.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_financials_bulk_merges_by_symbol_and_period():
+    """Test that bulk statements are merged into one row per symbol and date."""
+    from fmp_mcp.tools.financials import fetch_financials_bulk
+
+    client = Mock()
+    client.get_income_statement.side_effect = lambda symbol, period, limit: [
+        {"date": "2024-09-30", "symbol": symbol, "period": "FY", "revenue": 100},
+        {"date": "2023-09-30", "symbol": symbol, "period": "FY", "revenue": 90},
+    ][:limit]
+    client.get_balance_sheet.side_effect = lambda symbol, period, limit: [
+        {"date": "2024-09-30", "symbol": symbol, "period": "FY", "totalAssets": 500},
+    ]
+
+    with patch.dict('os.environ', {'FMP_STORE_ENABLED': '0'}):
+        rows = await fetch_financials_bulk(
+            client, ["MSFT", "AAPL"], ["income", "balance_sheet"], "annual", 2
+        )
+
+    assert [(row["symbol"], row["date"]) for row in rows] == [
+        ("MSFT", "2024-09-30"), ("MSFT", "2023-09-30"),
+        ("AAPL", "2024-09-30"), ("AAPL", "2023-09-30"),
+    ]
+    assert rows[0]["revenue"] == 100 and rows[0]["totalAssets"] == 500
+    assert rows[1]["totalAssets"] is None
+    assert list(rows[0])[:3] == ["symbol", "date", "period"]
+
+
+@pytest.mark.asyncio
+async def test_financials_bulk_accepts_a_statement_string_and_rejects_unknown_types():
+    """Test that statements may be comma-separated and unknown names are reported."""
+    from fmp_mcp.server import call_tool
+    from fmp_mcp.tools.financials import parse_statements
+    import fmp_mcp.server as server_module
+
+    assert parse_statements("income") == ["income"]
+    assert parse_statements(" Income, cash_flow,income") == ["income", "cash_flow"]
+    assert parse_statements(None) == ["income", "balance_sheet", "cash_flow", "growth"]
+
+    server_module.fmp_client = Mock()
+    with patch.dict('os.environ', {'FMP_CACHE_ENABLED': '0', 'FMP_API_KEY': 'test_key'}):
+        result = await call_tool(
+            "get_financials_bulk", {"symbols": ["AAPL"], "statements": "income,ratios"}
+        )
+    server_module.fmp_client = None
+
+    assert result[0].text == (
+        "Error: Unknown statement type(s): ratios; "
+        "expected any of income, balance_sheet, cash_flow, growth"
+    )
+
+
+def test_http_app_serves_concurrent_sessions():
+    """Test that one HTTP app hosts independent streamable HTTP sessions."""
+    from starlette.testclient import TestClient
+    from fmp_mcp.server import create_http_app
+
+    headers = {"accept": "application/json, text/event-stream"}
+    initialize = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2025-03-26",
+            "capabilities": {},
+            "clientInfo": {"name": "test", "version": "1.0"},
+        },
+    }
+
+    with TestClient(create_http_app()) as http:
+        sessions = []
+        for _ in range(2):
+            response = http.post("/mcp", json=initialize, headers=headers)
+            assert response.status_code == 200
+            sessions.append(response.headers["mcp-session-id"])
+        assert len(set(sessions)) == 2
+
+        for session_id in sessions:
+            session_headers = {**headers, "mcp-session-id": session_id}
+            http.post(
+                "/mcp",
+                json={"jsonrpc": "2.0", "method": "notifications/initialized"},
+                headers=session_headers,
+            )
+            response = http.post(
+                "/mcp",
+                json={"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+                headers=session_headers,
+            )
+            assert response.status_code == 200
+            assert '"get_quote"' in response.text
+
+
+def test_main_cli_arguments():
+    """Test transport selection from the command line."""
+    from fmp_mcp.__main__ import parse_args
+
+    args = parse_args([])
+    assert (args.transport, args.host, args.port) == ("stdio", "127.0.0.1", 8000)
+
+    args = parse_args(["--transport", "http", "--host", "0.0.0.0", "--port", "9000"])
+    assert (args.transport, args.host, args.port) == ("http", "0.0.0.0", 9000)
+
+    assert parse_args(["--transport", "http", "--workers", "4"]).workers == 4
+    with pytest.raises(SystemExit):
+        parse_args(["--workers", "4"])
+
+
+def test_worker_app_is_stateless():
+    """Test that worker apps answer requests without a session and drop SSE."""
+    from starlette.testclient import TestClient
+    from fmp_mcp.server import create_worker_app
+
+    headers = {"accept": "application/json, text/event-stream"}
+    with TestClient(create_worker_app()) as http:
+        response = http.post(
+            "/mcp",
+            json={"jsonrpc": "2.0", "id": 1, "method": "tools/list"},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert '"get_quote"' in response.text
+        assert http.get("/sse").status_code == 404
+
+        metrics = http.get("/metrics")
+        assert metrics.status_code == 200
+        assert metrics.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE fmp_tool_duration_seconds histogram" in metrics.text
+
+
+@pytest.mark.asyncio
+async def test_call_tool_projects_fields():
+    """Test that a fields preset trims rows before encoding and is not sent upstream."""
+    from fmp_mcp.server import call_tool
+    import fmp_mcp.server as server_module
+
+    client = Mock()
+    client.get_quote.return_value = [
+        {"symbol": "AAPL", "name": "Apple Inc.", "price": 150.0, "changePercentage": 1.2,
+         "volume": 1000, "marketCap": 3000000000000}
+    ]
+    server_module.fmp_client = client
+
+    with patch.dict('os.environ', {'FMP_CACHE_ENABLED': '0', 'FMP_API_KEY': 'test_key'}):
+        result = await call_tool("get_quote", {"symbol": "AAPL", "fields": "minimal"})
+
+    server_module.fmp_client = None
+    client.get_quote.assert_called_once_with("AAPL")
+    assert result[0].text == "[1]{symbol,price,changePercentage,volume}:\n  AAPL,150,1.2,1000"
+
+
+@pytest.mark.asyncio
+async def test_call_tool_serves_stale_response_when_upstream_fails():
+    """Test that an expired cached response is served with a staleness marker."""
+    from fmp_mcp.cache import ResponseCache
+    from fmp_mcp.server import call_tool
+    import fmp_mcp.cache as cache_module
+    import fmp_mcp.resilience as resilience_module
+    import fmp_mcp.server as server_module
+
+    class Unavailable(Exception):
+        status_code = 503
+
+    cache = ResponseCache()
+    cache.set("get_quote", {"symbol": "AAPL"}, "price: 150", ttl=0.01)
+    time.sleep(0.02)
+    client = Mock()
+    client.get_quote.side_effect = Unavailable("Service Unavailable")
+    server_module.fmp_client = client
+
+    with patch.dict('os.environ', {'FMP_RETRY_ATTEMPTS': '1', 'FMP_API_KEY': 'test_key'}), \
+            patch.object(cache_module, "_response_cache", cache), \
+            patch.object(resilience_module, "_resilience", None):
+        result = await call_tool("get_quote", {"symbol": "AAPL"})
+
+    server_module.fmp_client = None
+    assert result[0].text == "price: 150"
+    assert result[1].text.startswith("stale: served from cache 0s past its TTL")
+    assert "Service Unavailable" in result[1].text
+
+
+@pytest.mark.asyncio
+async def test_call_tool_truncates_at_the_response_limit():
+    """Test that oversized responses keep a prefix of rows and report it separately."""
+    from fmp_mcp.server import call_tool
+    import fmp_mcp.server as server_module
+
+    client = Mock()
+    client.get_quote.return_value = [{"symbol": f"S{i}", "price": i} for i in range(100)]
+    server_module.fmp_client = client
+
+    with patch.dict('os.environ', {
+        'FMP_CACHE_ENABLED': '0', 'FMP_API_KEY': 'test_key', 'FMP_MAX_RESPONSE_BYTES': '200'
+    }):
+        result = await call_tool("get_quote", {"symbol": "AAPL"})
+
     server_module.fmp_client = None
+    shown = len(result[0].text.splitlines()) - 1
+    assert len(result[0].text) <= 200
+    assert result[0].text.startswith(f"[{shown}]{{symbol,price}}:")
+    assert result[1].text.startswith(f"truncated: showing the first {shown} of 100 rows")
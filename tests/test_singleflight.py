@@ -0,0 +1,118 @@
+"""Tests for concurrent call coalescing."""
+
+import asyncio
+
+import pytest
+
+from fmp_mcp.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    """Test that identical concurrent calls run the work once."""
+    group = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    results = await asyncio.gather(*(group.do("get_quote:NVDA", work) for _ in range(5)))
+
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+    assert group.stats() == {"in_flight": 0, "executions": 1, "shared": 4}
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_separately():
+    """Test that calls with different keys are not coalesced."""
+    group = SingleFlight()
+
+    async def work(value):
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(
+        group.do("a", lambda: work("a")),
+        group.do("b", lambda: work("b")),
+    )
+
+    assert results == ["a", "b"]
+    assert group.executions == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_all_callers():
+    """Test that every waiting caller receives the shared error."""
+    group = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+
+    results = await asyncio.gather(
+        group.do("k", work), group.do("k", work), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    """Test that one cancelled caller leaves the shared work running."""
+    group = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.ensure_future(group.do("k", work))
+    second = asyncio.ensure_future(group.do("k", work))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_key_is_released_after_completion():
+    """Test that later calls start a fresh execution."""
+    group = SingleFlight()
+
+    async def work():
+        return object()
+
+    first = await group.do("k", work)
+    second = await group.do("k", work)
+
+    assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_work_is_cancelled_when_its_only_caller_is():
+    """Test that cancelling the sole caller cancels the shared work and frees the key."""
+    group = SingleFlight()
+    events = []
+
+    async def work():
+        events.append("started")
+        try:
+            await asyncio.sleep(1)
+            events.append("finished")
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+
+    caller = asyncio.ensure_future(group.do("k", work))
+    await asyncio.sleep(0.01)
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    await asyncio.sleep(0)
+
+    assert events == ["started", "cancelled"]
+    assert group.stats()["in_flight"] == 0
@@ -0,0 +1,47 @@
+"""Cold-start regression tests for the stdio server."""
+
+import subprocess
+import sys
+
+# Modules that must not be imported before the first tool call
+DEFERRED_MODULES = ("fmp", "fmp.models", "toon", "fmp_mcp.async_client")
+
+# Budget for the server's own modules, excluding the MCP SDK, in microseconds
+OWN_IMPORT_BUDGET_US = 150_000
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    """Run the current interpreter with the given arguments."""
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True, timeout=60
+    )
+
+
+def test_heavy_imports_are_deferred():
+    """Test that importing the server and listing tools loads no FMP or TOON code."""
+    script = (
+        "import asyncio, sys\n"
+        "from mcp import types\n"
+        "from fmp_mcp.server import app\n"
+        "handler = app.request_handlers[types.ListToolsRequest]\n"
+        "asyncio.run(handler(types.ListToolsRequest(method='tools/list')))\n"
+        f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))\n"
+    )
+    result = run_python("-c", script)
+
+    assert result.stdout.strip() == ""
+
+
+def test_own_import_time_within_budget():
+    """Test that the server's own modules import within the time budget."""
+    result = run_python("-X", "importtime", "-c", "import fmp_mcp.server")
+
+    own = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if name.strip().startswith("fmp_mcp"):
+            own += int(self_us)
+
+    assert 0 < own < OWN_IMPORT_BUDGET_US
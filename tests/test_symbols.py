@@ -0,0 +1,82 @@
+"""Tests for the local symbol index."""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from fmp_mcp.symbols import SEARCH_COLUMNS, SymbolIndex, SymbolSearch, search_row
+
+ROWS = [
+    {"symbol": "AAPL", "companyName": "Apple Inc."},
+    {"symbol": "AAP", "companyName": "Advance Auto Parts, Inc."},
+    {"symbol": "APLE", "companyName": "Apple Hospitality REIT, Inc."},
+    {"symbol": "MSFT", "companyName": "Microsoft Corporation", "cik": "0000789019"},
+    {"symbol": "BTCUSD", "name": "Bitcoin USD", "exchange": "CCC"},
+]
+
+
+def test_index_ranks_symbol_and_name_matches():
+    """Test prefix search on symbols and words of names."""
+    index = SymbolIndex(ROWS)
+
+    assert [row["symbol"] for row in index.search_symbol("aap")] == ["AAP", "AAPL"]
+    assert [row["symbol"] for row in index.search_symbol("apple")] == ["AAPL", "APLE"]
+    assert [row["symbol"] for row in index.search_name("apple hosp")] == ["APLE"]
+    assert [row["symbol"] for row in index.search_name("bitc")] == ["BTCUSD"]
+    assert index.search_name("banana") == []
+    assert index.lookup("cik", "789019")[0]["symbol"] == "MSFT"
+
+
+@pytest.mark.asyncio
+async def test_search_snapshots_lists_and_falls_back_upstream():
+    """Test that searches are answered locally once the snapshot is built."""
+    client = Mock()
+    client.get_stock_list.return_value = ROWS[:4]
+    client.get_crypto_list.return_value = ROWS[4:]
+    search = SymbolSearch()
+    fallback = AsyncMock(return_value=[{
+        "symbol": "AAPL", "name": "Apple Inc.", "currency": "USD",
+        "exchangeFullName": "NASDAQ Global Select", "exchange": "NASDAQ",
+    }])
+
+    # Before the first snapshot lands the query goes upstream
+    upstream_rows = await search.search(client, "symbol", "AAPL", fallback)
+    assert upstream_rows == fallback.return_value
+    await search._task
+    assert len(search.index) == 5
+
+    # Local hits have the same columns as upstream rows
+    rows = await search.search(client, "symbol", "AAPL", fallback)
+    assert rows[0] == {
+        "symbol": "AAPL", "name": "Apple Inc.", "currency": None,
+        "exchangeFullName": None, "exchange": None,
+    }
+    assert fallback.await_count == 1
+
+    # Identifier misses are learned from the upstream answer, reduced to the same columns
+    cik_fallback = AsyncMock(return_value=[
+        {"symbol": "AAPL", "companyName": "Apple Inc.", "cik": "0000320193", "marketCap": 1}
+    ])
+    upstream_rows = await search.search(client, "cik", "0000320193", cik_fallback)
+    assert upstream_rows == [search_row(cik_fallback.return_value[0], "cik")]
+    assert list(upstream_rows[0]) == [*SEARCH_COLUMNS, "cik"]
+    assert await search.search(client, "cik", "320193", cik_fallback) == upstream_rows
+    assert list((await search.search(client, "cik", "789019", cik_fallback))[0]) == list(
+        upstream_rows[0]
+    )
+    assert cik_fallback.await_count == 1
+    assert client.get_stock_list.call_count == 1
+    assert search.stats()["local"] == 3
+
+
+def test_learned_identifiers_are_bounded():
+    """Test that the least recently used learned identifiers are forgotten first."""
+    search = SymbolSearch(max_learned=2)
+    for cik in ("1", "2"):
+        search.learn("cik", [{"symbol": f"S{cik}", "cik": cik}])
+    assert search.find("cik", "1")
+
+    search.learn("cik", [{"symbol": "S3", "cik": "3"}])
+    assert search.find("cik", "1") == [{"symbol": "S1", "cik": "1"}]
+    assert search.find("cik", "2") == []
+    assert search.find("cik", "3") == [{"symbol": "S3", "cik": "3"}]
@@ -0,0 +1,77 @@
+"""Tests for call tracing and the slow-call profiler."""
+
+import json
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from fmp_mcp.profiling import SlowCallProfiler
+from fmp_mcp.snapshot import BackgroundSnapshot
+from fmp_mcp.tracing import Tracer, current_trace_id
+
+
+@pytest.mark.asyncio
+async def test_call_tool_writes_otlp_trace(tmp_path):
+    """Test that a traced tool call is written as one OTLP/JSON request with phase spans."""
+    from fmp_mcp.server import call_tool
+    import fmp_mcp.server as server_module
+    import fmp_mcp.tracing as tracing_module
+
+    client = Mock()
+    client.get_quote.return_value = [{"symbol": "AAPL", "price": 150}]
+    server_module.fmp_client = client
+    path = tmp_path / "traces.jsonl"
+
+    with patch.dict('os.environ', {'FMP_CACHE_ENABLED': '0', 'FMP_API_KEY': 'test_key'}), \
+            patch.object(tracing_module, "_tracer", Tracer(path)):
+        await call_tool("get_quote", {"symbol": "AAPL"})
+
+    server_module.fmp_client = None
+    (line,) = path.read_text().splitlines()
+    spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    by_name = {span["name"]: span for span in spans}
+
+    assert set(by_name) == {
+        "call_tool", "dispatch", "fetch", "ratelimit.wait", "upstream", "encode"
+    }
+    root = by_name["call_tool"]
+    assert root["parentSpanId"] == ""
+    assert {span["traceId"] for span in spans} == {root["traceId"]}
+    assert by_name["upstream"]["parentSpanId"] == by_name["fetch"]["spanId"]
+    assert {"key": "fmp.outcome", "value": {"stringValue": "ok"}} in root["attributes"]
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_is_its_own_trace(tmp_path):
+    """Test that a snapshot reload started during a traced call does not join its trace."""
+    seen = []
+
+    class Snapshot(BackgroundSnapshot):
+        async def load(self, client):
+            seen.append(current_trace_id())
+            return True
+
+    snapshot = Snapshot(refresh_interval=60)
+    with Tracer(tmp_path / "traces.jsonl").span("call_tool", {}):
+        assert current_trace_id() is not None
+        snapshot.refresh_if_stale(None)
+    await snapshot._task
+
+    assert seen == [None]
+
+
+def test_profiler_dumps_only_slow_calls(tmp_path):
+    """Test that calls over the threshold are dumped as folded stacks."""
+    profiler = SlowCallProfiler(threshold=0.05, directory=tmp_path, interval=0.001)
+
+    with profiler.profile("get_quote"):
+        pass
+    with profiler.profile("get_historical_chart"):
+        time.sleep(0.1)
+
+    (dump,) = tmp_path.iterdir()
+    assert dump.name.startswith("get_historical_chart-")
+    stack, count = dump.read_text().splitlines()[0].rsplit(" ", 1)
+    assert stack.endswith("test_profiler_dumps_only_slow_calls (test_tracing.py:71)")
+    assert int(count) > 0